@@ -1,5 +1,4 @@
-import requests
-from bs4 import BeautifulSoup
+from bs4 import BeautifulSoup, NavigableString, SoupStrainer
 import re
 import html
 import os
@@ -7,9 +6,32 @@ import webbrowser
 
 # NEW (server + API)
 import json
+import argparse
+import hashlib
+import sys
+import threading
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED
+from dataclasses import dataclass, fields
 from http.server import SimpleHTTPRequestHandler, ThreadingHTTPServer
 from urllib.parse import urlparse, parse_qs
 
+import euc_assets
+import euc_catalog
+import euc_compress
+import euc_http
+import euc_names
+import euc_ratelimit
+import euc_youtube
+
+try:
+    from selectolax.lexbor import LexborHTMLParser as SelectolaxParser
+except ImportError:
+    try:
+        from selectolax.parser import HTMLParser as SelectolaxParser
+    except ImportError:
+        SelectolaxParser = None
+
 # --------- Distributor URLs ---------
 EWHEELS_BASE_URL = "https://ewheels.com"
 EWHEELS_ALL_VEHICLES_URL = "https://ewheels.com/pages/all-vehicles"
@@ -20,12 +42,75 @@ ALIEN_COLLECTION_URL = "https://alienrides.com/collections/electric-unicycles"
 NEXTGEN_BASE_URL = "https://nextgenmobility.org"
 NEXTGEN_COLLECTION_URL = "https://nextgenmobility.org/collections/eucs"
 
+# Every distributor we scrape. Shopify stores are pulled through products.json
+# first; paginated listings are crawled with ?page=N.
+DISTRIBUTORS = [
+    {
+        "source": "ewheels",
+        "label": "eWheels",
+        "base_url": EWHEELS_BASE_URL,
+        "listing_url": EWHEELS_ALL_VEHICLES_URL,
+        "paginated": False,
+        "shopify": False,
+    },
+    {
+        "source": "alien",
+        "label": "Alien Rides",
+        "base_url": ALIEN_BASE_URL,
+        "listing_url": ALIEN_COLLECTION_URL,
+        "paginated": True,
+        "shopify": True,
+    },
+    {
+        "source": "nextgen",
+        "label": "NextGen M",
+        "base_url": NEXTGEN_BASE_URL,
+        "listing_url": NEXTGEN_COLLECTION_URL,
+        "paginated": True,
+        "shopify": True,
+    },
+]
+
+# Listing pages requested ahead of the one being processed
+PAGINATION_PREFETCH = 3
+
+# Incremental mode remembers per-URL fingerprints and records between runs.
+# Bump INCREMENTAL_VERSION whenever extraction logic changes so stale records
+# are re-extracted instead of reused.
+INCREMENTAL_STATE_FILE = os.path.join(".euc_cache", "incremental.json")
+INCREMENTAL_VERSION = 6
+
+# Finished records are streamed here as they complete; --resume picks up from it.
+CHECKPOINT_FILE = "scrape_checkpoint.jsonl"
+
+# Shopify caps products.json pages at 250 products
+SHOPIFY_PAGE_LIMIT = 250
+
 # Keywords that probably mean "NOT an EUC"
 EXCLUDE_KEYWORDS = ["scooter", "bike", "climber", "vsett", "e-bike", "e bike"]
 
-HEADERS = {
-    "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64)"
-}
+
+def _detect_html_parser() -> str:
+    forced = os.environ.get("EUC_HTML_PARSER")
+    if forced:
+        return forced
+    try:
+        import lxml  # noqa: F401
+        return "lxml"
+    except ImportError:
+        return "html.parser"
+
+
+# BeautifulSoup backend: lxml when installed (several times faster), else the
+# stdlib html.parser. EUC_HTML_PARSER forces one. Listing-page link scans use
+# selectolax instead when it is installed, unless EUC_LINK_PARSER=soup.
+HTML_PARSER = _detect_html_parser()
+LINK_PARSER = "selectolax" if SelectolaxParser and os.environ.get("EUC_LINK_PARSER") != "soup" else "soup"
+
+# Product-page scraping concurrency: total worker threads, and how many of
+# them may hit the same host at once (keeps us polite to each distributor).
+SCRAPE_WORKERS = int(os.environ.get("EUC_SCRAPE_WORKERS", "8"))
+PER_HOST_CONCURRENCY = int(os.environ.get("EUC_PER_HOST_CONCURRENCY", "4"))
 
 
 def clean_text(text: str) -> str:
@@ -41,187 +126,265 @@ def is_probable_euc(title: str) -> bool:
     return True
 
 
-def clean_euc_name(name: str) -> str:
-    """
-    Remove spec info from titles like:
-    - "Begode A1, 180Wh Battery/800W Motor"
-    - "Begode Blitz, 2,400Wh Battery/3,500W Motor (8.5KW Peak)"
-    -> "Begode A1", "Begode Blitz"
-    """
-    if not name:
-        return ""
+# ---------- HTML PARSING ----------
 
-    name = name.strip()
-    name = name.split(",")[0].strip()
+_HEAD_END_RE = re.compile(r"</head\s*>", re.IGNORECASE)
 
-    patterns = [
-        r"\b\d+Wh\b.*$",
-        r"\b\d+W\b.*$",
-        r"\b\d+\s*MPH\b.*$",
-        r"\b\d+\s*miles\b.*$",
-        r"Battery.*$",
-        r"Motor.*$",
-    ]
-    for pat in patterns:
-        name = re.sub(pat, "", name, flags=re.IGNORECASE).strip()
+_ANCHOR_STRAINER = SoupStrainer("a", href=True)
 
-    return name
 
+def make_soup(markup: str, parse_only=None):
+    return BeautifulSoup(markup, HTML_PARSER, parse_only=parse_only)
 
-# ---------- SCRAPERS ----------
 
-def get_ewheels_product_links():
-    print("Fetching eWheels product list...")
-    resp = requests.get(EWHEELS_ALL_VEHICLES_URL, headers=HEADERS, timeout=30)
-    resp.raise_for_status()
+def split_head(markup: str):
+    """
+    Split a page into (head_markup, body_markup) at the closing </head> tag.
+    """
+    m = _HEAD_END_RE.search(markup)
+    if not m:
+        return "", markup
+    return markup[:m.end()], markup[m.end():]
 
-    soup = BeautifulSoup(resp.text, "html.parser")
-    links = []
 
-    for a in soup.find_all("a", href=True):
-        href = a["href"]
-        if "/products/" in href:
-            title = clean_text(a.get_text())
-            if not title:
-                continue
-            if not is_probable_euc(title):
-                continue
-            full_url = href if href.startswith("http") else EWHEELS_BASE_URL + href
-            links.append((title, full_url))
+def iter_anchor_links(markup: str):
+    """
+    Yield (href, text) for every <a href> on a listing page. Only anchors are
+    built into a tree: with selectolax when available, otherwise a
+    BeautifulSoup parse restricted to <a href> elements.
+    """
+    if LINK_PARSER == "selectolax":
+        for node in SelectolaxParser(markup).css("a[href]"):
+            yield node.attributes.get("href") or "", node.text(deep=True)
+        return
 
-    unique = {}
-    for title, url in links:
-        unique[url] = title
+    for a in make_soup(markup, parse_only=_ANCHOR_STRAINER).find_all("a", href=True):
+        yield a["href"], a.get_text()
 
-    print(f"eWheels: Found {len(unique)} probable EUC product pages.")
-    return [
-        {"name": title, "url": url, "source": "ewheels", "base_url": EWHEELS_BASE_URL}
-        for url, title in unique.items()
-    ]
 
+# ---------- SCRAPERS ----------
 
-def get_alien_product_links(max_pages: int = 10):
+def crawl_pages(fetch_page, max_pages: int, prefetch: int = PAGINATION_PREFETCH, is_last=None):
     """
-    Scrape Alien Rides collection pages. Handles pagination via ?page=N.
+    Fetch pages 1..max_pages with up to `prefetch` of them in flight at once.
+
+    `fetch_page(page)` returns that page's result, or None when the page is
+    empty or failed. Results are collected in page order up to (not including)
+    the first None. Pages speculatively queued past it are cancelled, and ones
+    already running are waited out (so they don't keep holding connections
+    once the crawl returns) and their results discarded; `fetch_page` should
+    therefore leave side effects to the caller.
+
+    `is_last(result)`, when given, recognises the final page from its result
+    (e.g. a short page), which ends the crawl right after it. Page 1 is then
+    fetched on its own before speculating, as it is often the only one.
     """
-    print("Fetching Alien Rides product list...")
-    products = {}
+    results = []
+    pool = ThreadPoolExecutor(max_workers=max(1, prefetch))
+    try:
+        futures = {}
+        next_page = 1
+        for page in range(1, max_pages + 1):
+            window = 1 if is_last and page == 1 else prefetch
+            while next_page <= max_pages and next_page < page + window:
+                futures[next_page] = pool.submit(fetch_page, next_page)
+                next_page += 1
+
+            result = futures.pop(page).result()
+            if result is None:
+                break
+            results.append(result)
+            if is_last and is_last(result):
+                break
+    finally:
+        pool.shutdown(wait=True, cancel_futures=True)
+    return results
+
+
+def get_product_links(distributor: dict, max_pages: int = 10, state=None):
+    """
+    Collect probable-EUC product links from a distributor's listing page,
+    following ?page=N pagination for paginated collections.
+    """
+    label = distributor["label"]
+    base_url = distributor["base_url"]
+    listing_url = distributor["listing_url"]
+    if not distributor.get("paginated"):
+        max_pages = 1
 
-    for page in range(1, max_pages + 1):
-        if page == 1:
-            url = ALIEN_COLLECTION_URL
-        else:
-            url = f"{ALIEN_COLLECTION_URL}?page={page}"
+    print(f"Fetching {label} product list...")
 
+    def fetch_page(page):
+        url = listing_url if page == 1 else f"{listing_url}?page={page}"
         try:
-            resp = requests.get(url, headers=HEADERS, timeout=30)
+            resp = euc_http.cached_get(url, timeout=30)
         except Exception as e:
-            print(f"  !! Error fetching Alien Rides page {page}: {e}")
-            break
+            print(f"  !! Error fetching {label} page {page}: {e}")
+            return None
 
         if resp.status_code >= 400:
-            print(f"  Alien Rides page {page} returned status {resp.status_code}, stopping.")
-            break
+            print(f"  {label} page {page} returned status {resp.status_code}, stopping.")
+            return None
 
-        soup = BeautifulSoup(resp.text, "html.parser")
-        found_this_page = 0
-
-        for a in soup.find_all("a", href=True):
-            href = a["href"]
+        found = []
+        excluded = []
+        for href, text in iter_anchor_links(resp.text):
             if "/products/" in href:
-                title = clean_text(a.get_text())
+                title = clean_text(text)
                 if not title:
                     continue
+                full_url = href if href.startswith("http") else base_url + href
                 if not is_probable_euc(title):
+                    excluded.append(full_url)
                     continue
-                full_url = href if href.startswith("http") else ALIEN_BASE_URL + href
-                products[full_url] = title
-                found_this_page += 1
+                found.append((full_url, title))
 
-        print(f"  Alien Rides page {page}: found {found_this_page} product links.")
-        if found_this_page == 0:
-            break
+        if distributor.get("paginated"):
+            print(f"  {label} page {page}: found {len(found)} product links.")
+        return (found, excluded) if found else None
 
-    print(f"Alien Rides: Found {len(products)} probable EUC product pages.")
+    products = {}
+    excluded = set()
+    for found, page_excluded in crawl_pages(fetch_page, max_pages):
+        for full_url, title in found:
+            products[full_url] = title
+        excluded.update(page_excluded)
+
+    if state:
+        # A product is often linked more than once (e.g. from a "compare
+        # with scooters" tile); one valid title anywhere is enough to keep it.
+        for url in products:
+            state.accept(url)
+        for url in excluded - products.keys():
+            state.reject(url)
+
+    print(f"{label}: Found {len(products)} probable EUC product pages.")
     return [
-        {"name": title, "url": url, "source": "alien", "base_url": ALIEN_BASE_URL}
+        {"name": title, "url": url, "source": distributor["source"], "base_url": base_url}
         for url, title in products.items()
     ]
 
 
-def get_nextgen_product_links(max_pages: int = 10):
-    """
-    Scrape NextGen Mobility collection pages. Handles pagination via ?page=N.
-    """
-    print("Fetching NextGen M product list...")
-    products = {}
-
-    for page in range(1, max_pages + 1):
-        if page == 1:
-            url = NEXTGEN_COLLECTION_URL
-        else:
-            url = f"{NEXTGEN_COLLECTION_URL}?page={page}"
+# Spec labels read from the value element next to them on product pages
+STAT_LABELS = ("CRUISING SPEED", "TOP SPEED", "WEIGHT", "MAX LOAD", "BATTERY CAPACITY", "RANGE")
 
-        try:
-            resp = requests.get(url, headers=HEADERS, timeout=30)
-        except Exception as e:
-            print(f"  !! Error fetching NextGen M page {page}: {e}")
-            break
 
-        if resp.status_code >= 400:
-            print(f"  NextGen M page {page} returned status {resp.status_code}, stopping.")
-            break
+def index_page(soup, labels=STAT_LABELS):
+    """
+    Walk a parsed page once and return (stats, page_text).
 
-        soup = BeautifulSoup(resp.text, "html.parser")
-        found_this_page = 0
+    `stats` maps each lowercased label found to the text of the element
+    after the label's parent (the first non-empty one on the page), and
+    `page_text` equals soup.get_text(separator=" "). This replaces one full text-node scan per
+    label plus separate get_text passes with a single traversal.
+    """
+    wanted = {label.lower() for label in labels}
+    types = soup.interesting_string_types or soup.MAIN_CONTENT_STRING_TYPES
+    single_type = isinstance(types, type)
+
+    stats = {}
+    parts = []
+    for node in soup.descendants:
+        if not isinstance(node, NavigableString):
+            continue
+
+        node_type = type(node)
+        if (node_type is types) if single_type else (node_type in types):
+            parts.append(node)
+
+        if wanted:
+            key = node.strip().lower()
+            if key in wanted:
+                sib = node.parent.find_next_sibling()
+                if sib:
+                    value = clean_text(sib.get_text())
+                    if value:
+                        stats[key] = value
+                        wanted.discard(key)
+
+    return stats, " ".join(parts)
+
+
+# ---------- SPEC RULES ----------
+
+def _digits(unit):
+    return lambda value: value.replace(",", "") + unit
+
+
+# Declarative spec extraction: (field, pattern, formatter). Each pattern marks
+# the value with a (?P<value>...) group. All rules in a table are compiled into
+# one alternation at import and run as a single pass over the text; the first
+# match in text order wins for each field. To add a field, add a rule here and
+# a default in SPEC_DEFAULTS.
+BATTERY_TYPE_PATTERN = r"(?P<value>Samsung\s+\w+\d+|LG\s+\w+\d+|Molicel\s+\w+\d+)"
+
+TITLE_SPEC_RULES = [
+    ("battery_capacity", r"(?P<value>\d[\d,]*)\s*Wh", _digits("Wh")),
+    ("motor_power", r"(?P<value>\d[\d,]*)\s*W\s*Motor", _digits("W")),
+]
+
+PAGE_SPEC_RULES = [
+    ("battery_capacity", r"(?P<value>\d[\d,]*)\s*Wh", _digits("Wh")),
+    ("motor_power", r"(?P<value>\d[\d,]*)\s*W(?!h)", _digits("W")),
+    ("battery_type", BATTERY_TYPE_PATTERN, None),
+    ("charger", r"(?P<value>\d{2,3}(?:\.\d+)?\s*V\s*\d{1,2}(?:\.\d+)?\s*A)\b", None),
+    ("tire_size", r"(?P<value>\d{2}(?:\.\d+)?\s*(?:\"|”|-?inch(?:es)?|in\.?)?\s*[x×]\s*\d(?:\.\d+)?)", None),
+    ("tire_size", r"(?P<value>\d{2}(?:\.\d+)?\s*(?:\"|”|-?inch(?:es)?))\s+(?:tire|tyre|wheel)", None),
+    ("suspension", r"(?P<value>\d{2,3}\s*mm)\s+(?:of\s+)?(?:air\s+|coil\s+|oil\s+|spring\s+|hydraulic\s+)?"
+                   r"(?:suspension|shock|travel)", None),
+    ("price", r"(?P<value>\$\s?\d[\d,]*(?:\.\d{2})?)", None),
+]
+
+SPEC_DEFAULTS = {
+    "battery_capacity": "N/A",
+    "range": "N/A",
+    "speed": "N/A",
+    "motor_power": "N/A",
+    "weight": "N/A",
+    "max_load": "N/A",
+    "battery_type": "N/A",
+    "charger": "N/A",
+    "tire_size": "N/A",
+    "suspension": "N/A",
+    "price": "N/A",
+}
 
-        for a in soup.find_all("a", href=True):
-            href = a["href"]
-            if "/products/" in href:
-                title = clean_text(a.get_text())
-                if not title:
-                    continue
-                if not is_probable_euc(title):
-                    continue
-                full_url = href if href.startswith("http") else NEXTGEN_BASE_URL + href
-                products[full_url] = title
-                found_this_page += 1
 
-        print(f"  NextGen M page {page}: found {found_this_page} product links.")
-        if found_this_page == 0:
-            break
+def compile_spec_rules(rules):
+    """
+    Compile a rule table into (combined_regex, {group_name: (field, formatter)}).
+    """
+    parts = []
+    lookup = {}
+    for i, (field, pattern, formatter) in enumerate(rules):
+        parts.append(f"(?P<r{i}>{pattern.replace('(?P<value>', f'(?P<v{i}>')})")
+        lookup[f"r{i}"] = (field, f"v{i}", formatter or clean_text)
+    return re.compile("|".join(parts), re.IGNORECASE), lookup
 
-    print(f"NextGen M: Found {len(products)} probable EUC product pages.")
-    return [
-        {"name": title, "url": url, "source": "nextgen", "base_url": NEXTGEN_BASE_URL}
-        for url, title in products.items()
-    ]
 
+def run_spec_rules(compiled, text: str, skip=()) -> dict:
+    """
+    Scan `text` once with a compiled rule table and return {field: value} for
+    the first match of every field not listed in `skip`.
+    """
+    regex, lookup = compiled
+    wanted = {field for field, _, _ in lookup.values()} - set(skip)
+    found = {}
+    if not text or not wanted:
+        return found
 
-def extract_stat_block(soup, label_text):
-    label_text = label_text.lower()
-    for node in soup.find_all(text=True):
-        t = node.strip().lower()
-        if t == label_text:
-            parent = node.parent
-            sib = parent.find_next_sibling()
-            if sib:
-                value = clean_text(sib.get_text())
-                if value:
-                    return value
-    return None
+    for m in regex.finditer(text):
+        field, value_group, formatter = lookup[m.lastgroup]
+        if field in wanted:
+            found[field] = formatter(m.group(value_group))
+            wanted.discard(field)
+            if not wanted:
+                break
+    return found
 
 
-def extract_battery_type_from_text(full_text: str) -> str:
-    full_text = full_text.replace("\n", " ")
-    m = re.search(
-        r"(Samsung\s+\w+\d+|LG\s+\w+\d+|Molicel\s+\w+\d+)",
-        full_text,
-        re.IGNORECASE,
-    )
-    if m:
-        return m.group(1)
-    return "N/A"
+_TITLE_SPEC_RULES = compile_spec_rules(TITLE_SPEC_RULES)
+_PAGE_SPEC_RULES = compile_spec_rules(PAGE_SPEC_RULES)
 
 
 def extract_image_url(soup) -> str:
@@ -236,7 +399,7 @@ def extract_image_url(soup) -> str:
     return ""
 
 
-def extract_description(soup) -> str:
+def extract_description(soup, page_text: str = None) -> str:
     meta = soup.find("meta", attrs={"name": "description"})
     if meta and meta.get("content"):
         return clean_text(meta["content"])
@@ -245,7 +408,9 @@ def extract_description(soup) -> str:
     if og and og.get("content"):
         return clean_text(og["content"])
 
-    body_text = clean_text(soup.get_text(separator=" "))
+    if page_text is None:
+        page_text = soup.get_text(separator=" ")
+    body_text = clean_text(page_text)
     if not body_text:
         return "No description available."
 
@@ -269,7 +434,198 @@ def absolutize_url(url: str, base_url: str) -> str:
     return url
 
 
-def parse_product_page(prod):
+def extract_specs(stats: dict, title_text: str, page_text: str) -> dict:
+    """
+    Pull the spec fields out of a product page (or product description) using
+    the `stats` and `page_text` from index_page(). Labelled stats win, then
+    TITLE_SPEC_RULES on `title_text`, then one PAGE_SPEC_RULES pass over
+    `page_text` for everything still missing.
+    """
+    specs = dict(SPEC_DEFAULTS)
+
+    speed_block = stats.get("cruising speed") or stats.get("top speed")
+    if speed_block:
+        specs["speed"] = speed_block
+
+    for field, label in (("weight", "weight"), ("max_load", "max load"),
+                         ("battery_capacity", "battery capacity"), ("range", "range")):
+        if stats.get(label):
+            specs[field] = stats[label]
+
+    labelled = {field for field in specs if specs[field] != "N/A"}
+    from_title = run_spec_rules(_TITLE_SPEC_RULES, title_text, skip=labelled)
+    specs.update(from_title)
+    specs.update(run_spec_rules(_PAGE_SPEC_RULES, page_text, skip=labelled | set(from_title)))
+    return specs
+
+
+# ---------- SPEC NORMALIZATION ----------
+
+KM_PER_MILE = 1.609344
+LBS_PER_KG = 2.20462
+
+# normalized key -> (display field, {unit spelling: factor to the canonical
+# unit}, canonical unit, how to pick one value from several quantities).
+# The first unit spelling listed is the canonical one.
+NUMERIC_SPECS = {
+    "battery_wh": ("battery_capacity", {"wh": 1, "kwh": 1000}, "Wh", "first"),
+    "range_mi": ("range", {"miles": 1, "mile": 1, "mi": 1, "km": 1 / KM_PER_MILE}, "mi", "span"),
+    "speed_mph": ("speed", {"mph": 1, "km/h": 1 / KM_PER_MILE, "kmh": 1 / KM_PER_MILE,
+                            "kph": 1 / KM_PER_MILE}, "mph", "max"),
+    "motor_w": ("motor_power", {"w": 1, "kw": 1000}, "W", "first"),
+    "weight_lbs": ("weight", {"lbs": 1, "lb": 1, "pounds": 1, "kg": LBS_PER_KG}, "lbs", "max"),
+    "max_load_lbs": ("max_load", {"lbs": 1, "lb": 1, "pounds": 1, "kg": LBS_PER_KG}, "lbs", "max"),
+}
+
+
+def _compile_quantity_re(units):
+    spellings = "|".join(re.escape(u) for u in sorted(units, key=len, reverse=True))
+    return re.compile(
+        r"(?P<lo>\d[\d,]*(?:\.\d+)?)"
+        r"(?:\s*(?:-|–|to)\s*(?P<hi>\d[\d,]*(?:\.\d+)?))?"
+        rf"\s*(?P<unit>{spellings})?(?![a-z])",
+        re.IGNORECASE,
+    )
+
+
+_QUANTITY_RES = {key: _compile_quantity_re(units) for key, (_, units, _, _) in NUMERIC_SPECS.items()}
+
+
+def normalize_spec(key: str, text: str):
+    """
+    Parse one display string ("2,400Wh", "50-60 miles", "25 mph / 40 km/h")
+    into {"value", "min", "max", "unit", "confidence"} in the canonical unit for
+    `key`, or None when it holds no number.
+
+    Confidence is "high" when the canonical unit is stated, "medium" when the
+    value was converted from another unit, and "low" for a bare number.
+    """
+    if not text:
+        return None
+    _, units, unit, pick = NUMERIC_SPECS[key]
+    canonical = next(iter(units))
+
+    by_confidence = {"high": [], "medium": [], "low": []}
+    for m in _QUANTITY_RES[key].finditer(text):
+        spelled = (m.group("unit") or "").lower()
+        factor = units.get(spelled, 1)
+        if not spelled:
+            confidence = "low"
+        elif factor == units[canonical]:
+            confidence = "high"
+        else:
+            confidence = "medium"
+        lo = float(m.group("lo").replace(",", "")) * factor
+        hi = float(m.group("hi").replace(",", "")) * factor if m.group("hi") else lo
+        by_confidence[confidence].append((lo, hi))
+
+    for confidence in ("high", "medium", "low"):
+        quantities = by_confidence[confidence]
+        if not quantities:
+            continue
+        low = min(lo for lo, _ in quantities)
+        high = max(hi for _, hi in quantities)
+        if pick == "first":
+            value = quantities[0][1]
+        elif pick == "span" and len(quantities) == 1:
+            value = (quantities[0][0] + quantities[0][1]) / 2
+        else:
+            value = high
+        return {
+            "value": round(value, 1),
+            "min": round(low, 1),
+            "max": round(high, 1),
+            "unit": unit,
+            "confidence": confidence,
+        }
+    return None
+
+
+def normalize_specs(record: dict) -> dict:
+    """
+    Typed numeric versions of a record's display specs, keyed like
+    NUMERIC_SPECS ("battery_wh", "range_mi", ...).
+    """
+    return {key: normalize_spec(key, record.get(field))
+            for key, (field, _, _, _) in NUMERIC_SPECS.items()}
+
+
+# ---------- RECORDS ----------
+
+@dataclass(frozen=True, slots=True)
+class EUCRecord:
+    """
+    One scraped wheel. Display strings are kept exactly as scraped; the
+    numeric fields hold their normalized values (see NUMERIC_SPECS), or None
+    when unknown. `source` is interned since there are only a handful.
+    """
+    name: str
+    url: str
+    source: str
+    battery_capacity: str = "N/A"
+    range: str = "N/A"
+    speed: str = "N/A"
+    motor_power: str = "N/A"
+    weight: str = "N/A"
+    max_load: str = "N/A"
+    battery_type: str = "N/A"
+    charger: str = "N/A"
+    tire_size: str = "N/A"
+    suspension: str = "N/A"
+    price: str = "N/A"
+    image_url: str = ""
+    description: str = "No description available."
+    battery_wh: float | None = None
+    range_mi: float | None = None
+    speed_mph: float | None = None
+    motor_w: float | None = None
+    weight_lbs: float | None = None
+    max_load_lbs: float | None = None
+
+    def __post_init__(self):
+        object.__setattr__(self, "source", sys.intern(self.source))
+
+    @classmethod
+    def from_specs(cls, name: str, url: str, source: str, specs: dict,
+                   image_url: str = "", description: str = "No description available."):
+        """
+        Build a record from extract_specs() output, normalizing the numbers.
+        """
+        numbers = {key: (spec["value"] if spec else None) for key, spec in normalize_specs(specs).items()}
+        display = {field: specs[field] for field in SPEC_DEFAULTS if field in specs}
+        return cls(name=name, url=url, source=source, image_url=image_url, description=description,
+                   **display, **numbers)
+
+    @classmethod
+    def placeholder(cls, name: str, url: str, source: str, description: str = "No description available."):
+        return cls(name=name, url=url, source=source, description=description)
+
+    @property
+    def specs(self) -> dict:
+        """
+        Full normalization detail (min/max/unit/confidence) per numeric spec.
+        """
+        return normalize_specs(self.to_dict())
+
+    def to_dict(self) -> dict:
+        return {name: getattr(self, name) for name in RECORD_FIELDS}
+
+    @classmethod
+    def from_dict(cls, data: dict):
+        return cls(**{name: data[name] for name in RECORD_FIELDS if name in data})
+
+    def to_json(self) -> str:
+        return json.dumps(self.to_dict())
+
+    @classmethod
+    def from_json(cls, line: str):
+        return cls.from_dict(json.loads(line))
+
+
+RECORD_FIELDS = tuple(f.name for f in fields(EUCRecord))
+
+
+def parse_product_page(prod, state=None, checkpoint=None):
     raw_name = prod["name"]
     url = prod["url"]
     base_url = prod.get("base_url", "")
@@ -278,185 +634,434 @@ def parse_product_page(prod):
     print(f"  -> Scraping [{source}] {raw_name} ({url})")
 
     try:
-        resp = requests.get(url, headers=HEADERS, timeout=30)
+        resp = euc_http.cached_get(url, timeout=30)
         resp.raise_for_status()
     except Exception as e:
         print(f"     !! Error fetching {url}: {e}")
-        return {
-            "name": clean_euc_name(raw_name),
-            "battery_capacity": "N/A",
-            "range": "N/A",
-            "speed": "N/A",
-            "motor_power": "N/A",
-            "weight": "N/A",
-            "max_load": "N/A",
-            "battery_type": "N/A",
-            "image_url": "",
-            "url": url,
-            "description": "No description available.",
-            "source": source,
-        }
-
-    soup = BeautifulSoup(resp.text, "html.parser")
-    page_text = soup.get_text(separator=" ")
-
-    battery_capacity = "N/A"
-    range_text = "N/A"
-    speed = "N/A"
-    motor_power = "N/A"
-    weight = "N/A"
-    max_load = "N/A"
-
-    speed_block = extract_stat_block(soup, "CRUISING SPEED")
-    if not speed_block:
-        speed_block = extract_stat_block(soup, "TOP SPEED")
-    if speed_block:
-        speed = speed_block
+        return EUCRecord.placeholder(euc_names.clean_euc_name(raw_name), url, source)
+
+    fingerprint = None
+    if state:
+        fingerprint = page_fingerprint(resp.text, raw_name, source)
+        previous = state.lookup(url, fingerprint)
+        if previous:
+            print("     unchanged since last run, reusing record")
+            if checkpoint is not None:
+                checkpoint.append(previous)
+            return previous
+
+    # The <head> meta tags cover image and description; the body is only
+    # needed for the spec labels, headline and text fallbacks.
+    head_markup, body_markup = split_head(resp.text)
+    head = make_soup(head_markup)
+    soup = make_soup(body_markup)
+    stats, page_text = index_page(soup)
 
-    weight_block = extract_stat_block(soup, "WEIGHT")
-    if weight_block:
-        weight = weight_block
+    title_h1 = soup.find("h1")
+    title_text = clean_text(title_h1.get_text()) if title_h1 else raw_name
 
-    max_load_block = extract_stat_block(soup, "MAX LOAD")
-    if max_load_block:
-        max_load = max_load_block
+    specs = extract_specs(stats, title_text, page_text)
+    image_url = absolutize_url(extract_image_url(head) or extract_image_url(soup), base_url)
+    description = extract_description(head, page_text)
 
-    battery_block = extract_stat_block(soup, "BATTERY CAPACITY")
-    if battery_block:
-        battery_capacity = battery_block
+    record = EUCRecord.from_specs(euc_names.clean_euc_name(raw_name), url, source, specs,
+                                  image_url=image_url, description=description)
+    if state:
+        state.remember(url, fingerprint, record)
+    if checkpoint is not None:
+        checkpoint.append(record)
+    return record
 
-    range_block = extract_stat_block(soup, "RANGE")
-    if range_block:
-        range_text = range_block
 
-    title_h1 = soup.find("h1")
-    title_text = clean_text(title_h1.get_text()) if title_h1 else raw_name
+def shopify_product_to_euc(product: dict, base_url: str, source: str) -> EUCRecord:
+    """
+    Build an EUC record from one entry of a Shopify products.json listing.
+    Specs come from the product's body_html, the image from its media list.
+    """
+    title = clean_text(product.get("title") or "")
+    url = f"{base_url.rstrip('/')}/products/{product.get('handle', '')}"
 
-    if battery_capacity == "N/A":
-        m = re.search(r"(\d[\d,]*)\s*Wh", title_text, re.IGNORECASE)
-        if not m:
-            m = re.search(r"(\d[\d,]*)\s*Wh", page_text, re.IGNORECASE)
-        if m:
-            battery_capacity = m.group(1).replace(",", "") + "Wh"
-
-    if motor_power == "N/A":
-        m = re.search(r"(\d[\d,]*)\s*W\s*Motor", title_text, re.IGNORECASE)
-        if not m:
-            m = re.search(r"(\d[\d,]*)\s*W(?!h)", page_text, re.IGNORECASE)
-        if m:
-            motor_power = clean_text(m.group(1).replace(",", "") + "W")
-
-    battery_type = extract_battery_type_from_text(page_text)
-    image_url = absolutize_url(extract_image_url(soup), base_url)
-    description = extract_description(soup)
-
-    return {
-        "name": clean_euc_name(raw_name),
-        "battery_capacity": battery_capacity,
-        "range": range_text,
-        "speed": speed,
-        "motor_power": motor_power,
-        "weight": weight,
-        "max_load": max_load,
-        "battery_type": battery_type,
-        "image_url": image_url,
-        "url": url,
-        "description": description,
-        "source": source,
-    }
+    soup = make_soup(product.get("body_html") or "")
+    stats, body_text = index_page(soup)
 
+    specs = extract_specs(stats, title, body_text)
 
-def attr_escape(value: str) -> str:
-    return html.escape(value or "", quote=True)
+    variants = product.get("variants") or []
+    if variants and variants[0].get("price"):
+        specs["price"] = "$" + str(variants[0]["price"])
 
+    images = product.get("images") or []
+    if images and images[0].get("src"):
+        image_url = images[0]["src"]
+    else:
+        image_url = extract_image_url(soup)
 
-# ---------- HTML BUILDING ----------
+    return EUCRecord.from_specs(euc_names.clean_euc_name(title), url, source, specs,
+                                image_url=absolutize_url(image_url, base_url),
+                                description=extract_description(soup, body_text))
 
-def build_html_table(eucs):
-    eucs_sorted = sorted(eucs, key=lambda x: x["name"].lower())
 
-    first = None
-    for e in eucs_sorted:
-        if e.get("source") == "ewheels":
-            first = e
-            break
-    if not first:
-        first = eucs_sorted[0] if eucs_sorted else {
-            "name": "N/A",
-            "battery_capacity": "N/A",
-            "range": "N/A",
-            "speed": "N/A",
-            "motor_power": "N/A",
-            "weight": "N/A",
-            "max_load": "N/A",
-            "battery_type": "N/A",
-            "image_url": "",
-            "url": "#",
-            "description": "No wheels found.",
-            "source": "ewheels",
-        }
-
-    rows_html = ""
-    for e in eucs_sorted:
-        rows_html += f"""
-        <tr class="wheel-row"
-            data-name="{attr_escape(e['name'])}"
-            data-battery="{attr_escape(e['battery_capacity'])}"
-            data-range="{attr_escape(e['range'])}"
-            data-speed="{attr_escape(e['speed'])}"
-            data-motor="{attr_escape(e['motor_power'])}"
-            data-weight="{attr_escape(e['weight'])}"
-            data-maxload="{attr_escape(e['max_load'])}"
-            data-battype="{attr_escape(e['battery_type'])}"
-            data-url="{attr_escape(e['url'])}"
-            data-image="{attr_escape(e['image_url'])}"
-            data-desc="{attr_escape(e['description'])}"
-            data-source="{attr_escape(e.get('source', 'ewheels'))}">
-            <td class="compare-col">
-                <button class="compare-btn" type="button">Compare</button>
-            </td>
-            <td>{html.escape(e['name'])}</td>
-            <td>{html.escape(e['battery_capacity'])}</td>
-            <td>{html.escape(e['range'])}</td>
-            <td>{html.escape(e['speed'])}</td>
-            <td>{html.escape(e['motor_power'])}</td>
-            <td>{html.escape(e['weight'])}</td>
-            <td>{html.escape(e['max_load'])}</td>
-            <td>{html.escape(e['battery_type'])}</td>
-        </tr>
+def get_shopify_collection_eucs(collection_url: str, base_url: str, source: str, label: str,
+                                max_pages: int = 10, state=None):
+    """
+    Pull a whole Shopify collection through its paginated products.json
+    endpoint (up to SHOPIFY_PAGE_LIMIT products per request) and turn it into
+    EUC records directly, without visiting any product pages. Pages are
+    fetched through crawl_pages, like the HTML listings.
+
+    Returns None when the store doesn't expose the endpoint, so the caller can
+    fall back to crawling the HTML collection and product pages.
+    """
+    print(f"Fetching {label} catalog via products.json...")
+    errors = {}
+
+    def fetch_page(page):
+        url = f"{collection_url.rstrip('/')}/products.json?limit={SHOPIFY_PAGE_LIMIT}&page={page}"
+        try:
+            resp = euc_http.cached_get(url, timeout=30)
+            if resp.status_code >= 400:
+                raise ValueError(f"status {resp.status_code}")
+            batch = resp.json()["products"]
+        except Exception as e:
+            errors[page] = e
+            return None
+        return batch or None
+
+    def is_short(batch):
+        return len(batch) < SHOPIFY_PAGE_LIMIT
+
+    batches = crawl_pages(fetch_page, max_pages, is_last=is_short)
+    # Only the page that ended the crawl matters; later ones were speculative.
+    last = len(batches) + 1
+    if last in errors and not (batches and is_short(batches[-1])):
+        if last == 1:
+            print(f"  {label} products.json unavailable ({errors[last]}), falling back to HTML.")
+            return None
+        print(f"  !! Error fetching {label} products.json page {last}: {errors[last]}")
+
+    eucs = {}
+    for page, batch in enumerate(batches, 1):
+        kept = 0
+        for product in batch:
+            url = f"{base_url.rstrip('/')}/products/{product.get('handle', '')}"
+            if not is_probable_euc(product.get("title") or ""):
+                if state:
+                    state.reject(url)
+                continue
+
+            euc = None
+            if state:
+                fingerprint = json_fingerprint(product, source)
+                euc = state.lookup(url, fingerprint)
+            if not euc:
+                euc = shopify_product_to_euc(product, base_url, source)
+                if state:
+                    state.remember(url, fingerprint, euc)
+            eucs[url] = euc
+            kept += 1
+
+        print(f"  {label} products.json page {page}: {len(batch)} products, {kept} probable EUCs.")
+
+    print(f"{label}: Found {len(eucs)} probable EUCs via products.json.")
+    return list(eucs.values())
+
+
+def discover_distributor(distributor: dict, state=None):
+    """
+    Return (eucs, products) for one distributor: finished records from the
+    Shopify catalog when available, otherwise product pages still to scrape.
+    """
+    if distributor.get("shopify"):
+        eucs = get_shopify_collection_eucs(distributor["listing_url"], distributor["base_url"],
+                                           distributor["source"], distributor["label"], state=state)
+        if eucs is not None:
+            return eucs, []
+    return [], get_product_links(distributor, state=state)
+
+
+def discover_all(distributors=DISTRIBUTORS, state=None):
+    """
+    Run discovery for every distributor at the same time. Returns
+    (catalog_eucs, products_to_scrape) in distributor order.
+    """
+    catalog_eucs = []
+    products = []
+    with ThreadPoolExecutor(max_workers=max(1, len(distributors))) as pool:
+        for eucs, links in pool.map(lambda d: discover_distributor(d, state), distributors):
+            catalog_eucs += eucs
+            products += links
+    return catalog_eucs, products
+
+
+def scrape_products(products, workers: int = SCRAPE_WORKERS, per_host: int = PER_HOST_CONCURRENCY,
+                    state=None, checkpoint=None):
+    """
+    Run parse_product_page over many products concurrently.
+
+    At most `workers` pages are in flight overall and at most `per_host` per
+    distributor host. Work is only handed to the pool when its host has a free
+    slot, so a slow distributor can tie up its own slots but never starve the
+    others. Results come back in the same order as `products`.
+
+    With an IncrementalState, URLs it has already rejected are dropped up
+    front and never fetched. With a ScrapeCheckpoint, URLs already recorded in
+    it are skipped too (their incremental entries are kept), and every
+    successfully scraped record is appended to it as soon as it finishes.
+    """
+    if state:
+        products = [p for p in products if not state.is_rejected(p["url"])]
+    if checkpoint is not None:
+        if state:
+            # Not scraped again, but still live: keep their fingerprints.
+            for p in products:
+                if p["url"] in checkpoint:
+                    state.touch(p["url"])
+        products = [p for p in products if p["url"] not in checkpoint]
+
+    workers = max(1, workers)
+    per_host = max(1, per_host)
+
+    queues = {}
+    for i, prod in enumerate(products):
+        host = urlparse(prod["url"]).netloc.lower()
+        queues.setdefault(host, deque()).append(i)
+
+    results = [None] * len(products)
+    active = dict.fromkeys(queues, 0)
+    in_flight = {}
+
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        def fill():
+            # Round-robin across hosts so every distributor makes progress.
+            progressed = True
+            while progressed and len(in_flight) < workers:
+                progressed = False
+                for host, queue in queues.items():
+                    if not queue or active[host] >= per_host or len(in_flight) >= workers:
+                        continue
+                    i = queue.popleft()
+                    active[host] += 1
+                    in_flight[pool.submit(parse_product_page, products[i], state, checkpoint)] = (i, host)
+                    progressed = True
+
+        fill()
+        while in_flight:
+            done, _ = wait(in_flight, return_when=FIRST_COMPLETED)
+            for fut in done:
+                i, host = in_flight.pop(fut)
+                active[host] -= 1
+                results[i] = fut.result()
+            fill()
+
+    return results
+
+
+# ---------- CHECKPOINTS ----------
+
+class ScrapeCheckpoint:
+    """
+    Append-only JSONL log of finished records, one per line, written as each
+    record completes so an interrupted run loses nothing already scraped.
+
+    A fresh run starts an empty log; with resume=True the existing log is
+    loaded (a torn last line from a crash is dropped) and its URLs count as
+    done.
+    """
+
+    def __init__(self, path: str = CHECKPOINT_FILE, resume: bool = False):
+        self.path = path
+        self._lock = threading.Lock()
+        self._records = {}
+
+        if resume:
+            try:
+                with open(path, "r", encoding="utf-8") as f:
+                    for line in f:
+                        try:
+                            record = EUCRecord.from_json(line)
+                        except (ValueError, TypeError):
+                            continue
+                        self._records[record.url] = record
+            except OSError:
+                pass
+
+        # Rewrite the valid records so appends never follow a torn line.
+        tmp_path = path + ".tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            for record in self._records.values():
+                f.write(record.to_json() + "\n")
+        os.replace(tmp_path, path)
+
+        self._file = open(path, "a", encoding="utf-8")
+
+    def __contains__(self, url) -> bool:
+        with self._lock:
+            return url in self._records
+
+    def __len__(self) -> int:
+        with self._lock:
+            return len(self._records)
+
+    def append(self, record: EUCRecord):
+        line = record.to_json() + "\n"
+        with self._lock:
+            self._records[record.url] = record
+            self._file.write(line)
+            self._file.flush()
+            os.fsync(self._file.fileno())
+
+    def records(self):
+        with self._lock:
+            return list(self._records.values())
+
+    def close(self):
+        with self._lock:
+            self._file.close()
+
+
+# ---------- INCREMENTAL SCRAPING ----------
+
+_SCRIPT_STYLE_RE = re.compile(r"<(script|style|noscript)\b.*?</\1\s*>|<!--.*?-->", re.IGNORECASE | re.DOTALL)
+_MAIN_REGION_RE = re.compile(r"<main\b.*</main\s*>", re.IGNORECASE | re.DOTALL)
+_BODY_REGION_RE = re.compile(r"<body\b.*</body\s*>", re.IGNORECASE | re.DOTALL)
+# <head> meta tags parse_product_page reads the image and description from
+_RECORD_META_RE = re.compile(
+    r"""<meta\b[^>]*\b(?:property|name)\s*=\s*["']?(?:og:image|og:description|description)["'\s/>][^>]*>""",
+    re.IGNORECASE,
+)
+
+
+def page_fingerprint(page_html: str, raw_name: str, source: str) -> str:
+    """
+    Hash the part of a product page that feeds the extracted record: the
+    image/description meta tags from <head>, and the <main> region (or
+    <body>) minus scripts, styles and comments, which carry per-request
+    tokens that change on every load.
+    """
+    head_markup, _ = split_head(page_html)
+    meta = "\n".join(_RECORD_META_RE.findall(head_markup))
+    m = _MAIN_REGION_RE.search(page_html) or _BODY_REGION_RE.search(page_html)
+    region = m.group(0) if m else page_html
+    region = " ".join(_SCRIPT_STYLE_RE.sub(" ", region).split())
+
+    h = hashlib.sha1()
+    h.update(f"{INCREMENTAL_VERSION}|{source}|{raw_name}|".encode("utf-8"))
+    h.update(meta.encode("utf-8"))
+    h.update(b"|")
+    h.update(region.encode("utf-8"))
+    return h.hexdigest()
+
+
+def json_fingerprint(data, source: str) -> str:
+    payload = json.dumps(data, sort_keys=True, separators=(",", ":"))
+    return hashlib.sha1(f"{INCREMENTAL_VERSION}|{source}|{payload}".encode("utf-8")).hexdigest()
+
+
+class IncrementalState:
+    """
+    What earlier runs learned about each product URL: a content fingerprint and
+    the record extracted from it, plus the URLs rejected as not-an-EUC.
+
+    Entries (records and rejections alike) not seen during the current run
+    are dropped on save, so the file tracks the live catalog instead of
+    growing forever.
+    """
+
+    def __init__(self, path: str = INCREMENTAL_STATE_FILE):
+        self.path = path
+        self._lock = threading.Lock()
+        self._records = {}
+        self._rejected = set()
+        self._seen = set()
+
+        try:
+            with open(path, "r", encoding="utf-8") as f:
+                data = json.load(f)
+        except (OSError, ValueError):
+            data = {}
+
+        if data.get("version") == INCREMENTAL_VERSION:
+            self._records = data.get("records", {})
+            self._rejected = set(data.get("rejected", []))
+
+        self.reused = 0
+
+    def lookup(self, url: str, fingerprint: str):
+        with self._lock:
+            self._seen.add(url)
+            entry = self._records.get(url)
+            if entry and entry["fingerprint"] == fingerprint:
+                self.reused += 1
+                return EUCRecord.from_dict(entry["record"])
+        return None
+
+    def remember(self, url: str, fingerprint: str, record: EUCRecord):
+        with self._lock:
+            self._seen.add(url)
+            self._records[url] = {"fingerprint": fingerprint, "record": record.to_dict()}
+
+    def reject(self, url: str):
+        with self._lock:
+            self._seen.add(url)
+            self._rejected.add(url)
+
+    def touch(self, url: str):
         """
+        Keep `url`'s entry on save without looking it up (e.g. it was
+        already scraped before a --resume).
+        """
+        with self._lock:
+            self._seen.add(url)
 
-    first_source = first.get("source", "ewheels")
-    if first_source == "alien":
-        first_source_label = "Alien Rides – Electric Unicycles"
-    elif first_source == "nextgen":
-        first_source_label = "NextGen M – EUCs"
-    else:
-        first_source_label = "eWheels – All Vehicles"
+    def accept(self, url: str):
+        """
+        `url` got a valid title this run: forget any earlier rejection.
+        """
+        with self._lock:
+            self._seen.add(url)
+            self._rejected.discard(url)
+
+    def is_rejected(self, url: str) -> bool:
+        with self._lock:
+            return url in self._rejected
+
+    def save(self):
+        with self._lock:
+            records = {url: e for url, e in self._records.items() if url in self._seen}
+            data = {
+                "version": INCREMENTAL_VERSION,
+                "records": records,
+                "rejected": sorted(url for url in self._rejected if url in self._seen),
+            }
 
-    context = {
-        "ROWS_HTML": rows_html,
-        "SUBTITLE_SOURCE_LABEL": html.escape(first_source_label),
-        "SEL_NAME": html.escape(first["name"]),
-        "SEL_BATTYPE": html.escape(first.get("battery_type") or "Battery Type N/A"),
-        "SEL_DESC": html.escape(first.get("description") or "No description available."),
-        "SEL_BATTERY": html.escape(first.get("battery_capacity") or "N/A"),
-        "SEL_RANGE": html.escape(first.get("range") or "N/A"),
-        "SEL_SPEED": html.escape(first.get("speed") or "N/A"),
-        "SEL_MOTOR": html.escape(first.get("motor_power") or "N/A"),
-        "SEL_WEIGHT": html.escape(first.get("weight") or "N/A"),
-        "SEL_MAXLOAD": html.escape(first.get("max_load") or "N/A"),
-        "SEL_URL": html.escape(first.get("url") or "#"),
-        "FIRST_SOURCE": first_source,
-    }
+        os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+        tmp_path = self.path + ".tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(data, f)
+        os.replace(tmp_path, self.path)
 
-    template = """<!DOCTYPE html>
-<html lang="en">
-<head>
-    <meta charset="utf-8">
-    <title>EUC Vault – Multi-Distributor</title>
-    <style>
-        body {
+
+def attr_escape(value: str) -> str:
+    return html.escape(value or "", quote=True)
+
+
+def spec_data_values(euc: EUCRecord) -> dict:
+    """
+    Precomputed numbers for the row's data-* attributes ("" when unknown), so
+    the page JS doesn't have to re-parse the display strings.
+    """
+    values = {}
+    for key in NUMERIC_SPECS:
+        value = getattr(euc, key)
+        values[key] = "" if value is None else f"{value:g}"
+    return values
+
+
+# ---------- HTML BUILDING ----------
+
+# Page stylesheet and script, written out as content-hashed assets by
+# write_page_assets() and linked from the template.
+PAGE_CSS = """        body {
             font-family: system-ui, -apple-system, BlinkMacSystemFont, "Segoe UI", sans-serif;
             background: #020617;
             color: #e5e7eb;
@@ -1100,238 +1705,55 @@ def build_html_table(eucs):
             border-radius: 10px;
             background: #020617;
         }
-    </style>
-</head>
-<body>
+        .video-group-title {
+            grid-column: 1 / -1;
+            margin-top: 4px;
+            font-size: 0.95rem;
+            font-weight: 700;
+            color: #e5e7eb;
+        }
+        .video-group-empty { grid-column: 1 / -1; }
+        .video-thumb {
+            position: relative;
+            display: block;
+            width: 100%;
+            aspect-ratio: 16 / 9;
+            padding: 0;
+            border: none;
+            border-radius: 10px;
+            overflow: hidden;
+            background: #000;
+            cursor: pointer;
+        }
+        .video-thumb img {
+            display: block;
+            width: 100%;
+            height: 100%;
+            object-fit: cover;
+        }
+        .video-thumb:hover img { opacity: 0.85; }
+        .video-duration {
+            position: absolute;
+            right: 6px;
+            bottom: 6px;
+            padding: 1px 6px;
+            border-radius: 6px;
+            background: rgba(0,0,0,0.8);
+            color: #fff;
+            font-size: 0.75rem;
+            font-weight: 600;
+        }
+        .video-title {
+            margin-top: 8px;
+            color: #e5e7eb;
+            font-size: 0.9rem;
+            font-weight: 600;
+            line-height: 1.3;
+        }
+"""
 
-<div class="topbar">
-    <div class="topbar-inner">
-        <div class="topbar-left">
-            <div class="logo-overhang">
-                <img src="EUCVault_Logo.png" class="navbar-logo" alt="EUC Vault Logo">
-            </div>
-        </div>
-        <div class="topbar-links">
-            <button class="topbar-link topbar-link-active"
-                    type="button"
-                    data-distributor="ewheels">
-                eWheels
-            </button>
-            <button class="topbar-link topbar-link-disabled"
-                    type="button"
-                    data-distributor="alien">
-                Alien Rides
-            </button>
-            <button class="topbar-link topbar-link-disabled"
-                    type="button"
-                    data-distributor="nextgen">
-                NextGen M
-            </button>
-        </div>
-        <div class="topbar-right">
-            <div class="topbar-search">
-                <input id="name-search-input" type="text" placeholder="Search wheel name..." />
-                <select id="name-search-select">
-                    <option value="">Or pick a wheel…</option>
-                </select>
-                <button id="name-search-btn" type="button">Search</button>
-            </div>
-        </div>
-    </div>
-</div>
-
-<div class="container">
-    <h1>EUC Vault Table</h1>
-    <div class="subtitle">
-        Data scraped from <span id="subtitle-source-label">__SUBTITLE_SOURCE_LABEL__</span>.
-        Missing or unavailable values are shown as <strong>N/A</strong>.
-    </div>
-
-    <!-- MAIN selected wheel banner (pinned) -->
-    <div class="selected-wrapper" id="selected-wrapper">
-        <div class="selected-image-box" id="selected-image-box"></div>
-        <div class="selected-info">
-            <div class="selected-title" id="sel-name">__SEL_NAME__</div>
-            <div class="badge" id="sel-battype-badge">__SEL_BATTYPE__</div>
-            <div class="selected-desc" id="sel-desc">__SEL_DESC__</div>
-            <div class="selected-specs">
-                <div>
-                    <div class="spec-label">Battery</div>
-                    <div class="spec-value" id="sel-battery">__SEL_BATTERY__</div>
-                </div>
-                <div>
-                    <div class="spec-label">Range</div>
-                    <div class="spec-value" id="sel-range">__SEL_RANGE__</div>
-                </div>
-                <div>
-                    <div class="spec-label">Top Speed</div>
-                    <div class="spec-value" id="sel-speed">__SEL_SPEED__</div>
-                </div>
-                <div>
-                    <div class="spec-label">Motor Power</div>
-                    <div class="spec-value" id="sel-motor">__SEL_MOTOR__</div>
-                </div>
-                <div>
-                    <div class="spec-label">Weight</div>
-                    <div class="spec-value" id="sel-weight">__SEL_WEIGHT__</div>
-                </div>
-                <div>
-                    <div class="spec-label">Max Load</div>
-                    <div class="spec-value" id="sel-maxload">__SEL_MAXLOAD__</div>
-                </div>
-            </div>
-
-            <div class="selected-actions">
-                <button id="compare-toggle-btn" type="button">Compare EUC</button>
-
-                <!-- Range Monitor button -->
-                <button id="range-monitor-btn" type="button">
-                    Range Monitor
-                </button>
-
-                <!-- Video Reviews button -->
-                <button id="video-reviews-btn" type="button">
-                    Video Reviews
-                </button>
-
-                <button id="feedback-btn" type="button">
-                    What do others say about this wheel?
-                </button>
-            </div>
-
-            <div class="view-link">
-                <a href="__SEL_URL__" target="_blank" id="sel-url">
-                    View this wheel →
-                </a>
-            </div>
-        </div>
-    </div>
-
-    <!-- COMPACT comparison popup banner (starts hidden) -->
-    <div class="compare-wrapper" id="compare-wrapper">
-        <div class="selected-image-box" id="cmp-image-box"></div>
-        <div class="selected-info">
-            <div class="selected-title" id="cmp-name">Comparison EUC</div>
-            <div class="badge" id="cmp-battype-badge">Battery Type N/A</div>
-
-            <div class="compare-specs-grid">
-                <div class="compare-spec-block">
-                    <div class="spec-label">Battery</div>
-                    <div class="spec-main">
-                        <span class="spec-value" id="cmp-battery">N/A</span>
-                        <div class="spec-bar"><div class="spec-bar-fill" id="cmp-battery-bar"></div></div>
-                    </div>
-                </div>
-                <div class="compare-spec-block">
-                    <div class="spec-label">Range</div>
-                    <div class="spec-main">
-                        <span class="spec-value" id="cmp-range">N/A</span>
-                        <div class="spec-bar"><div class="spec-bar-fill" id="cmp-range-bar"></div></div>
-                    </div>
-                </div>
-                <div class="compare-spec-block">
-                    <div class="spec-label">Top Speed</div>
-                    <div class="spec-main">
-                        <span class="spec-value" id="cmp-speed">N/A</span>
-                        <div class="spec-bar"><div class="spec-bar-fill" id="cmp-speed-bar"></div></div>
-                    </div>
-                </div>
-                <div class="compare-spec-block">
-                    <div class="spec-label">Motor Power</div>
-                    <div class="spec-main">
-                        <span class="spec-value" id="cmp-motor">N/A</span>
-                        <div class="spec-bar"><div class="spec-bar-fill" id="cmp-motor-bar"></div></div>
-                    </div>
-                </div>
-                <div class="compare-spec-block">
-                    <div class="spec-label">Weight</div>
-                    <div class="spec-main">
-                        <span class="spec-value" id="cmp-weight">N/A</span>
-                        <div class="spec-bar"><div class="spec-bar-fill" id="cmp-weight-bar"></div></div>
-                    </div>
-                </div>
-                <div class="compare-spec-block">
-                    <div class="spec-label">Max Load</div>
-                    <div class="spec-main">
-                        <span class="spec-value" id="cmp-maxload">N/A</span>
-                        <div class="spec-bar"><div class="spec-bar-fill" id="cmp-maxload-bar"></div></div>
-                    </div>
-                </div>
-            </div>
-
-            <div class="selected-actions">
-                <button class="compare-banner-btn" type="button">Compare</button>
-                <button class="compare-clear-btn" type="button">Remove</button>
-                <button class="cmp-feedback-btn" type="button">
-                    What do others say about this wheel?
-                </button>
-            </div>
-            <div class="view-link">
-                <a href="#" target="_blank" id="cmp-url">View this wheel →</a>
-            </div>
-        </div>
-    </div>
-
-    <!-- Video results -->
-    <div class="video-results-wrap" id="video-results-wrap">
-        <div class="video-results-header">
-            <div>
-                <div class="video-results-title" id="video-results-title">Video Reviews</div>
-                <div class="video-results-subtitle" id="video-results-subtitle"></div>
-            </div>
-            <button class="video-back-btn" id="video-back-btn" type="button">Back to Specs</button>
-        </div>
-
-        <div class="video-loading" id="video-loading">
-            Searching YouTube for reviews…
-            <div class="video-progress"><div class="video-progress-fill"></div></div>
-        </div>
-
-        <div class="video-grid" id="video-grid"></div>
-    </div>
-
-    <!-- Specs table wrapper -->
-    <div id="specs-table-wrap">
-        <table>
-            <thead>
-                <tr>
-                    <th class="compare-col">Compare</th>
-                    <th class="name-col">EUC Name</th>
-                    <th>Battery Capacity</th>
-                    <th>Range</th>
-                    <th>Speed</th>
-                    <th>Motor Power</th>
-                    <th>Weight</th>
-                    <th>Max Load</th>
-                    <th>Battery Type</th>
-                </tr>
-            </thead>
-            <tbody id="euc-tbody">
-                __ROWS_HTML__
-            </tbody>
-        </table>
-        <p class="small">
-            NOTE: This is a best-effort scraper. Always double-check critical specs on the original product pages before buying.
-        </p>
-    </div>
-</div>
-
-<div class="feedback-modal-overlay" id="feedback-overlay">
-    <div class="feedback-modal" id="feedback-modal">
-        <div class="feedback-modal-header">
-            <div>
-                <div class="feedback-modal-title">What others say about this wheel</div>
-                <div class="feedback-modal-wheel" id="feedback-wheel-name"></div>
-            </div>
-            <button class="feedback-close-btn" id="feedback-close-btn" type="button">✕</button>
-        </div>
-        <ul class="feedback-list" id="feedback-list"></ul>
-    </div>
-</div>
-
-<script>
-    let compareMode = false;
-    let currentSource = "__FIRST_SOURCE__";  // "ewheels", "alien", or "nextgen"
+PAGE_JS = """    let compareMode = false;
+    let currentSource = document.body.dataset.firstSource || "ewheels";  // "ewheels", "alien", or "nextgen"
 
     // holds the currently selected wheel data (full, for UI)
     let currentWheelPayload = null;
@@ -1448,6 +1870,83 @@ def build_html_table(eucs):
         setSelectedCompact(false);
     }
 
+    function videoEmbed(vid, autoplay) {
+        const iframe = document.createElement('iframe');
+        iframe.className = 'video-embed';
+        iframe.src = 'https://www.youtube.com/embed/' + encodeURIComponent(vid) + (autoplay ? '?autoplay=1' : '');
+        iframe.allow = 'accelerometer; autoplay; clipboard-write; encrypted-media; gyroscope; picture-in-picture; web-share';
+        iframe.allowFullscreen = true;
+        return iframe;
+    }
+
+    function formatDuration(seconds) {
+        const h = Math.floor(seconds / 3600);
+        const m = Math.floor(seconds / 60) % 60;
+        const s = String(seconds % 60).padStart(2, '0');
+        return h ? h + ':' + String(m).padStart(2, '0') + ':' + s : m + ':' + s;
+    }
+
+    // Cards are drawn from the result's metadata; the YouTube player is only
+    // loaded once a thumbnail is clicked (results without a thumbnail embed
+    // right away).
+    function videoCard(wheelName, v) {
+        const vid = v.videoId;
+        if (!vid) return null;
+
+        const card = document.createElement('div');
+        card.className = 'video-card';
+
+        let media;
+        if (v.thumbnail) {
+            media = document.createElement('button');
+            media.type = 'button';
+            media.className = 'video-thumb';
+            media.title = 'Play';
+
+            const img = document.createElement('img');
+            img.src = v.thumbnail;
+            img.alt = v.title || '';
+            img.loading = 'lazy';
+            media.appendChild(img);
+
+            if (v.duration != null) {
+                const duration = document.createElement('span');
+                duration.className = 'video-duration';
+                duration.textContent = formatDuration(v.duration);
+                media.appendChild(duration);
+            }
+            media.addEventListener('click', () => media.replaceWith(videoEmbed(vid, true)));
+        } else {
+            media = videoEmbed(vid, false);
+        }
+
+        const meta = document.createElement('div');
+        meta.className = 'video-meta';
+
+        const a = document.createElement('a');
+        a.href = 'https://www.youtube.com/watch?v=' + encodeURIComponent(vid);
+        a.target = '_blank';
+        a.rel = 'noopener';
+        a.textContent = 'Open on YouTube';
+
+        const small = document.createElement('div');
+        small.className = 'small';
+        small.textContent = [v.channel, v.published].filter(Boolean).join(' · ') || wheelName || '';
+
+        meta.appendChild(a);
+        meta.appendChild(small);
+
+        card.appendChild(media);
+        if (v.title) {
+            const title = document.createElement('div');
+            title.className = 'video-title';
+            title.textContent = v.title;
+            card.appendChild(title);
+        }
+        card.appendChild(meta);
+        return card;
+    }
+
     function renderVideoResults(wheelName, items) {
         const grid = document.getElementById('video-grid');
         if (!grid) return;
@@ -1460,59 +1959,100 @@ def build_html_table(eucs):
         }
 
         items.forEach(v => {
-            const vid = v.videoId;
-            if (!vid) return;
-
-            const card = document.createElement('div');
-            card.className = 'video-card';
+            const card = videoCard(wheelName, v);
+            if (card) grid.appendChild(card);
+        });
+    }
 
-            const iframe = document.createElement('iframe');
-            iframe.className = 'video-embed';
-            iframe.src = 'https://www.youtube.com/embed/' + encodeURIComponent(vid);
-            iframe.allow = 'accelerometer; autoplay; clipboard-write; encrypted-media; gyroscope; picture-in-picture; web-share';
-            iframe.allowFullscreen = true;
+    // Shown when the server's YouTube rate limiter turned a lookup away
+    function videoBusyText(wait) {
+        return 'Video search is busy right now. Try again' + (wait > 0 ? ' in ' + wait + 's' : ' shortly') + '.';
+    }
 
-            const meta = document.createElement('div');
-            meta.className = 'video-meta';
+    // Compare mode: one titled group of results per wheel, in the same grid
+    function renderVideoGroups(groups) {
+        const grid = document.getElementById('video-grid');
+        if (!grid) return;
 
-            const a = document.createElement('a');
-            a.href = 'https://www.youtube.com/watch?v=' + encodeURIComponent(vid);
-            a.target = '_blank';
-            a.rel = 'noopener';
-            a.textContent = 'Open on YouTube';
+        grid.innerHTML = '';
 
-            const small = document.createElement('div');
-            small.className = 'small';
-            small.textContent = wheelName ? wheelName : '';
+        groups.forEach(g => {
+            const title = document.createElement('div');
+            title.className = 'video-group-title';
+            title.textContent = g.wheelName;
+            grid.appendChild(title);
+
+            if (!g.items.length) {
+                const empty = document.createElement('div');
+                empty.className = 'video-empty video-group-empty';
+                empty.textContent = g.busy ? videoBusyText(g.retryAfter) : 'No videos found for this wheel.';
+                grid.appendChild(empty);
+                return;
+            }
+            g.items.forEach(v => {
+                const card = videoCard(g.wheelName, v);
+                if (card) grid.appendChild(card);
+            });
+        });
+    }
 
-            meta.appendChild(a);
-            meta.appendChild(small);
+    function videoQuery(wheelName) {
+        return (wheelName || 'electric unicycle') + ' review';
+    }
 
-            card.appendChild(iframe);
-            card.appendChild(meta);
-            grid.appendChild(card);
-        });
+    // Name of the wheel in the compare banner, if one is showing
+    function compareWheelName() {
+        const wrapper = document.getElementById('compare-wrapper');
+        const nameEl = document.getElementById('cmp-name');
+        if (!compareMode || !wrapper || wrapper.style.display !== 'flex' || !nameEl) return '';
+        return nameEl.textContent.trim();
     }
 
-    async function openVideoReviews(wheelName) {
+    // Fetches every wheel's videos in one request (/api/youtube/batch) when
+    // there's more than one, instead of a round-trip per wheel.
+    async function openVideoReviews(wheelName, compareName) {
         const loading = document.getElementById('video-loading');
         const grid = document.getElementById('video-grid');
+        const names = [wheelName];
+        if (compareName && compareName !== wheelName) names.push(compareName);
 
-        showVideoPanel(wheelName);
+        showVideoPanel(names.join(' vs '));
 
         if (grid) grid.innerHTML = '';
         if (loading) loading.style.display = 'block';
 
-        const q = (wheelName || 'electric unicycle') + ' review';
-        const apiUrl = '/api/youtube?q=' + encodeURIComponent(q);
+        const apiUrl = names.length > 1
+            ? '/api/youtube/batch?' + names.map(n => 'q=' + encodeURIComponent(videoQuery(n))).join('&')
+            : '/api/youtube?q=' + encodeURIComponent(videoQuery(wheelName));
 
         try {
             const resp = await fetch(apiUrl, { cache: "no-store" });
+            if (resp.status === 429 || resp.status === 503) {
+                // The server is rate limiting its YouTube lookups
+                const wait = parseInt(resp.headers.get('Retry-After'), 10);
+                if (loading) loading.style.display = 'none';
+                if (grid) grid.innerHTML = '<div class="video-empty">' + videoBusyText(wait) + '</div>';
+                return;
+            }
             if (!resp.ok) throw new Error('HTTP ' + resp.status);
             const data = await resp.json();
 
             if (loading) loading.style.display = 'none';
-            renderVideoResults(wheelName, data.items || []);
+            if (names.length > 1) {
+                // A wheel the rate limiter turned away comes back with an
+                // error and retry_after instead of items.
+                renderVideoGroups(names.map(n => {
+                    const result = (data.results || {})[videoQuery(n)] || {};
+                    return {
+                        wheelName: n,
+                        items: result.items || [],
+                        busy: Boolean(result.error || result.retry_after),
+                        retryAfter: result.retry_after
+                    };
+                }));
+            } else {
+                renderVideoResults(wheelName, data.items || []);
+            }
         } catch (err) {
             if (loading) loading.style.display = 'none';
             if (grid) {
@@ -1612,6 +2152,17 @@ def build_html_table(eucs):
         return n || 2000;
     }
 
+    // Numbers normalized at scrape time (data-*-wh, data-range-mi, ...); only
+    // fall back to re-parsing the display string when they're missing.
+    function rowNumber(row, key, parser, str) {
+        const raw = row.dataset[key];
+        if (raw !== undefined && raw !== '') {
+            const n = parseFloat(raw);
+            if (!Number.isNaN(n)) return n;
+        }
+        return parser(str);
+    }
+
     function buildWheelPayloadFromRow(row) {
         if (!row) return null;
         return {
@@ -1638,10 +2189,10 @@ def build_html_table(eucs):
         const weight  = row.dataset.weight  || '';
         const image   = row.dataset.image   || '';
 
-        const batteryWh    = parseBatteryWh(battery);
-        const claimedRange = parseRangeMiles(range);
-        const topSpeed     = parseSpeedMph(speed);
-        const wheelWeight  = parseWeightLbs(weight);
+        const batteryWh    = rowNumber(row, 'batteryWh', parseBatteryWh, battery);
+        const claimedRange = rowNumber(row, 'rangeMi', parseRangeMiles, range);
+        const topSpeed     = rowNumber(row, 'speedMph', parseSpeedMph, speed);
+        const wheelWeight  = rowNumber(row, 'weightLbs', parseWeightLbs, weight);
 
         const riderWeight  = 180;
 
@@ -1849,12 +2400,12 @@ def build_html_table(eucs):
             imgBox.appendChild(div);
         }
 
-        const batteryWh = parseBatteryWh(battery);
-        const rangeMi   = parseRangeMiles(range);
-        const speedMph  = parseSpeedMph(speed);
-        const motorW    = parseMotorW(motor);
-        const weightLb  = parseWeightLbs(weight);
-        const maxLoadLb = parseWeightLbs(maxload);
+        const batteryWh = rowNumber(row, 'batteryWh', parseBatteryWh, battery);
+        const rangeMi   = rowNumber(row, 'rangeMi', parseRangeMiles, range);
+        const speedMph  = rowNumber(row, 'speedMph', parseSpeedMph, speed);
+        const motorW    = rowNumber(row, 'motorW', parseMotorW, motor);
+        const weightLb  = rowNumber(row, 'weightLbs', parseWeightLbs, weight);
+        const maxLoadLb = rowNumber(row, 'maxloadLbs', parseWeightLbs, maxload);
 
         setSpecBar('cmp-battery-bar', batteryWh, 4000);
         setSpecBar('cmp-range-bar',   rangeMi,   120);
@@ -2160,7 +2711,7 @@ def build_html_table(eucs):
                 e.stopPropagation();
                 const nameEl = document.getElementById('sel-name');
                 const wheelName = nameEl ? nameEl.textContent.trim() : 'Electric Unicycle';
-                openVideoReviews(wheelName);
+                openVideoReviews(wheelName, compareWheelName());
             });
         }
 
@@ -2275,19 +2826,379 @@ def build_html_table(eucs):
         setCompareMode(false);
         setSource(currentSource || 'ewheels');
     });
-</script>
-
-</body>
-</html>"""
-
-    html_page = template
-    for key, val in context.items():
-        html_page = html_page.replace(f"__{key}__", val)
+"""
 
-    return html_page
+PAGE_CSS_NAME = euc_assets.asset_name("euc_vault", "css", PAGE_CSS)
+PAGE_JS_NAME = euc_assets.asset_name("euc_vault", "js", PAGE_JS)
 
+PAGE_TEMPLATE = """<!DOCTYPE html>
+<html lang="en">
+<head>
+    <meta charset="utf-8">
+    <title>EUC Vault – Multi-Distributor</title>
+    <link rel="stylesheet" href="__ASSET_CSS__">
+</head>
+<body data-first-source="__FIRST_SOURCE__">
 
-# ----------------- Local server + YouTube API -----------------
+<div class="topbar">
+    <div class="topbar-inner">
+        <div class="topbar-left">
+            <div class="logo-overhang">
+                <img src="EUCVault_Logo.png" class="navbar-logo" alt="EUC Vault Logo">
+            </div>
+        </div>
+        <div class="topbar-links">
+            <button class="topbar-link topbar-link-active"
+                    type="button"
+                    data-distributor="ewheels">
+                eWheels
+            </button>
+            <button class="topbar-link topbar-link-disabled"
+                    type="button"
+                    data-distributor="alien">
+                Alien Rides
+            </button>
+            <button class="topbar-link topbar-link-disabled"
+                    type="button"
+                    data-distributor="nextgen">
+                NextGen M
+            </button>
+        </div>
+        <div class="topbar-right">
+            <div class="topbar-search">
+                <input id="name-search-input" type="text" placeholder="Search wheel name..." />
+                <select id="name-search-select">
+                    <option value="">Or pick a wheel…</option>
+                </select>
+                <button id="name-search-btn" type="button">Search</button>
+            </div>
+        </div>
+    </div>
+</div>
+
+<div class="container">
+    <h1>EUC Vault Table</h1>
+    <div class="subtitle">
+        Data scraped from <span id="subtitle-source-label">__SUBTITLE_SOURCE_LABEL__</span>.
+        Missing or unavailable values are shown as <strong>N/A</strong>.
+    </div>
+
+    <!-- MAIN selected wheel banner (pinned) -->
+    <div class="selected-wrapper" id="selected-wrapper">
+        <div class="selected-image-box" id="selected-image-box"></div>
+        <div class="selected-info">
+            <div class="selected-title" id="sel-name">__SEL_NAME__</div>
+            <div class="badge" id="sel-battype-badge">__SEL_BATTYPE__</div>
+            <div class="selected-desc" id="sel-desc">__SEL_DESC__</div>
+            <div class="selected-specs">
+                <div>
+                    <div class="spec-label">Battery</div>
+                    <div class="spec-value" id="sel-battery">__SEL_BATTERY__</div>
+                </div>
+                <div>
+                    <div class="spec-label">Range</div>
+                    <div class="spec-value" id="sel-range">__SEL_RANGE__</div>
+                </div>
+                <div>
+                    <div class="spec-label">Top Speed</div>
+                    <div class="spec-value" id="sel-speed">__SEL_SPEED__</div>
+                </div>
+                <div>
+                    <div class="spec-label">Motor Power</div>
+                    <div class="spec-value" id="sel-motor">__SEL_MOTOR__</div>
+                </div>
+                <div>
+                    <div class="spec-label">Weight</div>
+                    <div class="spec-value" id="sel-weight">__SEL_WEIGHT__</div>
+                </div>
+                <div>
+                    <div class="spec-label">Max Load</div>
+                    <div class="spec-value" id="sel-maxload">__SEL_MAXLOAD__</div>
+                </div>
+            </div>
+
+            <div class="selected-actions">
+                <button id="compare-toggle-btn" type="button">Compare EUC</button>
+
+                <!-- Range Monitor button -->
+                <button id="range-monitor-btn" type="button">
+                    Range Monitor
+                </button>
+
+                <!-- Video Reviews button -->
+                <button id="video-reviews-btn" type="button">
+                    Video Reviews
+                </button>
+
+                <button id="feedback-btn" type="button">
+                    What do others say about this wheel?
+                </button>
+            </div>
+
+            <div class="view-link">
+                <a href="__SEL_URL__" target="_blank" id="sel-url">
+                    View this wheel →
+                </a>
+            </div>
+        </div>
+    </div>
+
+    <!-- COMPACT comparison popup banner (starts hidden) -->
+    <div class="compare-wrapper" id="compare-wrapper">
+        <div class="selected-image-box" id="cmp-image-box"></div>
+        <div class="selected-info">
+            <div class="selected-title" id="cmp-name">Comparison EUC</div>
+            <div class="badge" id="cmp-battype-badge">Battery Type N/A</div>
+
+            <div class="compare-specs-grid">
+                <div class="compare-spec-block">
+                    <div class="spec-label">Battery</div>
+                    <div class="spec-main">
+                        <span class="spec-value" id="cmp-battery">N/A</span>
+                        <div class="spec-bar"><div class="spec-bar-fill" id="cmp-battery-bar"></div></div>
+                    </div>
+                </div>
+                <div class="compare-spec-block">
+                    <div class="spec-label">Range</div>
+                    <div class="spec-main">
+                        <span class="spec-value" id="cmp-range">N/A</span>
+                        <div class="spec-bar"><div class="spec-bar-fill" id="cmp-range-bar"></div></div>
+                    </div>
+                </div>
+                <div class="compare-spec-block">
+                    <div class="spec-label">Top Speed</div>
+                    <div class="spec-main">
+                        <span class="spec-value" id="cmp-speed">N/A</span>
+                        <div class="spec-bar"><div class="spec-bar-fill" id="cmp-speed-bar"></div></div>
+                    </div>
+                </div>
+                <div class="compare-spec-block">
+                    <div class="spec-label">Motor Power</div>
+                    <div class="spec-main">
+                        <span class="spec-value" id="cmp-motor">N/A</span>
+                        <div class="spec-bar"><div class="spec-bar-fill" id="cmp-motor-bar"></div></div>
+                    </div>
+                </div>
+                <div class="compare-spec-block">
+                    <div class="spec-label">Weight</div>
+                    <div class="spec-main">
+                        <span class="spec-value" id="cmp-weight">N/A</span>
+                        <div class="spec-bar"><div class="spec-bar-fill" id="cmp-weight-bar"></div></div>
+                    </div>
+                </div>
+                <div class="compare-spec-block">
+                    <div class="spec-label">Max Load</div>
+                    <div class="spec-main">
+                        <span class="spec-value" id="cmp-maxload">N/A</span>
+                        <div class="spec-bar"><div class="spec-bar-fill" id="cmp-maxload-bar"></div></div>
+                    </div>
+                </div>
+            </div>
+
+            <div class="selected-actions">
+                <button class="compare-banner-btn" type="button">Compare</button>
+                <button class="compare-clear-btn" type="button">Remove</button>
+                <button class="cmp-feedback-btn" type="button">
+                    What do others say about this wheel?
+                </button>
+            </div>
+            <div class="view-link">
+                <a href="#" target="_blank" id="cmp-url">View this wheel →</a>
+            </div>
+        </div>
+    </div>
+
+    <!-- Video results -->
+    <div class="video-results-wrap" id="video-results-wrap">
+        <div class="video-results-header">
+            <div>
+                <div class="video-results-title" id="video-results-title">Video Reviews</div>
+                <div class="video-results-subtitle" id="video-results-subtitle"></div>
+            </div>
+            <button class="video-back-btn" id="video-back-btn" type="button">Back to Specs</button>
+        </div>
+
+        <div class="video-loading" id="video-loading">
+            Searching YouTube for reviews…
+            <div class="video-progress"><div class="video-progress-fill"></div></div>
+        </div>
+
+        <div class="video-grid" id="video-grid"></div>
+    </div>
+
+    <!-- Specs table wrapper -->
+    <div id="specs-table-wrap">
+        <table>
+            <thead>
+                <tr>
+                    <th class="compare-col">Compare</th>
+                    <th class="name-col">EUC Name</th>
+                    <th>Battery Capacity</th>
+                    <th>Range</th>
+                    <th>Speed</th>
+                    <th>Motor Power</th>
+                    <th>Weight</th>
+                    <th>Max Load</th>
+                    <th>Battery Type</th>
+                </tr>
+            </thead>
+            <tbody id="euc-tbody">
+                __ROWS_HTML__
+            </tbody>
+        </table>
+        <p class="small">
+            NOTE: This is a best-effort scraper. Always double-check critical specs on the original product pages before buying.
+        </p>
+    </div>
+</div>
+
+<div class="feedback-modal-overlay" id="feedback-overlay">
+    <div class="feedback-modal" id="feedback-modal">
+        <div class="feedback-modal-header">
+            <div>
+                <div class="feedback-modal-title">What others say about this wheel</div>
+                <div class="feedback-modal-wheel" id="feedback-wheel-name"></div>
+            </div>
+            <button class="feedback-close-btn" id="feedback-close-btn" type="button">✕</button>
+        </div>
+        <ul class="feedback-list" id="feedback-list"></ul>
+    </div>
+</div>
+
+<script src="__ASSET_JS__"></script>
+
+</body>
+</html>"""
+
+
+TEMPLATE_KEYS = (
+    "ROWS_HTML", "SUBTITLE_SOURCE_LABEL",
+    "SEL_NAME", "SEL_BATTYPE", "SEL_DESC", "SEL_BATTERY", "SEL_RANGE", "SEL_SPEED",
+    "SEL_MOTOR", "SEL_WEIGHT", "SEL_MAXLOAD", "SEL_URL",
+    "FIRST_SOURCE", "ASSET_CSS", "ASSET_JS",
+)
+
+
+def compile_template(template: str, keys=TEMPLATE_KEYS):
+    """
+    Split `template` once into (literal, key) segments, one per __KEY__
+    placeholder; the last segment's key is None. Rendering then walks the
+    list instead of re-copying the whole page for every str.replace().
+    """
+    pattern = re.compile("__(" + "|".join(re.escape(k) for k in keys) + ")__")
+    segments = []
+    pos = 0
+    for m in pattern.finditer(template):
+        segments.append((template[pos:m.start()], m.group(1)))
+        pos = m.end()
+    segments.append((template[pos:], None))
+    return segments
+
+
+PAGE_SEGMENTS = compile_template(PAGE_TEMPLATE)
+
+
+def render_row(e: EUCRecord) -> str:
+    nums = spec_data_values(e)
+    return f"""
+        <tr class="wheel-row"
+            data-name="{attr_escape(e.name)}"
+            data-battery="{attr_escape(e.battery_capacity)}"
+            data-range="{attr_escape(e.range)}"
+            data-speed="{attr_escape(e.speed)}"
+            data-motor="{attr_escape(e.motor_power)}"
+            data-weight="{attr_escape(e.weight)}"
+            data-maxload="{attr_escape(e.max_load)}"
+            data-battype="{attr_escape(e.battery_type)}"
+            data-url="{attr_escape(e.url)}"
+            data-image="{attr_escape(e.image_url)}"
+            data-desc="{attr_escape(e.description)}"
+            data-source="{attr_escape(e.source)}"
+            data-battery-wh="{nums['battery_wh']}"
+            data-range-mi="{nums['range_mi']}"
+            data-speed-mph="{nums['speed_mph']}"
+            data-motor-w="{nums['motor_w']}"
+            data-weight-lbs="{nums['weight_lbs']}"
+            data-maxload-lbs="{nums['max_load_lbs']}">
+            <td class="compare-col">
+                <button class="compare-btn" type="button">Compare</button>
+            </td>
+            <td>{html.escape(e.name)}</td>
+            <td>{html.escape(e.battery_capacity)}</td>
+            <td>{html.escape(e.range)}</td>
+            <td>{html.escape(e.speed)}</td>
+            <td>{html.escape(e.motor_power)}</td>
+            <td>{html.escape(e.weight)}</td>
+            <td>{html.escape(e.max_load)}</td>
+            <td>{html.escape(e.battery_type)}</td>
+        </tr>
+        """
+
+
+def iter_html_table(eucs):
+    """
+    Yield the page as a stream of string chunks (template literals, context
+    values and one chunk per table row), e.g. for file.writelines().
+    """
+    eucs_sorted = sorted(eucs, key=lambda x: x.name.lower())
+
+    first = None
+    for e in eucs_sorted:
+        if e.source == "ewheels":
+            first = e
+            break
+    if not first:
+        first = eucs_sorted[0] if eucs_sorted else EUCRecord.placeholder(
+            "N/A", "#", "ewheels", description="No wheels found.")
+
+    first_source = first.source or "ewheels"
+    if first_source == "alien":
+        first_source_label = "Alien Rides – Electric Unicycles"
+    elif first_source == "nextgen":
+        first_source_label = "NextGen M – EUCs"
+    else:
+        first_source_label = "eWheels – All Vehicles"
+
+    context = {
+        "SUBTITLE_SOURCE_LABEL": html.escape(first_source_label),
+        "SEL_NAME": html.escape(first.name),
+        "SEL_BATTYPE": html.escape(first.battery_type or "Battery Type N/A"),
+        "SEL_DESC": html.escape(first.description or "No description available."),
+        "SEL_BATTERY": html.escape(first.battery_capacity or "N/A"),
+        "SEL_RANGE": html.escape(first.range or "N/A"),
+        "SEL_SPEED": html.escape(first.speed or "N/A"),
+        "SEL_MOTOR": html.escape(first.motor_power or "N/A"),
+        "SEL_WEIGHT": html.escape(first.weight or "N/A"),
+        "SEL_MAXLOAD": html.escape(first.max_load or "N/A"),
+        "SEL_URL": html.escape(first.url or "#"),
+        "FIRST_SOURCE": attr_escape(first_source),
+        "ASSET_CSS": "assets/" + PAGE_CSS_NAME,
+        "ASSET_JS": "assets/" + PAGE_JS_NAME,
+    }
+
+    for literal, key in PAGE_SEGMENTS:
+        yield literal
+        if key == "ROWS_HTML":
+            for e in eucs_sorted:
+                yield render_row(e)
+        elif key is not None:
+            yield context[key]
+
+
+def build_html_table(eucs) -> str:
+    return "".join(iter_html_table(eucs))
+
+
+def write_page_assets(directory: str = euc_assets.ASSETS_DIR):
+    """
+    Write the page's hashed CSS/JS next to index.html (no-op when this
+    version is already there).
+    """
+    euc_assets.write_asset("euc_vault", "css", PAGE_CSS, directory)
+    euc_assets.write_asset("euc_vault", "js", PAGE_JS, directory)
+
+
+# ----------------- Local server + YouTube API -----------------
 
 class EUCVaultHandler(SimpleHTTPRequestHandler):
     def do_GET(self):
@@ -2295,55 +3206,197 @@ class EUCVaultHandler(SimpleHTTPRequestHandler):
 
         if parsed.path == "/api/youtube":
             qs = parse_qs(parsed.query or "")
-            q = (qs.get("q", ["electric unicycle review"])[0] or "").strip()
+            q = (qs.get("q", [euc_youtube.DEFAULT_QUERY])[0] or "").strip()
+            try:
+                payload = euc_youtube.get_search().search(q)
+            except euc_ratelimit.Overloaded as e:
+                self.send_json({"error": str(e), "retry_after": e.retry_after}, status=e.status,
+                               cache_control="no-store", headers={"Retry-After": str(e.retry_after)})
+                return
+            self.send_json(payload, cache_control="no-store")
+            return
 
-            items = []
+        if parsed.path == "/api/youtube/batch":
+            qs = parse_qs(parsed.query or "")
             try:
-                url = "https://www.youtube.com/results?search_query=" + requests.utils.quote(q)
-                r = requests.get(url, headers=HEADERS, timeout=25)
-                r.raise_for_status()
-
-                ids = re.findall(r'videoId":"([a-zA-Z0-9_-]{11})"', r.text)
-                seen = set()
-                for vid in ids:
-                    if vid in seen:
-                        continue
-                    seen.add(vid)
-                    items.append({"videoId": vid})
-
-                    # number of youtube results on page
-                    if len(items) >= 20:
-                        break
-            except Exception:
-                items = []
-
-            payload = {"query": q, "items": items}
-            body = json.dumps(payload).encode("utf-8")
-
-            self.send_response(200)
-            self.send_header("Content-Type", "application/json; charset=utf-8")
-            self.send_header("Cache-Control", "no-store")
-            self.send_header("Content-Length", str(len(body)))
-            self.end_headers()
-            self.wfile.write(body)
+                queries = euc_youtube.batch_queries(qs.get("q", []))
+            except ValueError as e:
+                self.send_json({"error": str(e)}, status=400)
+                return
+            self.send_json(euc_youtube.get_search().search_many(queries), cache_control="no-store")
+            return
+
+        if parsed.path == "/api/youtube/stats":
+            self.send_json(euc_youtube.get_search().stats(), cache_control="no-store")
+            return
+
+        if parsed.path.startswith(euc_assets.ASSETS_URL_PATH):
+            return self.send_asset(parsed.path[len(euc_assets.ASSETS_URL_PATH):])
+
+        if parsed.path == "/api/wheels":
+            qs = parse_qs(parsed.query or "")
+            status = 200
+            try:
+                payload = euc_catalog.get_store().query_params({k: v[0] for k, v in qs.items()})
+            except ValueError as e:
+                status, payload = 400, {"error": str(e)}
+            self.send_json(payload, status=status)
             return
 
         return super().do_GET()
 
+    def send_asset(self, name):
+        asset = euc_assets.resolve_asset(name)
+        if asset is None:
+            self.send_error(404, "File not found")
+            return
+        path, etag, content_type = asset
+        path, encoding = euc_compress.negotiate_file(path, self.headers.get("Accept-Encoding"))
+        etag = euc_compress.variant_etag(etag, encoding)
+
+        if euc_assets.etag_matches(self.headers.get("If-None-Match"), etag):
+            self.send_response(304)
+            self.send_header("ETag", etag)
+            self.send_header("Cache-Control", euc_assets.IMMUTABLE_CACHE_CONTROL)
+            self.send_header("Vary", "Accept-Encoding")
+            self.end_headers()
+            return
 
-def main():
-    # Scrape all distributors
-    ewheels_products = get_ewheels_product_links()
-    alien_products = get_alien_product_links()
-    nextgen_products = get_nextgen_product_links()
+        with open(path, "rb") as f:
+            body = f.read()
+        self.send_response(200)
+        self.send_header("Content-Type", content_type)
+        if encoding:
+            self.send_header("Content-Encoding", encoding)
+        self.send_header("Vary", "Accept-Encoding")
+        self.send_header("Content-Length", str(len(body)))
+        self.send_header("ETag", etag)
+        self.send_header("Cache-Control", euc_assets.IMMUTABLE_CACHE_CONTROL)
+        self.end_headers()
+        self.wfile.write(body)
+
+    def send_json(self, payload, status=200, cache_control=None, headers=None):
+        body = json.dumps(payload).encode("utf-8")
+        body, encoding = euc_compress.compress_response(body, self.headers.get("Accept-Encoding"))
+
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json; charset=utf-8")
+        if cache_control:
+            self.send_header("Cache-Control", cache_control)
+        for name, value in (headers or {}).items():
+            self.send_header(name, value)
+        if encoding:
+            self.send_header("Content-Encoding", encoding)
+        self.send_header("Vary", "Accept-Encoding")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def send_head(self):
+        """
+        Static files: send a fresh precompressed sibling when the client
+        accepts one, otherwise fall back to the plain file.
+        """
+        path = self.translate_path(self.path)
+        if not (euc_compress.is_compressible(path) and os.path.isfile(path)):
+            return super().send_head()
 
-    all_products = ewheels_products + alien_products + nextgen_products
-    eucs = [parse_product_page(p) for p in all_products]
+        served, encoding = euc_compress.negotiate_file(path, self.headers.get("Accept-Encoding"))
+        if encoding is None:
+            self._vary_encoding = True
+            return super().send_head()
 
-    html_page = build_html_table(eucs)
+        try:
+            f = open(served, "rb")
+        except OSError:
+            self._vary_encoding = True
+            return super().send_head()
+        fs = os.fstat(f.fileno())
+        self.send_response(200)
+        self.send_header("Content-Type", self.guess_type(path))
+        self.send_header("Content-Encoding", encoding)
+        self.send_header("Vary", "Accept-Encoding")
+        self.send_header("Content-Length", str(fs.st_size))
+        self.send_header("Last-Modified", self.date_time_string(fs.st_mtime))
+        self.end_headers()
+        return f
+
+    def end_headers(self):
+        # Plain responses for files that also have compressed variants.
+        if getattr(self, "_vary_encoding", False):
+            self._vary_encoding = False
+            self.send_header("Vary", "Accept-Encoding")
+        super().end_headers()
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Scrape EUC distributors and build the EUC Vault page.")
+    parser.add_argument("--workers", type=int, default=SCRAPE_WORKERS,
+                        help=f"product pages fetched concurrently (default {SCRAPE_WORKERS})")
+    parser.add_argument("--per-host", type=int, default=PER_HOST_CONCURRENCY,
+                        help=f"max concurrent fetches per distributor host (default {PER_HOST_CONCURRENCY})")
+    parser.add_argument("--no-cache", action="store_true",
+                        help="skip the on-disk HTTP response cache and download everything in full")
+    parser.add_argument("--incremental", action="store_true",
+                        help="reuse records for products whose pages haven't changed since the last run")
+    parser.add_argument("--state-file", default=INCREMENTAL_STATE_FILE,
+                        help=f"where --incremental keeps its state (default {INCREMENTAL_STATE_FILE})")
+    parser.add_argument("--resume", action="store_true",
+                        help="continue an interrupted run: skip products already in the checkpoint")
+    parser.add_argument("--checkpoint", default=CHECKPOINT_FILE,
+                        help=f"JSONL file finished records are streamed to (default {CHECKPOINT_FILE})")
+    parser.add_argument("--catalog-db", default=euc_catalog.CATALOG_DB,
+                        help=f"SQLite catalog served by /api/wheels (default {euc_catalog.CATALOG_DB})")
+    parser.add_argument("--no-prewarm", action="store_true",
+                        help="don't look up video reviews for every wheel in the background after the build")
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    if args.no_cache:
+        euc_http.configure_response_cache(enabled=False)
+
+    state = IncrementalState(args.state_file) if args.incremental else None
+
+    checkpoint = ScrapeCheckpoint(args.checkpoint, resume=args.resume)
+    if args.resume:
+        print(f"Resuming: {len(checkpoint)} records already in {args.checkpoint}.")
+
+    # Discover all distributors at once. Shopify stores come back as finished
+    # records from products.json; everything else as product pages to scrape.
+    catalog_eucs, all_products = discover_all(state=state)
+    for euc in catalog_eucs:
+        checkpoint.append(euc)
+
+    scraped = scrape_products(all_products, workers=args.workers, per_host=args.per_host,
+                              state=state, checkpoint=checkpoint)
+    checkpoint.close()
+
+    # Everything that finished (this run or a resumed one) is in the
+    # checkpoint; failed fetches only exist as placeholders in `scraped`.
+    eucs = checkpoint.records() + [e for e in scraped if e.url not in checkpoint]
+
+    if state:
+        state.save()
+        print(f"Incremental: reused {state.reused} of {len(eucs)} records unchanged since the last run.")
+
+    catalog = euc_catalog.configure_store(args.catalog_db)
+    print(f"Catalog: stored {catalog.replace_all(eucs)} records in {args.catalog_db}.")
+
+    write_page_assets()
     out_file = "index.html"
     with open(out_file, "w", encoding="utf-8") as f:
-        f.write(html_page)
+        f.writelines(iter_html_table(eucs))
+    euc_compress.precompress_directory(".")
+    euc_compress.precompress_directory(euc_assets.ASSETS_DIR)
+
+    if not args.no_prewarm:
+        # The same queries the page's Video Reviews panel sends.
+        queries = [f"{e.name} review" for e in eucs if e.name]
+        euc_youtube.get_search().start_prewarm(queries)
+        print(f"Pre-warming video reviews for {len(queries)} wheels in the background "
+              f"(at most {euc_youtube.PREWARM_RATE:g} lookups/s).")
 
     # Serve locally so Video Reviews can call /api/youtube
     server = ThreadingHTTPServer(("127.0.0.1", 0), EUCVaultHandler)  # 0 = pick free port
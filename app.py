@@ -1,44 +1,106 @@
+import mimetypes
 import os
-import re
 
-import requests
-from flask import Flask, send_from_directory, request, jsonify
+from flask import Flask, abort, jsonify, request, send_file, send_from_directory
 
-HEADERS = {"User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64)"}
+import euc_assets
+import euc_catalog
+import euc_compress
+import euc_ratelimit
+import euc_youtube
 
-app = Flask(__name__, static_folder=".", static_url_path="")
+# Static files go through send_static() below so they can be served
+# precompressed; Flask's own static route would shadow it.
+app = Flask(__name__, static_folder=None)
+
+def send_static(path):
+    """
+    send_from_directory(), but picks a precompressed .br/.gz sibling when the
+    client accepts one.
+    """
+    full_path = os.path.join(app.root_path, path)
+    _, encoding = euc_compress.negotiate_file(full_path, request.headers.get("Accept-Encoding"))
+    if encoding is None:
+        resp = send_from_directory(".", path)
+    else:
+        resp = send_from_directory(".", path + euc_compress.ENCODING_SUFFIXES[encoding],
+                                   mimetype=mimetypes.guess_type(path)[0])
+        resp.headers["Content-Encoding"] = encoding
+    if euc_compress.is_compressible(path):
+        resp.vary.add("Accept-Encoding")
+    return resp
+
+@app.after_request
+def compress_json(resp):
+    if resp.mimetype == "application/json" and not resp.direct_passthrough \
+            and "Content-Encoding" not in resp.headers:
+        body, encoding = euc_compress.compress_response(resp.get_data(), request.headers.get("Accept-Encoding"))
+        if encoding:
+            resp.set_data(body)
+            resp.headers["Content-Encoding"] = encoding
+        resp.vary.add("Accept-Encoding")
+    return resp
+
+@app.errorhandler(euc_ratelimit.Overloaded)
+def upstream_overloaded(e):
+    resp = jsonify({"error": str(e), "retry_after": e.retry_after})
+    resp.status_code = e.status
+    resp.headers["Retry-After"] = str(e.retry_after)
+    return resp
 
 @app.get("/")
 def home():
-    return send_from_directory(".", "index.html")
+    return send_static("index.html")
 
 @app.get("/api/youtube")
 def api_youtube():
-    q = (request.args.get("q") or "electric unicycle review").strip()
-    items = []
+    q = (request.args.get("q") or euc_youtube.DEFAULT_QUERY).strip()
+    return jsonify(euc_youtube.get_search().search(q))
+
+@app.get("/api/youtube/batch")
+def api_youtube_batch():
+    try:
+        queries = euc_youtube.batch_queries(request.args.getlist("q"))
+    except ValueError as e:
+        return jsonify({"error": str(e)}), 400
+    return jsonify(euc_youtube.get_search().search_many(queries))
+
+@app.get("/api/youtube/stats")
+def api_youtube_stats():
+    return jsonify(euc_youtube.get_search().stats())
 
+@app.get("/api/wheels")
+def api_wheels():
     try:
-        url = "https://www.youtube.com/results?search_query=" + requests.utils.quote(q)
-        r = requests.get(url, headers=HEADERS, timeout=25)
-        r.raise_for_status()
-
-        ids = re.findall(r'videoId":"([a-zA-Z0-9_-]{11})"', r.text)
-        seen = set()
-        for vid in ids:
-            if vid in seen:
-                continue
-            seen.add(vid)
-            items.append({"videoId": vid})
-            if len(items) >= 20:
-                break
-    except Exception:
-        items = []
-
-    return jsonify({"query": q, "items": items})
+        payload = euc_catalog.get_store().query_params(request.args)
+    except ValueError as e:
+        return jsonify({"error": str(e)}), 400
+    return jsonify(payload)
+
+@app.get("/assets/<name>")
+def assets(name):
+    asset = euc_assets.resolve_asset(name)
+    if asset is None:
+        abort(404)
+    path, etag, _ = asset
+    served, encoding = euc_compress.negotiate_file(path, request.headers.get("Accept-Encoding"))
+    etag = euc_compress.variant_etag(etag, encoding)
+
+    if euc_assets.etag_matches(request.headers.get("If-None-Match"), etag):
+        resp = app.response_class(status=304)
+    else:
+        resp = send_file(os.path.abspath(served), mimetype=mimetypes.guess_type(name)[0],
+                         conditional=False, etag=False)
+        if encoding:
+            resp.headers["Content-Encoding"] = encoding
+    resp.vary.add("Accept-Encoding")
+    resp.headers["ETag"] = etag
+    resp.headers["Cache-Control"] = euc_assets.IMMUTABLE_CACHE_CONTROL
+    return resp
 
 @app.get("/<path:path>")
 def static_files(path):
-    return send_from_directory(".", path)
+    return send_static(path)
 
 if __name__ == "__main__":
     # DigitalOcean provides PORT
@@ -0,0 +1,152 @@
+"""
+Async (ASGI) variant of app.py with the same routes.
+
+Under app.py's sync gunicorn workers every /api/youtube lookup holds a whole
+worker while it waits on YouTube, so a few slow lookups can starve static
+files. Here lookups are coroutines on an httpx client, and one process keeps
+hundreds of them in flight while still serving pages.
+
+    uvicorn asgi_app:app --host 0.0.0.0 --port $PORT
+    gunicorn asgi_app:app -k uvicorn.workers.UvicornWorker --bind 0.0.0.0:$PORT
+"""
+import asyncio
+import contextlib
+import json
+import mimetypes
+import os
+
+from starlette.applications import Starlette
+from starlette.responses import FileResponse, Response
+from starlette.routing import Route
+
+import euc_assets
+import euc_catalog
+import euc_compress
+import euc_ratelimit
+import euc_youtube
+
+ROOT = os.path.dirname(os.path.abspath(__file__))
+
+
+def json_response(request, payload, status=200, headers=None) -> Response:
+    body = json.dumps(payload).encode("utf-8")
+    body, encoding = euc_compress.compress_response(body, request.headers.get("accept-encoding"))
+    headers = {**(headers or {}), "Vary": "Accept-Encoding"}
+    if encoding:
+        headers["Content-Encoding"] = encoding
+    return Response(body, status_code=status, media_type="application/json", headers=headers)
+
+
+def not_found() -> Response:
+    return Response("Not Found", status_code=404, media_type="text/plain")
+
+
+def send_static(request, path) -> Response:
+    """
+    Serve a file under ROOT, picking a precompressed .br/.gz sibling when the
+    client accepts one.
+    """
+    full_path = os.path.realpath(os.path.join(ROOT, path))
+    if os.path.commonpath([ROOT, full_path]) != ROOT or not os.path.isfile(full_path):
+        return not_found()
+
+    served, encoding = euc_compress.negotiate_file(full_path, request.headers.get("accept-encoding"))
+    resp = FileResponse(served, media_type=mimetypes.guess_type(full_path)[0] or "application/octet-stream",
+                        stat_result=os.stat(served))
+    if encoding:
+        resp.headers["Content-Encoding"] = encoding
+    if euc_compress.is_compressible(full_path):
+        resp.headers["Vary"] = "Accept-Encoding"
+
+    if request.headers.get("if-none-match") == resp.headers.get("etag"):
+        return Response(status_code=304, headers={k: v for k, v in resp.headers.items()
+                                                   if k in ("etag", "last-modified", "vary")})
+    return resp
+
+
+async def upstream_overloaded(request, exc):
+    return json_response(request, {"error": str(exc), "retry_after": exc.retry_after}, status=exc.status,
+                         headers={"Retry-After": str(exc.retry_after)})
+
+
+async def home(request):
+    return send_static(request, "index.html")
+
+
+async def api_youtube(request):
+    q = (request.query_params.get("q") or euc_youtube.DEFAULT_QUERY).strip()
+    return json_response(request, await request.app.state.search.search(q))
+
+
+async def api_youtube_batch(request):
+    try:
+        queries = euc_youtube.batch_queries(request.query_params.getlist("q"))
+    except ValueError as e:
+        return json_response(request, {"error": str(e)}, status=400)
+    return json_response(request, await request.app.state.search.search_many(queries))
+
+
+async def api_youtube_stats(request):
+    return json_response(request, request.app.state.search.stats())
+
+
+async def api_wheels(request):
+    try:
+        payload = await asyncio.to_thread(euc_catalog.get_store().query_params, request.query_params)
+    except ValueError as e:
+        return json_response(request, {"error": str(e)}, status=400)
+    return json_response(request, payload)
+
+
+async def assets(request):
+    name = request.path_params["name"]
+    asset = euc_assets.resolve_asset(name)
+    if asset is None:
+        return not_found()
+    path, etag, content_type = asset
+    served, encoding = euc_compress.negotiate_file(path, request.headers.get("accept-encoding"))
+    etag = euc_compress.variant_etag(etag, encoding)
+
+    headers = {
+        "ETag": etag,
+        "Cache-Control": euc_assets.IMMUTABLE_CACHE_CONTROL,
+        "Vary": "Accept-Encoding",
+    }
+    if euc_assets.etag_matches(request.headers.get("if-none-match"), etag):
+        return Response(status_code=304, headers=headers)
+    if encoding:
+        headers["Content-Encoding"] = encoding
+    return FileResponse(served, media_type=content_type, headers=headers)
+
+
+async def static_files(request):
+    return send_static(request, request.path_params["path"])
+
+
+@contextlib.asynccontextmanager
+async def lifespan(app):
+    app.state.search = euc_youtube.AsyncYouTubeSearch(shared=euc_youtube.open_shared_cache())
+    try:
+        yield
+    finally:
+        await app.state.search.aclose()
+
+
+app = Starlette(
+    routes=[
+        Route("/", home),
+        Route("/api/youtube", api_youtube),
+        Route("/api/youtube/batch", api_youtube_batch),
+        Route("/api/youtube/stats", api_youtube_stats),
+        Route("/api/wheels", api_wheels),
+        Route("/assets/{name}", assets),
+        Route("/{path:path}", static_files),
+    ],
+    exception_handlers={euc_ratelimit.Overloaded: upstream_overloaded},
+    lifespan=lifespan,
+)
+
+if __name__ == "__main__":
+    import uvicorn
+
+    uvicorn.run(app, host="0.0.0.0", port=int(os.environ.get("PORT", "8080")))
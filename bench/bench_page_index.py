@@ -0,0 +1,71 @@
+"""
+Compare the old per-label stat scans with the single-pass index_page().
+
+    python bench/bench_page_index.py [saved_page.html ...]
+
+Defaults to the recorded fixture in bench/fixtures. Parsing is done once up
+front; only the extraction work after parsing is timed.
+"""
+import glob
+import os
+import sys
+import timeit
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.dirname(HERE))
+
+from bs4 import BeautifulSoup  # noqa: E402
+
+import EUC_TrackerAndCompare as tracker  # noqa: E402
+
+
+def extract_stat_block(soup, label_text):
+    # The per-label scan the scraper used before index_page().
+    label_text = label_text.lower()
+    for node in soup.find_all(text=True):
+        t = node.strip().lower()
+        if t == label_text:
+            parent = node.parent
+            sib = parent.find_next_sibling()
+            if sib:
+                value = tracker.clean_text(sib.get_text())
+                if value:
+                    return value
+    return None
+
+
+def old_extract(soup):
+    page_text = soup.get_text(separator=" ")
+    stats = {}
+    for label in tracker.STAT_LABELS:
+        value = extract_stat_block(soup, label)
+        if value:
+            stats[label.lower()] = value
+    # extract_description's body-text fallback used to rebuild the text again
+    soup.get_text(separator=" ")
+    return stats, page_text
+
+
+def new_extract(soup):
+    return tracker.index_page(soup)
+
+
+def main(paths):
+    if not paths:
+        paths = sorted(glob.glob(os.path.join(HERE, "fixtures", "product_page*.html")))
+
+    for path in paths:
+        with open(path, "r", encoding="utf-8") as f:
+            soup = BeautifulSoup(f.read(), "html.parser")
+
+        assert old_extract(soup) == new_extract(soup), f"results differ for {path}"
+
+        runs = 20
+        old = min(timeit.repeat(lambda: old_extract(soup), number=runs, repeat=3)) / runs
+        new = min(timeit.repeat(lambda: new_extract(soup), number=runs, repeat=3)) / runs
+        print(f"{os.path.basename(path)}: per-label scans {old * 1000:.2f} ms, "
+              f"index_page {new * 1000:.2f} ms ({old / new:.1f}x)")
+
+
+if __name__ == "__main__":
+    main(sys.argv[1:])
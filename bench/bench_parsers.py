@@ -0,0 +1,68 @@
+"""
+Compare HTML parser backends on the recorded fixtures.
+
+    python bench/bench_parsers.py
+
+Listing pages: full-tree parse + find_all("a") versus the scoped <a href>
+parse used by iter_anchor_links (BeautifulSoup with a SoupStrainer, or
+selectolax). Product pages: one full-tree parse versus the head/body split
+used by parse_product_page. Backends that aren't installed are skipped.
+"""
+import importlib.util
+import os
+import sys
+import timeit
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.dirname(HERE))
+
+from bs4 import BeautifulSoup, SoupStrainer  # noqa: E402
+
+import EUC_TrackerAndCompare as tracker  # noqa: E402
+
+SOUP_BACKENDS = [name for name, module in (("html.parser", None), ("lxml", "lxml"), ("html5lib", "html5lib"))
+                 if module is None or importlib.util.find_spec(module)]
+
+
+def load(name):
+    with open(os.path.join(HERE, "fixtures", name), "r", encoding="utf-8") as f:
+        return f.read()
+
+
+def best_ms(fn, runs=10):
+    return min(timeit.repeat(fn, number=runs, repeat=3)) / runs * 1000
+
+
+def bench_listing(markup):
+    print("Listing page (<a href> extraction):")
+    strainer = SoupStrainer("a", href=True)
+    for backend in SOUP_BACKENDS:
+        full = best_ms(lambda: [(a["href"], a.get_text())
+                                for a in BeautifulSoup(markup, backend).find_all("a", href=True)])
+        scoped = best_ms(lambda: [(a["href"], a.get_text())
+                                  for a in BeautifulSoup(markup, backend, parse_only=strainer).find_all("a", href=True)])
+        print(f"  {backend:12s} full tree {full:7.2f} ms   scoped {scoped:7.2f} ms")
+
+    if tracker.SelectolaxParser:
+        fast = best_ms(lambda: [(n.attributes.get("href"), n.text(deep=True))
+                                for n in tracker.SelectolaxParser(markup).css("a[href]")])
+        print(f"  {'selectolax':12s} scoped {fast:7.2f} ms")
+
+
+def bench_product(markup):
+    print("Product page:")
+    head_markup, body_markup = tracker.split_head(markup)
+    for backend in SOUP_BACKENDS:
+        full = best_ms(lambda: BeautifulSoup(markup, backend))
+        split = best_ms(lambda: (BeautifulSoup(head_markup, backend), BeautifulSoup(body_markup, backend)))
+        head_only = best_ms(lambda: BeautifulSoup(head_markup, backend))
+        print(f"  {backend:12s} full tree {full:7.2f} ms   head+body {split:7.2f} ms   head only {head_only:7.2f} ms")
+
+
+def main():
+    bench_listing(load("collection_page.html"))
+    bench_product(load("product_page.html"))
+
+
+if __name__ == "__main__":
+    main()
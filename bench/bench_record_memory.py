@@ -0,0 +1,79 @@
+"""
+Memory per 10k records: the old plain-dict records (display strings plus the
+nested "specs" dicts) versus EUCRecord.
+
+    python bench/bench_record_memory.py [count]
+"""
+import os
+import sys
+import tracemalloc
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.dirname(HERE))
+
+import EUC_TrackerAndCompare as tracker  # noqa: E402
+
+
+def sample_specs(i):
+    return {
+        **tracker.SPEC_DEFAULTS,
+        "battery_capacity": f"{1800 + i % 1800}Wh",
+        "range": f"{40 + i % 40}-{60 + i % 40} miles",
+        "speed": f"{30 + i % 20} mph / {48 + i % 32} km/h",
+        "motor_power": f"{2500 + i % 1500}W",
+        "weight": f"{70 + i % 40} lbs",
+        "max_load": f"{250 + i % 50} lbs",
+        "battery_type": "Samsung 50S",
+    }
+
+
+def build_dicts(count):
+    out = []
+    for i in range(count):
+        specs = sample_specs(i)
+        out.append({
+            "name": f"Wheel {i}",
+            **specs,
+            "image_url": f"https://cdn.example.com/wheel_{i}.jpg",
+            "url": f"https://example.com/products/wheel-{i}",
+            "description": f"Description of wheel {i}.",
+            "source": "".join(["ali", "en"]),  # a fresh, un-interned string per record
+            "specs": tracker.normalize_specs(specs),
+        })
+    return out
+
+
+def build_records(count):
+    return [
+        tracker.EUCRecord.from_specs(
+            f"Wheel {i}",
+            f"https://example.com/products/wheel-{i}",
+            "".join(["ali", "en"]),
+            sample_specs(i),
+            image_url=f"https://cdn.example.com/wheel_{i}.jpg",
+            description=f"Description of wheel {i}.",
+        )
+        for i in range(count)
+    ]
+
+
+def measure(builder, count):
+    tracemalloc.start()
+    data = builder(count)
+    current, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del data
+    return current
+
+
+def main():
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 10_000
+    old = measure(build_dicts, count)
+    new = measure(build_records, count)
+    scale = 10_000 / count
+    print(f"dict records: {old * scale / 1e6:6.2f} MB per 10k")
+    print(f"EUCRecord:    {new * scale / 1e6:6.2f} MB per 10k ({old / new:.1f}x smaller)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,100 @@
+"""
+Render the page for synthetic catalogs: the old `rows_html +=` plus one
+str.replace() per placeholder, versus the precompiled segments joined in
+memory (build_html_table) or streamed to a file (iter_html_table).
+
+    python bench/bench_render.py [rows ...]
+
+Defaults to 10k and 100k rows. Reports wall time and peak traced memory.
+"""
+import os
+import sys
+import tempfile
+import time
+import tracemalloc
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.dirname(HERE))
+
+import EUC_TrackerAndCompare as tracker  # noqa: E402
+
+
+def sample_records(count):
+    records = []
+    for i in range(count):
+        specs = {
+            **tracker.SPEC_DEFAULTS,
+            "battery_capacity": f"{1800 + i % 1800}Wh",
+            "range": f"{40 + i % 40}-{60 + i % 40} miles",
+            "speed": f"{30 + i % 20} mph",
+            "motor_power": f"{2500 + i % 1500}W",
+            "weight": f"{70 + i % 40} lbs",
+            "max_load": f"{250 + i % 50} lbs",
+            "battery_type": "Samsung 50S",
+        }
+        records.append(tracker.EUCRecord.from_specs(
+            f"Wheel {i}",
+            f"https://example.com/products/wheel-{i}",
+            ("ewheels", "alien", "nextgen")[i % 3],
+            specs,
+            image_url=f"https://cdn.example.com/wheel_{i}.jpg",
+            description=f"Description of wheel {i} & friends.",
+        ))
+    return records
+
+
+def old_build(eucs):
+    eucs_sorted = sorted(eucs, key=lambda x: x.name.lower())
+    rows_html = ""
+    for e in eucs_sorted:
+        rows_html += tracker.render_row(e)
+
+    # Same context values the real renderer computes; only ROWS_HTML matters here.
+    context = {"ROWS_HTML": rows_html}
+    for _, key in tracker.PAGE_SEGMENTS:
+        if key and key != "ROWS_HTML":
+            context[key] = "x"
+
+    html_page = tracker.PAGE_TEMPLATE
+    for key, val in context.items():
+        html_page = html_page.replace(f"__{key}__", val)
+    return html_page
+
+
+def write_string(builder, eucs, path):
+    with open(path, "w", encoding="utf-8") as f:
+        f.write(builder(eucs))
+
+
+def write_stream(eucs, path):
+    with open(path, "w", encoding="utf-8") as f:
+        f.writelines(tracker.iter_html_table(eucs))
+
+
+def measure(fn):
+    tracemalloc.start()
+    start = time.perf_counter()
+    fn()
+    elapsed = time.perf_counter() - start
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return elapsed, peak
+
+
+def main(counts):
+    out_path = os.path.join(tempfile.gettempdir(), "euc_bench_render.html")
+    for count in counts or (10_000, 100_000):
+        eucs = sample_records(count)
+        print(f"{count} rows:")
+        for label, fn in (
+            ("+= / replace", lambda: write_string(old_build, eucs, out_path)),
+            ("segments, join", lambda: write_string(tracker.build_html_table, eucs, out_path)),
+            ("segments, stream", lambda: write_stream(eucs, out_path)),
+        ):
+            elapsed, peak = measure(fn)
+            print(f"  {label:18s} {elapsed * 1000:8.1f} ms   peak {peak / 1e6:7.1f} MB")
+    os.remove(out_path)
+
+
+if __name__ == "__main__":
+    main([int(a) for a in sys.argv[1:]])
@@ -0,0 +1,158 @@
+"""
+Tail latency of uncached /api/youtube lookups against an upstream with a
+heavy tail (most responses in 0.1-0.3 s, a few in 2-4 s), with and without
+hedging and with fan-out over extra phrasings.
+
+    python bench/bench_youtube_hedge.py [--lookups 300] [--concurrency 8] [--slow 0.02]
+
+Both front ends are measured: YouTubeSearch from a pool of client threads,
+AsyncYouTubeSearch from as many concurrent tasks. Each lookup is a distinct
+wheel so nothing is served from cache; a warm-up round fills the latency
+window first. "extra" counts videos that the plain "<wheel> review" search
+wouldn't have returned.
+
+Hedging at p95 only helps while the slow share stays under 5%; much above
+that the percentile lands inside the slow tail itself.
+"""
+import argparse
+import asyncio
+import hashlib
+import os
+import random
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.dirname(HERE))
+
+import euc_ratelimit  # noqa: E402
+import euc_youtube  # noqa: E402
+
+WARMUP = 60
+
+
+def fake_items(query):
+    # Phrasings of the same wheel share about half their IDs, like real
+    # results do (a review often shows up under "range test" too).
+    wheel = query.rsplit(" ", 2)[0]
+    shared = [hashlib.sha1(f"{wheel}/{i}".encode()).hexdigest()[:11] for i in range(10)]
+    own = [hashlib.sha1(f"{query}/{i}".encode()).hexdigest()[:11] for i in range(10)]
+    return [{"videoId": v} for v in own[:5] + shared + own[5:]]
+
+
+class Upstream:
+    def __init__(self, slow, seed=1):
+        self.slow = slow
+        self.rng = random.Random(seed)
+        self.lock = threading.Lock()
+        self.calls = 0
+
+    def latency(self):
+        with self.lock:
+            self.calls += 1
+            if self.rng.random() < self.slow:
+                return self.rng.uniform(2.0, 4.0)
+            return self.rng.uniform(0.1, 0.3)
+
+    def fetch(self, query):
+        time.sleep(self.latency())
+        return fake_items(query)
+
+    async def fetch_async(self, query):
+        await asyncio.sleep(self.latency())
+        return fake_items(query)
+
+
+def no_limit():
+    return euc_ratelimit.TokenBucket(0, 1, 0, 0)
+
+
+def pct(values, p):
+    values = sorted(values)
+    return values[min(len(values) - 1, int(p / 100 * len(values)))]
+
+
+def configs():
+    return (
+        ("single request", euc_youtube.HedgePolicy(percentile=0), ()),
+        ("hedged at p95", euc_youtube.HedgePolicy(percentile=95), ()),
+        ("hedged + fan-out", euc_youtube.HedgePolicy(percentile=95), euc_youtube.FANOUT_PHRASINGS
+         or ("range test", "top speed")),
+    )
+
+
+def extra_videos(query, items):
+    primary = {item["videoId"] for item in fake_items(query)}
+    return sum(item["videoId"] not in primary for item in items)
+
+
+def report(label, times, counts, search, upstream, lookups):
+    hedging = search.hedging
+    print(f"  {label:18s} p50 {pct(times, 50):5.2f} s  p95 {pct(times, 95):5.2f} s  "
+          f"p99 {pct(times, 99):5.2f} s  max {max(times):5.2f} s   "
+          f"{sum(counts) / len(counts):4.1f} extra videos/lookup   "
+          f"{upstream.calls / (lookups + WARMUP):4.2f} upstream calls/lookup "
+          f"({hedging.hedges} hedges, {hedging.hedge_wins} won)")
+
+
+def run_sync(args):
+    print(f"YouTubeSearch ({args.concurrency} client threads):")
+    for label, hedging, fanout in configs():
+        upstream = Upstream(args.slow)
+        search = euc_youtube.YouTubeSearch(shared=None, fetch=upstream.fetch, hedging=hedging, fanout=fanout,
+                                           upstream_workers=args.concurrency * 6, limiter=no_limit())
+        times, counts = [], []
+
+        def lookup(i, measured=True):
+            start = time.perf_counter()
+            items = search.search(f"wheel{i} review")["items"]
+            if measured:
+                times.append(time.perf_counter() - start)
+                counts.append(extra_videos(f"wheel{i} review", items))
+
+        with ThreadPoolExecutor(args.concurrency) as pool:
+            list(pool.map(lambda i: lookup(i, False), range(-WARMUP, 0)))
+            list(pool.map(lookup, range(args.lookups)))
+        report(label, times, counts, search, upstream, args.lookups)
+
+
+async def run_async(args):
+    print(f"AsyncYouTubeSearch ({args.concurrency} concurrent lookups):")
+    for label, hedging, fanout in configs():
+        upstream = Upstream(args.slow)
+        search = euc_youtube.AsyncYouTubeSearch(shared=None, fetch=upstream.fetch_async, hedging=hedging,
+                                                fanout=fanout, limiter=no_limit())
+        times, counts = [], []
+        gate = asyncio.Semaphore(args.concurrency)
+
+        async def lookup(i, measured=True):
+            async with gate:
+                start = time.perf_counter()
+                items = (await search.search(f"wheel{i} review"))["items"]
+            if measured:
+                times.append(time.perf_counter() - start)
+                counts.append(extra_videos(f"wheel{i} review", items))
+
+        await asyncio.gather(*(lookup(i, False) for i in range(-WARMUP, 0)))
+        await asyncio.gather(*(lookup(i) for i in range(args.lookups)))
+        report(label, times, counts, search, upstream, args.lookups)
+        await search.aclose()
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--lookups", type=int, default=300)
+    parser.add_argument("--concurrency", type=int, default=8)
+    parser.add_argument("--slow", type=float, default=0.02, help="share of upstream responses that take 2-4 s")
+    args = parser.parse_args()
+
+    print(f"{args.lookups} lookups, {args.slow:.0%} of upstream responses slow\n")
+    run_sync(args)
+    print()
+    asyncio.run(run_async(args))
+
+
+if __name__ == "__main__":
+    main()
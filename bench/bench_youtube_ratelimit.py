@@ -0,0 +1,120 @@
+"""
+A burst of uncached /api/youtube lookups against an upstream that throttles:
+it answers up to --capacity requests per second in 0.2 s, and anything over
+that hangs until the client times out (--timeout, a scaled-down stand-in
+for FETCH_TIMEOUT). Compares YouTubeSearch without a rate limiter and with
+one set a little under the upstream's capacity.
+
+    python bench/bench_youtube_ratelimit.py [--lookups 100] [--arrival 50] [--capacity 5]
+
+Lookups arrive at --arrival per second, each on its own thread (like
+requests on a threaded server). Every lookup ends as "ok" (results),
+"busy" (turned away with 429/503 by the limiter) or "failed" (empty
+results after an upstream error).
+"""
+import argparse
+import os
+import sys
+import threading
+import time
+from collections import deque
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.dirname(HERE))
+
+import euc_ratelimit  # noqa: E402
+import euc_youtube  # noqa: E402
+
+
+class ThrottlingUpstream:
+    def __init__(self, capacity, timeout):
+        self.capacity = capacity
+        self.timeout = timeout
+        self.lock = threading.Lock()
+        self.recent = deque()
+        self.calls = 0
+        self.throttled = 0
+
+    def fetch(self, query):
+        now = time.monotonic()
+        with self.lock:
+            self.calls += 1
+            while self.recent and now - self.recent[0] > 1:
+                self.recent.popleft()
+            self.recent.append(now)
+            throttled = len(self.recent) > self.capacity
+            self.throttled += throttled
+        if throttled:
+            time.sleep(self.timeout)
+            raise TimeoutError("upstream throttled")
+        time.sleep(0.2)
+        return [euc_youtube.bare_record(f"{abs(hash(query)) % 10**11:011d}")]
+
+
+def pct(values, p):
+    values = sorted(values)
+    return values[min(len(values) - 1, int(p / 100 * len(values)))] if values else float("nan")
+
+
+def run(label, limiter, args):
+    upstream = ThrottlingUpstream(args.capacity, args.timeout)
+    search = euc_youtube.YouTubeSearch(shared=None, fetch=upstream.fetch, fanout=(), limiter=limiter,
+                                       hedging=euc_youtube.HedgePolicy(percentile=0))
+    outcomes = {"ok": [], "busy": [], "failed": []}
+    lock = threading.Lock()
+
+    def lookup(i):
+        start = time.perf_counter()
+        try:
+            outcome = "ok" if search.search(f"burst wheel {i} review")["items"] else "failed"
+        except euc_ratelimit.Overloaded:
+            outcome = "busy"
+        with lock:
+            outcomes[outcome].append(time.perf_counter() - start)
+
+    threads = []
+    start = time.perf_counter()
+    for i in range(args.lookups):
+        t = threading.Thread(target=lookup, args=(i,))
+        t.start()
+        threads.append(t)
+        time.sleep(1 / args.arrival)
+    for t in threads:
+        t.join()
+    wall = time.perf_counter() - start
+
+    everything = [s for times in outcomes.values() for s in times]
+    print(f"{label}:")
+    print(f"  {len(outcomes['ok'])} ok, {len(outcomes['busy'])} busy (429/503), {len(outcomes['failed'])} failed"
+          f"   upstream calls {upstream.calls}, {upstream.throttled} throttled   wall {wall:5.2f} s")
+    print(f"  all responses  p50 {pct(everything, 50):5.2f} s  p95 {pct(everything, 95):5.2f} s  "
+          f"max {max(everything):5.2f} s")
+    for outcome, times in outcomes.items():
+        if times:
+            print(f"  {outcome:7s}        p50 {pct(times, 50):5.2f} s  max {max(times):5.2f} s")
+    if limiter.enabled:
+        stats = limiter.stats()
+        print(f"  limiter: peak queue {stats['peak_queue_depth']}, avg wait {stats['avg_wait']} s, "
+              f"{stats['rejected_queue_full']} queue full, {stats['rejected_wait_too_long']} wait too long")
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--lookups", type=int, default=100)
+    parser.add_argument("--arrival", type=float, default=50, help="lookups arriving per second")
+    parser.add_argument("--capacity", type=int, default=5, help="upstream requests per second before throttling")
+    parser.add_argument("--timeout", type=float, default=5, help="how long a throttled request hangs")
+    args = parser.parse_args()
+
+    print(f"{args.lookups} lookups at {args.arrival:g}/s, upstream takes {args.capacity}/s "
+          f"(throttled requests hang {args.timeout:g} s)\n")
+    run("no limiter", euc_ratelimit.TokenBucket(0, 1, 0, 0), args)
+    print()
+    # A burst on top of the full rate would overrun a 1 s window right away.
+    rate = args.capacity * 0.8
+    run(f"token bucket {rate:g}/s, burst 1, queue 10, wait <= 2 s",
+        euc_ratelimit.TokenBucket(rate, 1, 10, 2), args)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,190 @@
+"""
+Compare the old YouTube lookup (download the whole results page, then
+re.findall over r.text) and the obvious way to get titles and channels too
+(download everything, json.loads all of ytInitialData, walk it) with
+fetch_videos(), which cuts the video renderers out of ytInitialData as the
+body streams in and hangs up after the first 20 records.
+
+    python bench/bench_youtube_scan.py [saved_results_page.html ...]
+
+Each page is served from a local, bandwidth-throttled HTTP server so
+transfer time shows up the way it does against YouTube. Without arguments a
+synthetic page shaped like a real results page is used: ~300 KB of inline
+scripts before ytInitialData, then video renderers that repeat their IDs.
+"""
+import json
+import os
+import random
+import re
+import string
+import sys
+import threading
+import time
+import tracemalloc
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.dirname(HERE))
+
+import euc_http  # noqa: E402
+import euc_youtube  # noqa: E402
+
+CHUNK = 16 * 1024
+BYTES_PER_SECOND = 8 * 1024 * 1024
+
+
+def synthetic_page(videos=60, seed=1):
+    rng = random.Random(seed)
+    alphabet = string.ascii_letters + string.digits + "-_"
+    filler = "".join(rng.choice(alphabet) for _ in range(300 * 1024))
+    renderers = []
+    for _ in range(videos):
+        vid = "".join(rng.choice(alphabet) for _ in range(11))
+        thumbs = ",".join(f'{{"url":"https://i.ytimg.com/vi/{vid}/hq{i}.jpg"}}' for i in range(4))
+        renderers.append(
+            f'{{"videoRenderer":{{"videoId":"{vid}","thumbnail":{{"thumbnails":[{thumbs}]}},'
+            f'"title":{{"runs":[{{"text":"Review {vid} \\"top speed\\" {{100km/h}}"}}]}},'
+            f'"ownerText":{{"runs":[{{"text":"Channel {vid[:4]}"}}]}},'
+            f'"lengthText":{{"simpleText":"{rng.randint(1, 59)}:{rng.randint(0, 59):02d}"}},'
+            f'"publishedTimeText":{{"simpleText":"{rng.randint(1, 11)} months ago"}},'
+            f'"description":"{filler[:6000]}",'
+            f'"navigationEndpoint":{{"watchEndpoint":{{"videoId":"{vid}"}}}},'
+            f'"menu":{{"videoId":"{vid}"}}}}}}'
+        )
+    return (f"<html><head><script>var ytcfg={{\"blob\":\"{filler}\"}};</script></head><body>"
+            "<script>var ytInitialData = {\"contents\":[" + ",".join(renderers) +
+            "]};</script></body></html>").encode("utf-8")
+
+
+def serve(body):
+    class Handler(BaseHTTPRequestHandler):
+        def do_GET(self):
+            self.send_response(200)
+            self.send_header("Content-Type", "text/html; charset=utf-8")
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            delay = CHUNK / BYTES_PER_SECOND
+            try:
+                for i in range(0, len(body), CHUNK):
+                    self.wfile.write(body[i:i + CHUNK])
+                    time.sleep(delay)
+            except (BrokenPipeError, ConnectionResetError):
+                pass  # client hung up early
+
+        def log_message(self, *args):
+            pass
+
+    server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
+
+
+def old_fetch(query, limit=euc_youtube.MAX_RESULTS):
+    r = euc_http.get(euc_youtube.SEARCH_URL + query, timeout=euc_youtube.FETCH_TIMEOUT)
+    r.raise_for_status()
+    items = []
+    seen = set()
+    for vid in re.findall(r'videoId":"([a-zA-Z0-9_-]{11})"', r.text):
+        if vid in seen:
+            continue
+        seen.add(vid)
+        items.append({"videoId": vid})
+        if len(items) >= limit:
+            break
+    return items
+
+
+def full_parse_fetch(query, limit=euc_youtube.MAX_RESULTS):
+    r = euc_http.get(euc_youtube.SEARCH_URL + query, timeout=euc_youtube.FETCH_TIMEOUT)
+    r.raise_for_status()
+    text = r.text
+    start = text.index("{", text.index("ytInitialData"))
+    data = json.JSONDecoder().raw_decode(text, start)[0]
+
+    items, seen = [], set()
+
+    def walk(node):
+        if isinstance(node, dict):
+            if "videoRenderer" in node and len(items) < limit:
+                record = euc_youtube.video_record(node["videoRenderer"])
+                if record["videoId"] not in seen:
+                    seen.add(record["videoId"])
+                    items.append(record)
+            for value in node.values():
+                walk(value)
+        elif isinstance(node, list):
+            for value in node:
+                walk(value)
+
+    walk(data)
+    return items
+
+
+def measure(fn, runs=5):
+    times = []
+    peak = 0
+    result = None
+    for _ in range(runs):
+        tracemalloc.start()
+        start = time.perf_counter()
+        result = fn()
+        times.append(time.perf_counter() - start)
+        peak = max(peak, tracemalloc.get_traced_memory()[1])
+        tracemalloc.stop()
+    return result, min(times), peak
+
+
+def check_chunking(body):
+    expected = old_items(body)
+    for size in (1, 7, 21, 22, 23, 1000, CHUNK):
+        for scanner_class in (euc_youtube.VideoIdScanner, euc_youtube.ResultsScanner):
+            scanner = scanner_class()
+            for i in range(0, len(body), size):
+                if scanner.feed(body[i:i + size]):
+                    break
+            ids = [item["videoId"] for item in scanner.items]
+            assert ids == [item["videoId"] for item in expected], \
+                f"{scanner_class.__name__}: chunk size {size} gave different IDs"
+
+
+def old_items(body):
+    seen, items = set(), []
+    for vid in re.findall(r'videoId":"([a-zA-Z0-9_-]{11})"', body.decode("utf-8")):
+        if vid not in seen:
+            seen.add(vid)
+            items.append({"videoId": vid})
+    return items[:euc_youtube.MAX_RESULTS]
+
+
+def main(paths):
+    pages = [(os.path.basename(p), open(p, "rb").read()) for p in paths] or [("synthetic", synthetic_page())]
+    for label, body in pages:
+        check_chunking(body)
+        server = serve(body)
+        euc_youtube.SEARCH_URL = f"http://127.0.0.1:{server.server_address[1]}/results?search_query="
+
+        old, old_time, old_peak = measure(lambda: old_fetch("wheel"))
+        full, full_time, full_peak = measure(lambda: full_parse_fetch("wheel"))
+        new, new_time, new_peak = measure(lambda: euc_youtube.fetch_videos("wheel"))
+        assert [item["videoId"] for item in new] == [item["videoId"] for item in old], "IDs differ"
+        if full:
+            assert new == full, "records differ"
+
+        scanner = euc_youtube.ResultsScanner()
+        for i in range(0, len(body), CHUNK):
+            if scanner.feed(body[i:i + CHUNK]):
+                break
+
+        print(f"{label}: {len(body) / 1024:.0f} KB page, {len(new)} records")
+        print(f"  full download + findall (IDs)   {old_time * 1000:7.1f} ms   peak {old_peak / 1e6:6.2f} MB   "
+              f"read {len(body) / 1024:6.0f} KB")
+        print(f"  full download + json.loads      {full_time * 1000:7.1f} ms   peak {full_peak / 1e6:6.2f} MB   "
+              f"read {len(body) / 1024:6.0f} KB")
+        print(f"  streaming renderer scan         {new_time * 1000:7.1f} ms   peak {new_peak / 1e6:6.2f} MB   "
+              f"read {scanner.bytes_scanned / 1024:6.0f} KB")
+        print(f"  first record: {json.dumps(new[0])}")
+        server.shutdown()
+
+
+if __name__ == "__main__":
+    main(sys.argv[1:])
@@ -0,0 +1,173 @@
+"""
+Load test /api/youtube against a fake slow YouTube: the Flask app under
+gunicorn sync workers (as in the Procfile) versus asgi_app under gunicorn
+with uvicorn workers, same worker count.
+
+    python bench/load_youtube.py [--requests 200] [--delay 0.5] [--workers 2]
+
+Every lookup uses a distinct query so nothing is served from cache, and the
+shared cache is off. While the lookups are in flight, index.html is
+requested every 100 ms to show whether static files get starved.
+"""
+import argparse
+import asyncio
+import os
+import socket
+import subprocess
+import sys
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import httpx
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+ROOT = os.path.dirname(HERE)
+
+FAKE_PAGE = ("<html><script>var ytInitialData = {\"contents\":[" + ",".join(
+    f'{{"videoRenderer":{{"videoId":"vid{i:08d}","title":{{"simpleText":"Review {i}"}}}}}}' for i in range(30))
+    + "]};</script></html>").encode("utf-8")
+
+
+class FakeYouTube(ThreadingHTTPServer):
+    daemon_threads = True
+    request_queue_size = 2048
+
+
+def start_fake_upstream(delay):
+    class Handler(BaseHTTPRequestHandler):
+        protocol_version = "HTTP/1.1"
+
+        def do_GET(self):
+            time.sleep(delay)
+            self.send_response(200)
+            self.send_header("Content-Type", "text/html; charset=utf-8")
+            self.send_header("Content-Length", str(len(FAKE_PAGE)))
+            self.end_headers()
+            self.wfile.write(FAKE_PAGE)
+
+        def log_message(self, *args):
+            pass
+
+    server = FakeYouTube(("127.0.0.1", 0), Handler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
+
+
+def free_port():
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+
+def start_app(target, worker_class, workers, port, upstream):
+    env = dict(
+        os.environ,
+        EUC_YOUTUBE_SEARCH_URL=f"http://127.0.0.1:{upstream}/results?search_query=",
+        EUC_YOUTUBE_SHARED_CACHE="0",
+        EUC_YOUTUBE_RATE="0",
+        EUC_HTTP_RETRIES="0",
+        EUC_HTTP_POOL_MAXSIZE="64",
+    )
+    cmd = [sys.executable, "-m", "gunicorn", target, "--bind", f"127.0.0.1:{port}",
+           "--workers", str(workers), "--worker-class", worker_class,
+           "--backlog", "2048", "--timeout", "120", "--log-level", "warning"]
+    proc = subprocess.Popen(cmd, cwd=ROOT, env=env)
+    deadline = time.time() + 30
+    while time.time() < deadline:
+        try:
+            httpx.get(f"http://127.0.0.1:{port}/api/youtube/stats", timeout=1)
+            return proc
+        except httpx.HTTPError:
+            time.sleep(0.2)
+    proc.terminate()
+    raise RuntimeError(f"{target} didn't start")
+
+
+def pct(values, p):
+    if not values:
+        return float("nan")
+    values = sorted(values)
+    return values[min(len(values) - 1, int(p / 100 * len(values)))]
+
+
+async def run_load(base, requests, run_id):
+    # No keep-alive: a reused connection the server just timed out shows up
+    # as a spurious "server disconnected" error.
+    limits = httpx.Limits(max_connections=requests + 16, max_keepalive_connections=0)
+    async with httpx.AsyncClient(base_url=base, timeout=300, limits=limits) as client:
+        api_times, static_times = [], []
+        errors = 0
+        done = asyncio.Event()
+
+        async def lookup(i):
+            nonlocal errors
+            start = time.perf_counter()
+            try:
+                r = await client.get("/api/youtube", params={"q": f"wheel {run_id}-{i} review"})
+                if r.status_code != 200 or not r.json()["items"]:
+                    errors += 1
+            except httpx.HTTPError:
+                errors += 1
+            api_times.append(time.perf_counter() - start)
+
+        async def static_probe():
+            while not done.is_set():
+                start = time.perf_counter()
+                try:
+                    await client.get("/index.html")
+                except httpx.HTTPError:
+                    pass
+                static_times.append(time.perf_counter() - start)
+                await asyncio.sleep(0.1)
+
+        # Warm-up: first-request imports and connection setup in each worker.
+        await asyncio.gather(*(client.get("/api/youtube", params={"q": f"warmup {run_id}-{i}"})
+                               for i in range(4)))
+
+        probe = asyncio.create_task(static_probe())
+        start = time.perf_counter()
+        await asyncio.gather(*(lookup(i) for i in range(requests)))
+        wall = time.perf_counter() - start
+        done.set()
+        await probe
+        return wall, api_times, static_times, errors
+
+
+def report(label, wall, api_times, static_times, errors, requests):
+    print(f"{label}:")
+    print(f"  {requests} lookups in {wall:6.2f} s ({requests / wall:6.1f} req/s), {errors} errors")
+    print(f"  /api/youtube  p50 {pct(api_times, 50):6.2f} s   p95 {pct(api_times, 95):6.2f} s")
+    print(f"  /index.html   p50 {pct(static_times, 50) * 1000:7.1f} ms  p95 {pct(static_times, 95) * 1000:7.1f} ms"
+          f"  max {max(static_times) * 1000:7.1f} ms")
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--requests", type=int, default=200)
+    parser.add_argument("--delay", type=float, default=0.5, help="fake upstream latency in seconds")
+    parser.add_argument("--workers", type=int, default=2)
+    args = parser.parse_args()
+
+    upstream = start_fake_upstream(args.delay)
+    print(f"fake upstream latency {args.delay:g} s, {args.requests} concurrent lookups, "
+          f"{args.workers} workers per app\n")
+
+    for label, target, worker_class in (
+        ("Flask (gunicorn sync)", "app:app", "sync"),
+        ("ASGI (gunicorn + uvicorn)", "asgi_app:app", "uvicorn.workers.UvicornWorker"),
+    ):
+        port = free_port()
+        proc = start_app(target, worker_class, args.workers, port, upstream.server_address[1])
+        try:
+            result = asyncio.run(run_load(f"http://127.0.0.1:{port}", args.requests, port))
+            report(label, *result, args.requests)
+        finally:
+            proc.terminate()
+            proc.wait()
+
+    upstream.shutdown()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,78 @@
+"""
+Content-hashed static assets for the generated pages.
+
+The page's CSS and JS are written once per content version as
+`assets/<stem>.<hash>.<ext>`. Because the name changes whenever the content
+does, both servers can hand these files out with a year-long immutable
+Cache-Control, and repeat visits only download the small data-bearing HTML.
+The hash in the file name doubles as the ETag.
+    EUC_ASSETS_DIR   where hashed assets are written and served from
+"""
+import hashlib
+import mimetypes
+import os
+import re
+
+ASSETS_DIR = os.environ.get("EUC_ASSETS_DIR", "assets")
+ASSETS_URL_PATH = "/assets/"
+IMMUTABLE_CACHE_CONTROL = "public, max-age=31536000, immutable"
+
+HASH_LENGTH = 12
+HASHED_NAME_RE = re.compile(r"^(?P<stem>[A-Za-z0-9_-]+)\.(?P<hash>[0-9a-f]{%d})\.(?P<ext>css|js)$" % HASH_LENGTH)
+
+
+def asset_name(stem: str, ext: str, content: str) -> str:
+    digest = hashlib.sha256(content.encode("utf-8")).hexdigest()[:HASH_LENGTH]
+    return f"{stem}.{digest}.{ext}"
+
+
+def write_asset(stem: str, ext: str, content: str, directory: str = ASSETS_DIR) -> str:
+    """
+    Write `content` under its hashed name (skipped if that version already
+    exists) and remove older versions of the same stem. Returns the file name.
+    """
+    name = asset_name(stem, ext, content)
+    os.makedirs(directory, exist_ok=True)
+    path = os.path.join(directory, name)
+
+    if not os.path.exists(path):
+        tmp_path = f"{path}.{os.getpid()}.tmp"
+        with open(tmp_path, "w", encoding="utf-8", newline="") as f:
+            f.write(content)
+        os.replace(tmp_path, path)
+
+    for other in os.listdir(directory):
+        m = HASHED_NAME_RE.match(other)
+        if other != name and m and m.group("stem") == stem and m.group("ext") == ext:
+            try:
+                os.remove(os.path.join(directory, other))
+            except OSError:
+                pass
+    return name
+
+
+def resolve_asset(name: str, directory: str = ASSETS_DIR):
+    """
+    Map a requested asset file name to (path, etag, content_type), or None if
+    it isn't a hashed asset that exists. Only bare hashed names are accepted,
+    so nothing outside `directory` can be reached.
+    """
+    m = HASHED_NAME_RE.match(name)
+    if not m:
+        return None
+    path = os.path.join(directory, name)
+    if not os.path.isfile(path):
+        return None
+    content_type = mimetypes.guess_type(name)[0] or "application/octet-stream"
+    if content_type.startswith("text/") or content_type.endswith("javascript"):
+        content_type += "; charset=utf-8"
+    return path, f'"{m.group("hash")}"', content_type
+
+
+def etag_matches(if_none_match: str, etag: str) -> bool:
+    if not if_none_match:
+        return False
+    if if_none_match.strip() == "*":
+        return True
+    tags = [t.strip() for t in if_none_match.split(",")]
+    return etag in tags or f"W/{etag}" in tags
@@ -0,0 +1,269 @@
+"""
+SQLite-backed catalog of scraped wheels.
+
+main() writes every run's records here (WAL mode, so the web servers can keep
+reading while a scrape replaces the catalog), and both servers answer
+/api/wheels from it with filtering, multi-key sorting and keyset pagination
+instead of shipping every row in the HTML.
+
+    /api/wheels?source=alien,nextgen&q=begode&min_battery_wh=2000
+               &sort=battery_wh:desc,name&limit=50&cursor=<next_cursor>
+"""
+import base64
+import json
+import os
+import sqlite3
+import threading
+import time
+
+CATALOG_DB = os.environ.get("EUC_CATALOG_DB", "euc_catalog.sqlite")
+
+TEXT_COLUMNS = (
+    "name", "url", "source",
+    "battery_capacity", "range", "speed", "motor_power", "weight", "max_load",
+    "battery_type", "charger", "tire_size", "suspension", "price",
+    "image_url", "description",
+)
+NUMERIC_COLUMNS = ("battery_wh", "range_mi", "speed_mph", "motor_w", "weight_lbs", "max_load_lbs")
+RECORD_COLUMNS = TEXT_COLUMNS + NUMERIC_COLUMNS
+
+# sort key -> column; numeric keys also accept min_<key>/max_<key> filters
+SORT_KEYS = {"name": "name_norm", "source": "source", **{c: c for c in NUMERIC_COLUMNS}}
+
+DEFAULT_LIMIT = 50
+MAX_LIMIT = 200
+
+SCHEMA = f"""
+CREATE TABLE IF NOT EXISTS wheels (
+    id INTEGER PRIMARY KEY,
+    name_norm TEXT NOT NULL,
+    scraped_at REAL NOT NULL,
+    {", ".join(f'"{c}" TEXT' for c in TEXT_COLUMNS)},
+    {", ".join(f"{c} REAL" for c in NUMERIC_COLUMNS)},
+    UNIQUE (url)
+);
+CREATE INDEX IF NOT EXISTS wheels_source ON wheels (source);
+CREATE INDEX IF NOT EXISTS wheels_name_norm ON wheels (name_norm);
+{"".join(f"CREATE INDEX IF NOT EXISTS wheels_{c} ON wheels ({c});" for c in NUMERIC_COLUMNS)}
+"""
+
+
+def normalize_name(name: str) -> str:
+    return " ".join((name or "").casefold().split())
+
+
+class CatalogStore:
+    """
+    Thin wrapper around the catalog database. Connections are per thread, so
+    one store can be shared by a threaded server.
+    """
+
+    def __init__(self, path: str = CATALOG_DB):
+        self.path = path
+        self._local = threading.local()
+        self._conn().executescript(SCHEMA)
+
+    def _conn(self) -> sqlite3.Connection:
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(self.path, timeout=30)
+            conn.row_factory = sqlite3.Row
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            self._local.conn = conn
+        return conn
+
+    def replace_all(self, records):
+        """
+        Replace the catalog with `records` (anything with a to_dict()) in one
+        transaction, so readers see either the old or the new catalog.
+        """
+        now = time.time()
+        columns = ("name_norm", "scraped_at") + RECORD_COLUMNS
+        placeholders = ", ".join("?" for _ in columns)
+        quoted = ", ".join(f'"{c}"' for c in columns)
+        sql = f"INSERT OR REPLACE INTO wheels ({quoted}) VALUES ({placeholders})"
+
+        rows = []
+        for record in records:
+            data = record.to_dict()
+            rows.append((normalize_name(data["name"]), now) + tuple(data.get(c) for c in RECORD_COLUMNS))
+
+        conn = self._conn()
+        with conn:
+            conn.execute("DELETE FROM wheels")
+            conn.executemany(sql, rows)
+        return len(rows)
+
+    def query(self, sources=None, q: str = "", ranges=None, sort=None,
+              limit: int = DEFAULT_LIMIT, cursor: str = None):
+        """
+        Return (items, next_cursor).
+
+        `sources` limits to those distributors, `q` matches a substring of the
+        normalized name, `ranges` maps numeric keys to (min, max) bounds
+        (either may be None), and `sort` is a list of (key, descending)
+        pairs. Rows missing a numeric sort value come last. `cursor` is the
+        next_cursor of the previous page.
+        """
+        sort = list(sort or [("name", False)])
+        limit = max(1, min(int(limit), MAX_LIMIT))
+
+        where = []
+        params = []
+        if sources:
+            where.append(f"source IN ({', '.join('?' for _ in sources)})")
+            params += list(sources)
+        if q:
+            where.append("name_norm LIKE ? ESCAPE '\\'")
+            escaped = normalize_name(q).replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+            params.append(f"%{escaped}%")
+        for key, (low, high) in (ranges or {}).items():
+            if low is not None:
+                where.append(f"{key} >= ?")
+                params.append(low)
+            if high is not None:
+                where.append(f"{key} <= ?")
+                params.append(high)
+
+        order_cols = [(SORT_KEYS[key], desc) for key, desc in sort] + [("id", False)]
+
+        if cursor:
+            after_sql, after_params = _after_cursor(order_cols, _decode_cursor(cursor, len(order_cols)))
+            where.append(after_sql)
+            params += after_params
+
+        order_sql = ", ".join(
+            f"{col} IS NULL, {col} {'DESC' if desc else 'ASC'}" for col, desc in order_cols
+        )
+        select_cols = ", ".join(f'"{c}"' for c in RECORD_COLUMNS)
+        sql = f"SELECT id, name_norm, {select_cols} FROM wheels"
+        if where:
+            sql += " WHERE " + " AND ".join(where)
+        sql += f" ORDER BY {order_sql} LIMIT ?"
+        params.append(limit + 1)
+
+        rows = self._conn().execute(sql, params).fetchall()
+        more = len(rows) > limit
+        rows = rows[:limit]
+
+        items = [{c: row[c] for c in RECORD_COLUMNS} for row in rows]
+        next_cursor = None
+        if more and rows:
+            next_cursor = _encode_cursor([rows[-1][col] for col, _ in order_cols])
+        return items, next_cursor
+
+    def query_params(self, params) -> dict:
+        """
+        Run query() from /api/wheels query-string parameters (a mapping of
+        single string values). Raises ValueError for bad parameters.
+        """
+        sources = [s.strip() for s in (params.get("source") or "").split(",") if s.strip()]
+
+        ranges = {}
+        for key in NUMERIC_COLUMNS:
+            low = _float_param(params, f"min_{key}")
+            high = _float_param(params, f"max_{key}")
+            if low is not None or high is not None:
+                ranges[key] = (low, high)
+
+        sort = []
+        for part in (params.get("sort") or "name").split(","):
+            key, _, direction = part.strip().partition(":")
+            if key not in SORT_KEYS:
+                raise ValueError(f"unknown sort key {key!r}")
+            if direction not in ("", "asc", "desc"):
+                raise ValueError(f"bad sort direction {direction!r}")
+            sort.append((key, direction == "desc"))
+
+        try:
+            limit = int(params.get("limit") or DEFAULT_LIMIT)
+        except ValueError:
+            raise ValueError("limit must be an integer")
+
+        items, next_cursor = self.query(
+            sources=sources,
+            q=params.get("q") or "",
+            ranges=ranges,
+            sort=sort,
+            limit=limit,
+            cursor=params.get("cursor") or None,
+        )
+        return {"items": items, "count": len(items), "next_cursor": next_cursor}
+
+
+def _float_param(params, name):
+    value = params.get(name)
+    if value in (None, ""):
+        return None
+    try:
+        return float(value)
+    except ValueError:
+        raise ValueError(f"{name} must be a number")
+
+
+def _after_cursor(order_cols, values):
+    """
+    Keyset predicate for "rows after `values`" under ORDER BY
+    (col IS NULL, col [DESC]) for each column: expanded lexicographically,
+    with NULLs sorting last.
+    """
+    clauses = []
+    params = []
+    for i, (col, desc) in enumerate(order_cols):
+        value = values[i]
+        if value is None:
+            # Nothing sorts after NULL on this column except via later columns.
+            after = None
+        else:
+            after = f"({col} {'<' if desc else '>'} ? OR {col} IS NULL)"
+
+        if after is not None:
+            equal_prefix = [f"{c} IS ?" for c, _ in order_cols[:i]]
+            clauses.append("(" + " AND ".join(equal_prefix + [after]) + ")")
+            params += values[:i] + [value]
+
+    if not clauses:
+        return "0", []
+    return "(" + " OR ".join(clauses) + ")", params
+
+
+def _encode_cursor(values) -> str:
+    raw = json.dumps(values, separators=(",", ":")).encode("utf-8")
+    return base64.urlsafe_b64encode(raw).decode("ascii").rstrip("=")
+
+
+def _decode_cursor(cursor: str, expected: int):
+    try:
+        raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4))
+        values = json.loads(raw)
+    except ValueError:
+        raise ValueError("bad cursor")
+    if not isinstance(values, list) or len(values) != expected:
+        raise ValueError("cursor doesn't match this sort")
+    if not all(v is None or isinstance(v, (str, int, float)) for v in values):
+        raise ValueError("bad cursor")
+    return values
+
+
+_store = None
+_store_lock = threading.Lock()
+
+
+def get_store() -> CatalogStore:
+    """
+    Shared store for the web servers, opened on first use.
+    """
+    global _store
+    if _store is None:
+        with _store_lock:
+            if _store is None:
+                _store = CatalogStore(CATALOG_DB)
+    return _store
+
+
+def configure_store(path: str = None) -> CatalogStore:
+    global _store
+    with _store_lock:
+        _store = CatalogStore(path or CATALOG_DB)
+    return _store
@@ -0,0 +1,179 @@
+"""
+Precompressed static files and on-the-fly compression for JSON responses.
+
+The build writes `.gz` (and `.br`, when the brotli package is installed)
+siblings next to every HTML/JS/CSS/JSON artifact, so the servers only have
+to pick a file per request instead of compressing it:
+
+    index.html  index.html.gz  index.html.br
+
+The scraper's main() does this after writing the page; for files deployed
+some other way, run it as a build step before starting the servers (the
+Procfile does, since the siblings aren't committed):
+
+    python euc_compress.py [directory ...]     (default: . and the assets dir)
+
+The servers never write siblings themselves, so several workers starting at
+once don't race on the same files.
+A sibling is only served while it is at least as new as the file it was made
+from, so an edited page never falls back to a stale compressed copy. API
+responses are dynamic and get compressed per request once they are big enough
+for it to pay off.
+    EUC_COMPRESS_MIN_BYTES   smallest JSON body worth compressing on the fly
+"""
+import gzip
+import os
+import sys
+
+import euc_assets
+
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+COMPRESSIBLE_EXTENSIONS = (".html", ".js", ".css", ".json")
+JSON_COMPRESS_MIN_BYTES = int(os.environ.get("EUC_COMPRESS_MIN_BYTES", "1024"))
+
+# Preferred first; ".br" is only written and offered when brotli is installed.
+ENCODINGS = (("br", ".br"), ("gzip", ".gz"))
+ENCODING_SUFFIXES = dict(ENCODINGS)
+
+
+def _available_encodings():
+    return [(name, suffix) for name, suffix in ENCODINGS if name != "br" or brotli is not None]
+
+
+def compress(data: bytes, encoding: str, level: int = None) -> bytes:
+    if encoding == "br":
+        return brotli.compress(data, quality=11 if level is None else level)
+    # mtime=0 keeps the output stable across rebuilds of the same content.
+    return gzip.compress(data, compresslevel=9 if level is None else level, mtime=0)
+
+
+def is_compressible(path: str) -> bool:
+    return path.lower().endswith(COMPRESSIBLE_EXTENSIONS)
+
+
+def _is_fresh(sibling: str, source_mtime: float) -> bool:
+    try:
+        return os.path.getmtime(sibling) >= source_mtime
+    except OSError:
+        return False
+
+
+def write_precompressed(path: str) -> int:
+    """
+    Write missing or stale compressed siblings of `path`. Returns how many
+    were (re)written.
+    """
+    source_mtime = os.path.getmtime(path)
+    data = None
+    written = 0
+    for encoding, suffix in _available_encodings():
+        sibling = path + suffix
+        if _is_fresh(sibling, source_mtime):
+            continue
+        if data is None:
+            with open(path, "rb") as f:
+                data = f.read()
+        tmp_path = f"{sibling}.{os.getpid()}.tmp"
+        with open(tmp_path, "wb") as f:
+            f.write(compress(data, encoding))
+        os.replace(tmp_path, sibling)
+        written += 1
+    return written
+
+
+def precompress_directory(directory: str = ".") -> int:
+    """
+    Precompress every compressible file directly inside `directory`.
+    """
+    written = 0
+    try:
+        names = os.listdir(directory)
+    except OSError:
+        return 0
+    for name in names:
+        path = os.path.join(directory, name)
+        if is_compressible(name) and os.path.isfile(path):
+            try:
+                written += write_precompressed(path)
+            except OSError as e:
+                print(f"  !! Could not precompress {path}: {e}")
+    return written
+
+
+def parse_accept_encoding(header: str) -> dict:
+    """
+    Map each coding in an Accept-Encoding header to its q-value.
+    """
+    accepted = {}
+    for part in (header or "").split(","):
+        coding, _, params = part.strip().partition(";")
+        coding = coding.strip().lower()
+        if not coding:
+            continue
+        q = 1.0
+        for param in params.split(";"):
+            key, _, value = param.strip().partition("=")
+            if key == "q":
+                try:
+                    q = float(value)
+                except ValueError:
+                    q = 0.0
+        accepted[coding] = q
+    return accepted
+
+
+def _accepts(accepted: dict, coding: str) -> bool:
+    q = accepted.get(coding, accepted.get("*", 0.0))
+    return q > 0
+
+
+def negotiate_file(path: str, accept_encoding: str):
+    """
+    Pick what to send for a request of `path`: (file to send, content
+    encoding or None). Falls back to `path` itself when the client doesn't
+    accept any encoding we have a fresh sibling for.
+    """
+    accepted = parse_accept_encoding(accept_encoding)
+    if accepted and is_compressible(path):
+        try:
+            source_mtime = os.path.getmtime(path)
+        except OSError:
+            return path, None
+        for encoding, suffix in _available_encodings():
+            if _accepts(accepted, encoding) and _is_fresh(path + suffix, source_mtime):
+                return path + suffix, encoding
+    return path, None
+
+
+def variant_etag(etag: str, encoding: str) -> str:
+    """
+    Strong ETag for an encoded variant: each encoding is a different byte
+    sequence, so it needs its own validator.
+    """
+    if not encoding:
+        return etag
+    return f'{etag[:-1]}-{encoding}"' if etag.endswith('"') else f"{etag}-{encoding}"
+
+
+def compress_response(body: bytes, accept_encoding: str, min_size: int = JSON_COMPRESS_MIN_BYTES):
+    """
+    Compress a dynamic response body for the client: (body, content encoding
+    or None). Small bodies are sent as-is.
+    """
+    if len(body) < min_size:
+        return body, None
+    accepted = parse_accept_encoding(accept_encoding)
+    for encoding, _ in _available_encodings():
+        if _accepts(accepted, encoding):
+            # Cheap levels: this runs per request.
+            return compress(body, encoding, level=5 if encoding == "br" else 6), encoding
+    return body, None
+
+
+if __name__ == "__main__":
+    total = sum(precompress_directory(d) for d in (sys.argv[1:] or [".", euc_assets.ASSETS_DIR]))
+    print(f"Wrote {total} compressed files.")
@@ -0,0 +1,368 @@
+"""
+Shared HTTP client for the distributor scrapers and the YouTube proxy.
+
+Everything goes through one process-wide requests.Session so repeated hits to
+the same host reuse warm keep-alive connections instead of paying a fresh
+TCP+TLS handshake every time. The session also retries transient failures
+with jittered exponential backoff and asks for compressed responses
+(gzip/deflate, plus brotli/zstd when the decoders are installed).
+
+Calls a user is waiting on (the YouTube proxy) use get_interactive()
+instead: a second session that only retries failed connects. It never
+re-sends a request after a read error or a 429/5xx and ignores Retry-After,
+so one lookup is bounded by its timeout and costs exactly one upstream
+request. The caller's own hedging and rate limiting handle the rest.
+
+Pool sizes and retry behaviour can be tuned with environment variables:
+    EUC_HTTP_POOL_CONNECTIONS  number of per-host pools kept around
+    EUC_HTTP_POOL_MAXSIZE      keep-alive connections kept per host
+    EUC_HTTP_RETRIES           retries for connect/read errors and 429/5xx
+    EUC_HTTP_BACKOFF           backoff factor in seconds (doubles per retry)
+    EUC_HTTP_BACKOFF_JITTER    max random seconds added to each backoff
+
+Scraper fetches can also go through cached_get(), which keeps an on-disk,
+size-bounded response cache keyed by canonical URL. Cached entries are
+revalidated with If-None-Match/If-Modified-Since, and a 304 is answered from
+the stored body. Least recently used entries are evicted once the cache goes
+over its byte budget.
+    EUC_HTTP_CACHE             set to 0 to disable the response cache
+    EUC_HTTP_CACHE_DIR         where cached responses live
+    EUC_HTTP_CACHE_MAX_BYTES   disk budget for cached bodies
+"""
+import hashlib
+import json
+import os
+import threading
+import time
+from urllib.parse import parse_qsl, urlencode, urlsplit, urlunsplit
+
+import requests
+from requests.adapters import HTTPAdapter
+from requests.structures import CaseInsensitiveDict
+from urllib3.util.request import ACCEPT_ENCODING
+from urllib3.util.retry import Retry
+
+USER_AGENT = "Mozilla/5.0 (Windows NT 10.0; Win64; x64)"
+
+DEFAULT_HEADERS = {
+    "User-Agent": USER_AGENT,
+    # urllib3 only advertises the encodings it can actually decode.
+    "Accept-Encoding": ACCEPT_ENCODING,
+}
+
+DEFAULT_TIMEOUT = 30
+
+POOL_CONNECTIONS = int(os.environ.get("EUC_HTTP_POOL_CONNECTIONS", "16"))
+POOL_MAXSIZE = int(os.environ.get("EUC_HTTP_POOL_MAXSIZE", "16"))
+RETRIES = int(os.environ.get("EUC_HTTP_RETRIES", "2"))
+BACKOFF_FACTOR = float(os.environ.get("EUC_HTTP_BACKOFF", "0.5"))
+BACKOFF_JITTER = float(os.environ.get("EUC_HTTP_BACKOFF_JITTER", "0.5"))
+
+RETRY_STATUSES = (429, 500, 502, 503, 504)
+
+CACHE_ENABLED = os.environ.get("EUC_HTTP_CACHE", "1") != "0"
+CACHE_DIR = os.environ.get("EUC_HTTP_CACHE_DIR", os.path.join(".euc_cache", "http"))
+CACHE_MAX_BYTES = int(os.environ.get("EUC_HTTP_CACHE_MAX_BYTES", str(256 * 1024 * 1024)))
+
+# Response headers worth replaying when a body is served from the cache.
+CACHED_HEADERS = ("Content-Type", "ETag", "Last-Modified")
+
+_session = None
+_interactive_session = None
+_session_lock = threading.Lock()
+
+_response_cache = None
+_response_cache_lock = threading.Lock()
+
+
+def build_session(
+    pool_connections: int = POOL_CONNECTIONS,
+    pool_maxsize: int = POOL_MAXSIZE,
+    retries: int = RETRIES,
+    interactive: bool = False,
+) -> requests.Session:
+    """
+    A pooled session. `interactive` sessions retry connects only (see the
+    module docstring).
+    """
+    retry = Retry(
+        total=retries,
+        connect=retries,
+        read=0 if interactive else retries,
+        status=0 if interactive else retries,
+        other=0 if interactive else None,
+        backoff_factor=BACKOFF_FACTOR,
+        backoff_jitter=BACKOFF_JITTER,
+        status_forcelist=() if interactive else RETRY_STATUSES,
+        allowed_methods=frozenset({"GET", "HEAD"}),
+        respect_retry_after_header=not interactive,
+        # Hand the last response back instead of raising, callers already
+        # check status codes themselves.
+        raise_on_status=False,
+    )
+    adapter = HTTPAdapter(
+        pool_connections=pool_connections,
+        pool_maxsize=pool_maxsize,
+        max_retries=retry,
+    )
+
+    session = requests.Session()
+    session.headers.update(DEFAULT_HEADERS)
+    session.mount("https://", adapter)
+    session.mount("http://", adapter)
+    return session
+
+
+def get_session() -> requests.Session:
+    """
+    Return the shared session, creating it on first use.
+    """
+    global _session
+    if _session is None:
+        with _session_lock:
+            if _session is None:
+                _session = build_session()
+    return _session
+
+
+def get_interactive_session() -> requests.Session:
+    """
+    Return the shared connect-retries-only session, creating it on first use.
+    """
+    global _interactive_session
+    if _interactive_session is None:
+        with _session_lock:
+            if _interactive_session is None:
+                _interactive_session = build_session(interactive=True)
+    return _interactive_session
+
+
+def get(url: str, timeout: float = DEFAULT_TIMEOUT, **kwargs) -> requests.Response:
+    """
+    GET `url` through the shared pooled session.
+    """
+    return get_session().get(url, timeout=timeout, **kwargs)
+
+
+def get_interactive(url: str, timeout: float = DEFAULT_TIMEOUT, **kwargs) -> requests.Response:
+    """
+    GET `url` for a waiting user: one request, no read/status retries.
+    """
+    return get_interactive_session().get(url, timeout=timeout, **kwargs)
+
+
+# ---------- On-disk response cache ----------
+
+def canonical_url(url: str) -> str:
+    """
+    Normalize a URL for use as a cache key: lowercase scheme and host, drop
+    default ports and fragments, and sort query parameters.
+    """
+    parts = urlsplit(url.strip())
+    scheme = parts.scheme.lower()
+    host = (parts.hostname or "").lower()
+    port = parts.port
+    if port and not ((scheme == "http" and port == 80) or (scheme == "https" and port == 443)):
+        host = f"{host}:{port}"
+    query = urlencode(sorted(parse_qsl(parts.query, keep_blank_values=True)))
+    return urlunsplit((scheme, host, parts.path or "/", query, ""))
+
+
+class ResponseCache:
+    """
+    Size-bounded on-disk cache of GET responses that carry validators.
+
+    Each entry is a `<sha256>.json` metadata file (URL, validators, a few
+    headers) next to a `<sha256>.body` file with the decoded body. File mtimes
+    double as the LRU clock: hits touch the entry, eviction removes the oldest.
+    """
+
+    def __init__(self, directory: str = CACHE_DIR, max_bytes: int = CACHE_MAX_BYTES):
+        self.directory = directory
+        self.max_bytes = max_bytes
+        self._lock = threading.Lock()
+        self._total_bytes = None
+        os.makedirs(directory, exist_ok=True)
+
+    def _paths(self, key: str):
+        digest = hashlib.sha256(key.encode("utf-8")).hexdigest()
+        base = os.path.join(self.directory, digest)
+        return base + ".json", base + ".body"
+
+    def lookup(self, url: str):
+        meta_path, body_path = self._paths(canonical_url(url))
+        try:
+            with open(meta_path, "r", encoding="utf-8") as f:
+                entry = json.load(f)
+        except (OSError, ValueError):
+            return None
+        if not os.path.exists(body_path):
+            return None
+        return entry
+
+    def load_body(self, url: str):
+        meta_path, body_path = self._paths(canonical_url(url))
+        try:
+            with open(body_path, "rb") as f:
+                body = f.read()
+        except OSError:
+            return None
+        now = time.time()
+        for path in (meta_path, body_path):
+            try:
+                os.utime(path, (now, now))
+            except OSError:
+                pass
+        return body
+
+    @staticmethod
+    def conditional_headers(entry: dict) -> dict:
+        headers = {}
+        if entry.get("etag"):
+            headers["If-None-Match"] = entry["etag"]
+        if entry.get("last_modified"):
+            headers["If-Modified-Since"] = entry["last_modified"]
+        return headers
+
+    def store(self, url: str, resp: requests.Response):
+        etag = resp.headers.get("ETag")
+        last_modified = resp.headers.get("Last-Modified")
+        if not (etag or last_modified):
+            return
+
+        body = resp.content
+        if len(body) > self.max_bytes:
+            return
+
+        entry = {
+            "url": canonical_url(url),
+            "etag": etag,
+            "last_modified": last_modified,
+            "encoding": resp.encoding,
+            "headers": {k: resp.headers[k] for k in CACHED_HEADERS if k in resp.headers},
+            "size": len(body),
+            "stored_at": time.time(),
+        }
+
+        meta_path, body_path = self._paths(entry["url"])
+        with self._lock:
+            old_size = self._entry_size(body_path)
+            _atomic_write(body_path, body)
+            _atomic_write(meta_path, json.dumps(entry).encode("utf-8"))
+            if self._total_bytes is not None:
+                self._total_bytes += len(body) - old_size
+            self._evict()
+
+    @staticmethod
+    def _entry_size(body_path: str) -> int:
+        try:
+            return os.path.getsize(body_path)
+        except OSError:
+            return 0
+
+    def _evict(self):
+        if self._total_bytes is not None and self._total_bytes <= self.max_bytes:
+            return
+
+        entries = []
+        total = 0
+        for name in os.listdir(self.directory):
+            if not name.endswith(".body"):
+                continue
+            body_path = os.path.join(self.directory, name)
+            try:
+                st = os.stat(body_path)
+            except OSError:
+                continue
+            entries.append((st.st_mtime, st.st_size, body_path))
+            total += st.st_size
+
+        entries.sort()
+        for _, size, body_path in entries:
+            if total <= self.max_bytes:
+                break
+            for path in (body_path, body_path[:-len(".body")] + ".json"):
+                try:
+                    os.remove(path)
+                except OSError:
+                    pass
+            total -= size
+
+        self._total_bytes = total
+
+
+def _atomic_write(path: str, data: bytes):
+    tmp_path = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+    with open(tmp_path, "wb") as f:
+        f.write(data)
+    os.replace(tmp_path, path)
+
+
+def get_response_cache():
+    """
+    Return the shared ResponseCache, or None when caching is disabled.
+    """
+    global _response_cache
+    if not CACHE_ENABLED:
+        return None
+    if _response_cache is None:
+        with _response_cache_lock:
+            if _response_cache is None:
+                _response_cache = ResponseCache()
+    return _response_cache
+
+
+def configure_response_cache(enabled: bool = True, directory: str = None, max_bytes: int = None):
+    global CACHE_ENABLED, _response_cache
+    with _response_cache_lock:
+        CACHE_ENABLED = enabled
+        _response_cache = None
+        if enabled:
+            _response_cache = ResponseCache(directory or CACHE_DIR, max_bytes or CACHE_MAX_BYTES)
+
+
+def _response_from_cache(entry: dict, body: bytes, revalidation: requests.Response) -> requests.Response:
+    resp = requests.Response()
+    resp.status_code = 200
+    resp._content = body
+    resp.headers = CaseInsensitiveDict(entry.get("headers") or {})
+    resp.encoding = entry.get("encoding")
+    resp.url = revalidation.url
+    resp.request = revalidation.request
+    resp.reason = "OK"
+    resp.elapsed = revalidation.elapsed
+    resp.from_cache = True
+    return resp
+
+
+def cached_get(url: str, timeout: float = DEFAULT_TIMEOUT, **kwargs) -> requests.Response:
+    """
+    Like get(), but revalidates against the on-disk response cache. A 304 is
+    turned into a normal 200 response carrying the cached body, with
+    `resp.from_cache` set to True.
+    """
+    cache = get_response_cache()
+    if cache is None:
+        return get(url, timeout=timeout, **kwargs)
+
+    entry = cache.lookup(url)
+    headers = dict(kwargs.pop("headers", None) or {})
+    if entry:
+        headers.update(cache.conditional_headers(entry))
+
+    resp = get(url, timeout=timeout, headers=headers, **kwargs)
+
+    if resp.status_code == 304 and entry:
+        body = cache.load_body(url)
+        if body is not None:
+            return _response_from_cache(entry, body, resp)
+        # Body vanished (evicted by another process); fetch it again in full.
+        resp = get(url, timeout=timeout, **kwargs)
+
+    resp.from_cache = False
+    if resp.status_code == 200:
+        try:
+            cache.store(url, resp)
+        except OSError as e:
+            print(f"  !! Could not cache {url}: {e}")
+    return resp
@@ -0,0 +1,53 @@
+"""
+Wheel name cleanup shared by the scraper and the YouTube proxy.
+
+Kept in its own module so the web workers can key YouTube lookups by wheel
+name without importing the scraper (and its parsers and page template).
+"""
+import re
+
+_NAME_SPEC_TAIL_RE = re.compile(
+    "|".join([
+        r"\b\d+Wh\b",
+        r"\b\d+W\b",
+        r"\b\d+\s*MPH\b",
+        r"\b\d+\s*miles\b",
+        r"Battery",
+        r"Motor",
+    ]),
+    re.IGNORECASE,
+)
+
+
+# Numeric spec tokens and the comma before them are what mark a distributor
+# listing title; "Battery"/"Motor" alone also turn up in ordinary searches.
+_LISTING_SPEC_RE = re.compile(r"\d+\s*(?:Wh|W|MPH|miles)\b", re.IGNORECASE)
+
+
+def has_spec_tail(name: str) -> bool:
+    """
+    Whether `name` looks like a distributor listing title with specs after
+    the wheel name ("Begode A1, 180Wh Battery/800W Motor").
+    """
+    return bool(name) and ("," in name or bool(_LISTING_SPEC_RE.search(name)))
+
+
+def clean_euc_name(name: str) -> str:
+    """
+    Remove spec info from titles like:
+    - "Begode A1, 180Wh Battery/800W Motor"
+    - "Begode Blitz, 2,400Wh Battery/3,500W Motor (8.5KW Peak)"
+    -> "Begode A1", "Begode Blitz"
+    """
+    if not name:
+        return ""
+
+    name = name.strip()
+    name = name.split(",")[0].strip()
+
+    # Everything from the first spec-looking token onwards is dropped.
+    m = _NAME_SPEC_TAIL_RE.search(name)
+    if m:
+        name = name[:m.start()].strip()
+
+    return name
@@ -0,0 +1,171 @@
+"""
+Token-bucket rate limiting for outbound calls, with a bounded wait queue.
+
+The bucket holds up to `burst` tokens and refills at `rate` per second. A
+caller that finds it empty reserves the next token and sleeps until that
+token is due, so waiters are served in arrival order without polling.
+Rather than queueing without bound (and timing out upstream much later),
+acquire() fails fast:
+    QueueFull      `max_queue` callers are already waiting      (HTTP 429)
+    WaitTooLong    the next free token is over `max_wait` away  (HTTP 503)
+Both carry `retry_after` in whole seconds for a Retry-After header.
+
+try_acquire() never waits; it is for optional calls that should be dropped
+first when the upstream is busy.
+
+The bucket is per process: with several gunicorn workers the upstream sees
+up to workers x rate.
+"""
+import asyncio
+import math
+import threading
+import time
+
+
+class Overloaded(Exception):
+    """
+    The limiter turned a call away. `status` is the HTTP status to answer
+    with.
+    """
+
+    status = 503
+
+    def __init__(self, message: str, retry_after: int):
+        super().__init__(message)
+        self.retry_after = retry_after
+
+
+class QueueFull(Overloaded):
+    status = 429
+
+
+class WaitTooLong(Overloaded):
+    status = 503
+
+
+class TokenBucket:
+    """
+    Thread-safe token bucket; acquire() for threads, acquire_async() for
+    coroutines. A `rate` of 0 or less disables limiting.
+    """
+
+    def __init__(self, rate: float, burst: float, max_queue: int, max_wait: float):
+        self.rate = rate
+        self.burst = max(burst, 1)
+        self.max_queue = max_queue
+        self.max_wait = max_wait
+        self._tokens = self.burst
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+        self.waiting = 0
+        self.peak_waiting = 0
+        self.granted = 0
+        self.waited = 0
+        self.wait_seconds = 0.0
+        self.queue_full = 0
+        self.wait_too_long = 0
+        self.shed = 0
+
+    @property
+    def enabled(self) -> bool:
+        return self.rate > 0
+
+    def _refill(self, now: float):
+        # Tokens go negative while callers hold reservations for future ones.
+        self._tokens = min(self.burst, self._tokens + (now - self._updated) * self.rate)
+        self._updated = now
+
+    def _reserve(self) -> float:
+        """
+        Take a token now or reserve the next one; returns how long to sleep
+        before using it. Raises Overloaded instead of queueing too deep or
+        too long.
+        """
+        with self._lock:
+            if not self.enabled:
+                self.granted += 1
+                return 0.0
+            self._refill(time.monotonic())
+            if self._tokens >= 1:
+                self._tokens -= 1
+                self.granted += 1
+                return 0.0
+
+            if self.waiting >= self.max_queue:
+                self.queue_full += 1
+                raise QueueFull(f"{self.waiting} calls already waiting for the upstream",
+                                math.ceil((self.waiting + 1) / self.rate))
+            wait = (1 - self._tokens) / self.rate
+            if wait > self.max_wait:
+                self.wait_too_long += 1
+                raise WaitTooLong(f"upstream busy for another {wait:.1f}s", math.ceil(wait))
+
+            self._tokens -= 1
+            self.granted += 1
+            self.waited += 1
+            self.wait_seconds += wait
+            self.waiting += 1
+            self.peak_waiting = max(self.peak_waiting, self.waiting)
+            return wait
+
+    def _finish(self, cancelled: bool = False):
+        with self._lock:
+            self.waiting -= 1
+            if cancelled:
+                # Hand the reserved token to whoever comes next.
+                self._tokens += 1
+                self.granted -= 1
+
+    def acquire(self):
+        wait = self._reserve()
+        if wait:
+            try:
+                time.sleep(wait)
+            finally:
+                self._finish()
+
+    async def acquire_async(self):
+        wait = self._reserve()
+        if wait:
+            try:
+                await asyncio.sleep(wait)
+            except asyncio.CancelledError:
+                self._finish(cancelled=True)
+                raise
+            self._finish()
+
+    def try_acquire(self) -> bool:
+        """
+        Take a token only if one is free right now.
+        """
+        with self._lock:
+            if not self.enabled:
+                self.granted += 1
+                return True
+            self._refill(time.monotonic())
+            if self._tokens >= 1:
+                self._tokens -= 1
+                self.granted += 1
+                return True
+            self.shed += 1
+            return False
+
+    def stats(self) -> dict:
+        with self._lock:
+            if self.enabled:
+                self._refill(time.monotonic())
+            return {
+                "rate": self.rate if self.enabled else None,
+                "burst": self.burst,
+                "tokens": round(self._tokens, 2),
+                "queue_depth": self.waiting,
+                "peak_queue_depth": self.peak_waiting,
+                "max_queue": self.max_queue,
+                "max_wait": self.max_wait,
+                "granted": self.granted,
+                "waited": self.waited,
+                "avg_wait": round(self.wait_seconds / self.waited, 3) if self.waited else 0.0,
+                "rejected_queue_full": self.queue_full,
+                "rejected_wait_too_long": self.wait_too_long,
+                "shed": self.shed,
+            }
@@ -0,0 +1,1371 @@
+"""
+YouTube review lookups behind /api/youtube, shared by app.py and
+EUCVaultHandler.
+
+Each result is a compact record cut out of the page's ytInitialData:
+    {"videoId", "title", "channel", "duration" (seconds), "published", "thumbnail"}
+Fields YouTube didn't provide are null (all but videoId when the page had no
+video renderers and only bare IDs could be found).
+
+Results are kept in a bounded in-process cache (LRU with a TTL) keyed by a
+normalized query, so "Begode Master, 2400Wh Battery review" and
+"begode  master review" hit the same entry. Concurrent lookups of the same
+query are coalesced into a single upstream fetch.
+
+Behind the in-process cache sits a shared SQLite cache on disk, so every
+gunicorn worker (and the next deploy or restart) reuses results any of them
+already fetched instead of warming up its own copy.
+
+Expired results aren't dropped right away: for a while longer they are
+served as-is while a background refresh fetches a new copy
+(stale-while-revalidate), and after a scrape main() pre-warms the cache with
+every wheel in the catalog at a bounded rate, so a user should rarely wait on
+YouTube at all.
+    EUC_YOUTUBE_TTL              seconds a cached result stays fresh
+    EUC_YOUTUBE_STALE_TTL        seconds after that it may still be served stale
+    EUC_YOUTUBE_PREWARM_RATE     upstream lookups per second while pre-warming
+    EUC_YOUTUBE_CACHE_SIZE       max cached queries per process
+    EUC_YOUTUBE_SHARED_CACHE     set to 0 to disable the shared disk cache
+    EUC_YOUTUBE_CACHE_DB         where the shared cache lives
+    EUC_YOUTUBE_CACHE_DB_SIZE    max queries kept in the shared cache
+    EUC_YOUTUBE_SEARCH_URL       results page URL prefix (point at a fake for load tests)
+
+A lookup that misses both caches doesn't hang on one slow YouTube response:
+once an attempt has been out longer than a rolling percentile of recent
+upstream latencies, a second copy is sent and the first success wins
+(hedging). Wheel review lookups can also fan out over a few phrasings
+("<wheel> review", "<wheel> range test", ...) with the ID lists merged; this
+is off by default since every phrasing is another upstream call against the
+rate limit below.
+    EUC_YOUTUBE_HEDGE_PERCENTILE latency percentile that triggers a hedge (0 disables)
+    EUC_YOUTUBE_FANOUT           extra phrasings, comma-separated, e.g. "range test,top speed"
+                                 (empty, the default, disables fan-out)
+
+Upstream requests go through a token bucket (euc_ratelimit). A lookup that
+misses the caches waits its turn for a token, but only briefly: when too many
+are already waiting, or the wait would be too long, it fails fast with
+euc_ratelimit.Overloaded and the web layer answers 429/503 with Retry-After
+instead of letting everyone hang until the upstream times out. Hedges,
+extra phrasings and retries only go out when a token is free right away, so
+they're the first thing dropped under load.
+    EUC_YOUTUBE_RATE             upstream requests per second, per process (0 disables)
+    EUC_YOUTUBE_BURST            requests that may go out at once before the rate applies
+    EUC_YOUTUBE_QUEUE            max lookups waiting for a token (429 beyond that)
+    EUC_YOUTUBE_QUEUE_WAIT       max seconds a lookup may wait for a token (503 beyond that)
+
+/api/youtube/batch?q=...&q=... answers several lookups (the wheels in compare
+mode) in one round-trip; they are resolved concurrently through the same
+caches and come back keyed by query.
+
+AsyncYouTubeSearch is the same front end for the ASGI app (asgi_app.py),
+built on httpx so one process can wait on hundreds of lookups at once.
+    EUC_YOUTUBE_ASYNC_CONNECTIONS  max concurrent upstream connections
+"""
+import asyncio
+import json
+import os
+import re
+import sqlite3
+import threading
+import time
+from collections import OrderedDict, deque
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from itertools import zip_longest
+
+import requests
+
+import euc_http
+import euc_names
+import euc_ratelimit
+
+try:
+    import httpx
+except ImportError:
+    httpx = None
+
+SEARCH_URL = os.environ.get("EUC_YOUTUBE_SEARCH_URL", "https://www.youtube.com/results?search_query=")
+DEFAULT_QUERY = "electric unicycle review"
+MAX_RESULTS = 20
+FETCH_TIMEOUT = 25
+STREAM_CHUNK_SIZE = 16 * 1024
+
+CACHE_TTL = float(os.environ.get("EUC_YOUTUBE_TTL", str(6 * 60 * 60)))
+CACHE_MAX_ENTRIES = int(os.environ.get("EUC_YOUTUBE_CACHE_SIZE", "512"))
+STALE_TTL = float(os.environ.get("EUC_YOUTUBE_STALE_TTL", str(7 * 24 * 60 * 60)))
+
+REFRESH_WORKERS = 2
+UPSTREAM_WORKERS = 8
+BATCH_MAX_QUERIES = 10
+
+UPSTREAM_RATE = float(os.environ.get("EUC_YOUTUBE_RATE", "5"))
+UPSTREAM_BURST = float(os.environ.get("EUC_YOUTUBE_BURST", "10"))
+UPSTREAM_QUEUE = int(os.environ.get("EUC_YOUTUBE_QUEUE", "20"))
+UPSTREAM_QUEUE_WAIT = float(os.environ.get("EUC_YOUTUBE_QUEUE_WAIT", "5"))
+
+HEDGE_PERCENTILE = float(os.environ.get("EUC_YOUTUBE_HEDGE_PERCENTILE", "95"))
+HEDGE_WINDOW = 256
+HEDGE_MIN_SAMPLES = 20
+HEDGE_INITIAL_DELAY = 2.0
+HEDGE_MIN_DELAY = 0.05
+HEDGE_BUDGET = 0.1
+
+FANOUT_PHRASINGS = tuple(
+    p for p in (" ".join(p.casefold().split())
+                for p in os.environ.get("EUC_YOUTUBE_FANOUT", "").split(","))
+    if p
+)
+PREWARM_RATE = float(os.environ.get("EUC_YOUTUBE_PREWARM_RATE", "0.5"))
+
+ASYNC_MAX_CONNECTIONS = int(os.environ.get("EUC_YOUTUBE_ASYNC_CONNECTIONS", "512"))
+
+SHARED_CACHE_ENABLED = os.environ.get("EUC_YOUTUBE_SHARED_CACHE", "1") != "0"
+SHARED_CACHE_PATH = os.environ.get("EUC_YOUTUBE_CACHE_DB", os.path.join(".euc_cache", "youtube.sqlite"))
+SHARED_CACHE_MAX_ENTRIES = int(os.environ.get("EUC_YOUTUBE_CACHE_DB_SIZE", "20000"))
+
+# Bump when the shape of cached items (or what a key means) changes, so the
+# shared cache doesn't serve entries written by an older version.
+RESULTS_VERSION = 3
+
+_VIDEO_ID_BYTES_RE = re.compile(rb'videoId":"([a-zA-Z0-9_-]{11})"')
+_INITIAL_DATA_RE = re.compile(rb'ytInitialData"?\]?\s*=\s*')
+_VIDEO_RENDERER_KEY = b'"videoRenderer":{'
+_SCRIPT_END = b"</script>"
+_JSON_TOKEN_RE = re.compile(rb'[{}"]')
+_JSON_STRING_TOKEN_RE = re.compile(rb'["\\]')
+_QUERY_SUFFIX_RE = re.compile(r"\s+(reviews?)$", re.IGNORECASE)
+
+
+def normalize_query(q: str) -> str:
+    """
+    Cache key for a search, which is also exactly what gets searched: case
+    and whitespace folded, and a distributor-style title ("Begode A1, 180Wh
+    Battery/800W Motor review") cut down to the wheel name with
+    clean_euc_name. Other queries keep every word, so "EUC motor failure
+    review" isn't searched (or cached) as "euc review".
+    """
+    q = " ".join((q or "").split())
+    suffix = ""
+    m = _QUERY_SUFFIX_RE.search(q)
+    if m:
+        suffix = " " + m.group(1)
+        q = q[:m.start()]
+    if euc_names.has_spec_tail(q):
+        q = euc_names.clean_euc_name(q) or q
+    return " ".join((q + suffix).casefold().split()) or DEFAULT_QUERY
+
+
+class VideoIdScanner:
+    """
+    Incremental videoId matcher over a response body fed in byte chunks. A
+    short tail of each chunk is carried over so IDs split across chunk
+    boundaries are still found, without matching anything twice.
+    """
+
+    # Length of a match (prefix, 11-char ID, closing quote) minus one: the
+    # most a match split across chunks can have in the previous chunk.
+    CARRY = len(b'videoId":"') + 11 + 1 - 1
+
+    def __init__(self, limit: int = MAX_RESULTS):
+        self.limit = limit
+        self.items = []
+        self._seen = set()
+        self._carry = b""
+        self.bytes_scanned = 0
+
+    @property
+    def done(self) -> bool:
+        return len(self.items) >= self.limit
+
+    def feed(self, chunk: bytes) -> bool:
+        """
+        Scan `chunk`; returns True once `limit` unique IDs have been found.
+        """
+        self.bytes_scanned += len(chunk)
+        buf = self._carry + chunk
+        last_end = 0
+        for m in _VIDEO_ID_BYTES_RE.finditer(buf):
+            last_end = m.end()
+            vid = m.group(1).decode("ascii")
+            if vid in self._seen:
+                continue
+            self._seen.add(vid)
+            self.items.append({"videoId": vid})
+            if self.done:
+                return True
+        self._carry = buf[max(last_end, len(buf) - self.CARRY):]
+        return False
+
+
+def _text(node):
+    """
+    Plain text of a YouTube text node ({"simpleText": ...} or {"runs": [...]}).
+    """
+    if not isinstance(node, dict):
+        return None
+    if "simpleText" in node:
+        return node["simpleText"]
+    runs = node.get("runs")
+    if runs:
+        return "".join(run.get("text", "") for run in runs)
+    return None
+
+
+def _seconds(text):
+    """
+    "1:02:03" -> 3723; None for anything else (live streams have no length).
+    """
+    parts = (text or "").split(":")
+    if not all(p.isdigit() for p in parts):
+        return None
+    total = 0
+    for p in parts:
+        total = total * 60 + int(p)
+    return total
+
+
+def video_record(renderer: dict) -> dict:
+    """
+    The compact record for one videoRenderer object.
+    """
+    thumbnails = (renderer.get("thumbnail") or {}).get("thumbnails") or []
+    return {
+        "videoId": renderer["videoId"],
+        "title": _text(renderer.get("title")),
+        "channel": _text(renderer.get("ownerText") or renderer.get("longBylineText")),
+        "duration": _seconds(_text(renderer.get("lengthText"))),
+        "published": _text(renderer.get("publishedTimeText")),
+        "thumbnail": thumbnails[-1].get("url") if thumbnails else None,
+    }
+
+
+def bare_record(video_id: str) -> dict:
+    return {"videoId": video_id, "title": None, "channel": None, "duration": None,
+            "published": None, "thumbnail": None}
+
+
+class ResultsScanner:
+    """
+    Incremental extractor of video records from a results page fed in byte
+    chunks. It skips ahead to the ytInitialData assignment, then cuts out
+    each "videoRenderer" object with a string-aware brace matcher and
+    decodes only that object, so neither the rest of the page nor the rest
+    of ytInitialData is ever parsed. Scanning stops at the end of the
+    ytInitialData script.
+
+    Until the first renderer turns up, the chunks also go through a
+    VideoIdScanner, so a page whose layout doesn't match still yields bare
+    IDs, and scanning stops once `limit` of those were found.
+    """
+
+    def __init__(self, limit: int = MAX_RESULTS):
+        self.limit = limit
+        self.records = []
+        self._seen = set()
+        self._ids = VideoIdScanner(limit)
+        self._buf = b""
+        self._state = "marker"
+        self._pos = 0
+        self._depth = 0
+        self._in_string = False
+        self.bytes_scanned = 0
+
+    @property
+    def items(self) -> list:
+        if self.records:
+            return self.records
+        return [bare_record(item["videoId"]) for item in self._ids.items]
+
+    @property
+    def done(self) -> bool:
+        if not self.records and self._ids.done:
+            return True
+        return self._state == "done" or len(self.records) >= self.limit
+
+    def feed(self, chunk: bytes) -> bool:
+        """
+        Scan `chunk`; returns True once `limit` records (or, with no
+        renderers so far, `limit` bare IDs) were found or ytInitialData has
+        ended.
+        """
+        self.bytes_scanned += len(chunk)
+        if not self.records:
+            self._ids.feed(chunk)
+        self._buf += chunk
+
+        while not self.done:
+            if self._state == "marker":
+                m = _INITIAL_DATA_RE.search(self._buf)
+                if m is None:
+                    self._buf = self._buf[-64:]
+                    return False
+                self._buf = self._buf[m.end():]
+                self._state = "between"
+
+            elif self._state == "between":
+                start = self._buf.find(_VIDEO_RENDERER_KEY)
+                end = self._buf.find(_SCRIPT_END)
+                if end != -1 and (start == -1 or end < start):
+                    self._state = "done"
+                elif start == -1:
+                    self._buf = self._buf[-(len(_VIDEO_RENDERER_KEY) - 1):]
+                    return False
+                else:
+                    # Keep from the renderer's opening brace.
+                    self._buf = self._buf[start + len(_VIDEO_RENDERER_KEY) - 1:]
+                    self._pos = self._depth = 0
+                    self._in_string = False
+                    self._state = "renderer"
+
+            else:
+                end = self._match_object()
+                if end is None:
+                    return False
+                self._add(self._buf[:end])
+                self._buf = self._buf[end:]
+                self._state = "between"
+
+        self._buf = b""
+        return True
+
+    def _match_object(self):
+        """
+        Continue brace matching from where the last chunk left off; the end
+        offset of the object at the start of the buffer, or None if it
+        hasn't closed yet.
+        """
+        buf, pos = self._buf, self._pos
+        while True:
+            if self._in_string:
+                m = _JSON_STRING_TOKEN_RE.search(buf, pos)
+                if m is None:
+                    self._pos = len(buf)
+                    return None
+                if m.group() == b"\\":
+                    if m.end() >= len(buf):
+                        # The escaped byte is in the next chunk.
+                        self._pos = m.start()
+                        return None
+                    pos = m.end() + 1
+                    continue
+                self._in_string = False
+                pos = m.end()
+            else:
+                m = _JSON_TOKEN_RE.search(buf, pos)
+                if m is None:
+                    self._pos = len(buf)
+                    return None
+                pos = m.end()
+                token = m.group()
+                if token == b'"':
+                    self._in_string = True
+                elif token == b"{":
+                    self._depth += 1
+                else:
+                    self._depth -= 1
+                    if self._depth == 0:
+                        return pos
+
+    def _add(self, raw: bytes):
+        try:
+            record = video_record(json.loads(raw))
+        except (ValueError, KeyError, TypeError, AttributeError):
+            return
+        if record["videoId"] not in self._seen:
+            self._seen.add(record["videoId"])
+            self.records.append(record)
+
+
+def fetch_videos(query: str, limit: int = MAX_RESULTS) -> list:
+    """
+    Search YouTube and return up to `limit` video records in page order.
+    The body is scanned as it streams in, and the connection is dropped as
+    soon as enough records were found. Raises on network/HTTP errors.
+    """
+    url = SEARCH_URL + requests.utils.quote(query)
+    r = euc_http.get_interactive(url, timeout=FETCH_TIMEOUT, stream=True)
+    try:
+        r.raise_for_status()
+        scanner = ResultsScanner(limit)
+        for chunk in r.iter_content(chunk_size=STREAM_CHUNK_SIZE):
+            if scanner.feed(chunk):
+                break
+        return scanner.items
+    finally:
+        # Closes the connection instead of draining it if we stopped early.
+        r.close()
+
+
+def batch_queries(values) -> list:
+    """
+    Queries for /api/youtube/batch from its repeated `q` parameters, with
+    blanks and repeats dropped. Raises ValueError for an empty or oversized
+    batch.
+    """
+    queries = list(dict.fromkeys(q.strip() for q in values if q and q.strip()))
+    if not queries:
+        raise ValueError("at least one q is required")
+    if len(queries) > BATCH_MAX_QUERIES:
+        raise ValueError(f"at most {BATCH_MAX_QUERIES} queries per batch")
+    return queries
+
+
+# ---------- Hedging and fan-out ----------
+
+def query_phrasings(key: str, extra=FANOUT_PHRASINGS) -> list:
+    """
+    Upstream queries for a normalized lookup key. A wheel review lookup
+    ("<wheel> review") also asks for "<wheel> <phrasing>" for each of
+    `extra`; anything else is looked up as-is.
+    """
+    m = _QUERY_SUFFIX_RE.search(key)
+    if not m or not extra:
+        return [key]
+    base = key[:m.start()]
+    return list(dict.fromkeys([key] + [f"{base} {p}" for p in extra]))
+
+
+def merge_results(lists, limit: int = MAX_RESULTS) -> list:
+    """
+    Interleave result lists, first list first, dropping repeated IDs.
+    """
+    items, seen = [], set()
+    for row in zip_longest(*lists):
+        for item in row:
+            if item is None or item["videoId"] in seen:
+                continue
+            seen.add(item["videoId"])
+            items.append(item)
+            if len(items) >= limit:
+                return items
+    return items
+
+
+class HedgePolicy:
+    """
+    When to send a second copy of an upstream request: once the first has
+    been out longer than the `percentile`th percentile of the last `window`
+    upstream latencies (a fixed delay until there are enough samples). Second
+    attempts, whether hedges or retries after a failure, are capped at
+    `budget` of all attempts, so an upstream that is slow across the board
+    doesn't get twice the traffic.
+    """
+
+    def __init__(self, percentile: float = HEDGE_PERCENTILE, window: int = HEDGE_WINDOW,
+                 budget: float = HEDGE_BUDGET):
+        self.percentile = percentile
+        self.budget = budget
+        self._samples = deque(maxlen=window)
+        self._lock = threading.Lock()
+        self.attempts = 0
+        self.hedges = 0
+        self.hedge_wins = 0
+        self.retries = 0
+
+    @property
+    def enabled(self) -> bool:
+        return self.percentile > 0
+
+    def record(self, seconds: float):
+        with self._lock:
+            self._samples.append(seconds)
+
+    def delay(self) -> float:
+        """
+        Seconds to wait on an attempt before hedging it.
+        """
+        with self._lock:
+            samples = sorted(self._samples)
+        if len(samples) < HEDGE_MIN_SAMPLES:
+            return HEDGE_INITIAL_DELAY
+        index = min(len(samples) - 1, int(len(samples) * self.percentile / 100))
+        return min(max(samples[index], HEDGE_MIN_DELAY), FETCH_TIMEOUT)
+
+    def count(self, name: str):
+        with self._lock:
+            setattr(self, name, getattr(self, name) + 1)
+
+    def take(self, name: str, gate=None) -> bool:
+        """
+        Claim a second attempt ("hedges" or "retries") if the budget allows
+        and `gate()` (e.g. the rate limiter) agrees.
+        """
+        with self._lock:
+            if not self.enabled or self.hedges + self.retries + 1 > self.budget * self.attempts:
+                return False
+            if gate is not None and not gate():
+                return False
+            setattr(self, name, getattr(self, name) + 1)
+            return True
+
+    def stats(self) -> dict:
+        delay = self.delay()
+        with self._lock:
+            return {
+                "percentile": self.percentile if self.enabled else None,
+                "delay": round(delay, 3),
+                "samples": len(self._samples),
+                "attempts": self.attempts,
+                "hedges": self.hedges,
+                "hedge_wins": self.hedge_wins,
+                "retries": self.retries,
+            }
+
+
+class _Fanout:
+    """
+    Bookkeeping for one upstream lookup: the phrasings being fetched, the
+    attempts each has had, and which have settled. The front ends own the
+    threads/tasks; this only decides what to launch next and when to stop.
+
+    The extra phrasings only add variety, so once the primary one has
+    answered they get one more hedge delay to catch up, and whatever is
+    still out after that is dropped. They, hedges and retries also need a
+    token that is free right now from `limiter` (the primary has already
+    waited for its own).
+    """
+
+    def __init__(self, queries, policy: HedgePolicy, limiter: euc_ratelimit.TokenBucket):
+        self.queries = queries
+        self.policy = policy
+        self.limiter = limiter
+        self.attempts = dict.fromkeys(queries, 0)
+        self.running = dict.fromkeys(queries, 0)
+        self.results = {}
+        self.errors = {}
+        self.hedge_at = time.monotonic() + policy.delay() if policy.enabled else None
+        self.deadline = None
+
+    def _open(self):
+        return [q for q in self.queries if q not in self.results and self.running[q]]
+
+    @property
+    def finished(self) -> bool:
+        return not self._open() or (self.deadline is not None and time.monotonic() >= self.deadline)
+
+    def initial(self) -> list:
+        """
+        Phrasings to launch right away.
+        """
+        return self.queries[:1] + [q for q in self.queries[1:] if self.limiter.try_acquire()]
+
+    def launch(self, q) -> int:
+        self.attempts[q] += 1
+        self.running[q] += 1
+        self.policy.count("attempts")
+        return self.attempts[q]
+
+    def done(self, q, attempt: int, items=None, error=None) -> bool:
+        """
+        Record an attempt's outcome; True if `q` should be tried again.
+        """
+        self.running[q] -= 1
+        if q in self.results:
+            return False
+        if error is None:
+            self.results[q] = items
+            if attempt > 1 and q not in self.errors:
+                self.policy.count("hedge_wins")
+            if q == self.queries[0] and len(self.queries) > 1:
+                self.deadline = time.monotonic() + self.policy.delay()
+            return False
+        self.errors[q] = error
+        return self.attempts[q] < 2 and self.policy.take("retries", self.limiter.try_acquire)
+
+    def timeout(self):
+        """
+        Seconds until hedges or the deadline are due, or None to wait for
+        the next result.
+        """
+        due = [t for t in (self.hedge_at, self.deadline) if t is not None]
+        if not due:
+            return None
+        return max(0.0, min(due) - time.monotonic())
+
+    def due_hedges(self) -> list:
+        if self.hedge_at is None or time.monotonic() < self.hedge_at:
+            return []
+        self.hedge_at = None
+        return [q for q in self._open()
+                if self.attempts[q] == 1 and self.policy.take("hedges", self.limiter.try_acquire)]
+
+    @property
+    def partial(self) -> bool:
+        return 0 < len(self.results) < len(self.queries)
+
+    def items(self) -> list:
+        """
+        The merged results; raises the primary phrasing's error if every
+        phrasing failed.
+        """
+        if not self.results:
+            raise self.errors.get(self.queries[0]) or next(iter(self.errors.values()))
+        return merge_results([self.results[q] for q in self.queries if q in self.results])
+
+
+class TTLCache:
+    """
+    Thread-safe LRU cache. Entries are fresh for `ttl` seconds after they
+    were stored, then stale for another `stale_ttl` seconds, then gone.
+    """
+
+    def __init__(self, max_entries: int = CACHE_MAX_ENTRIES, ttl: float = CACHE_TTL,
+                 stale_ttl: float = STALE_TTL):
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self.stale_ttl = stale_ttl
+        self._data = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.stale_hits = 0
+        self.misses = 0
+        self.expired = 0
+        self.evictions = 0
+
+    def get(self, key, record: bool = True):
+        """
+        Return (value, fresh) or None. `record=False` leaves the hit/miss
+        counters alone (for internal re-checks).
+        """
+        with self._lock:
+            entry = self._data.get(key)
+            if entry is not None:
+                value, fresh_until, expires_at = entry
+                now = time.monotonic()
+                if expires_at > now:
+                    self._data.move_to_end(key)
+                    fresh = fresh_until > now
+                    if record:
+                        if fresh:
+                            self.hits += 1
+                        else:
+                            self.stale_hits += 1
+                    return value, fresh
+                del self._data[key]
+                self.expired += 1
+            if record:
+                self.misses += 1
+            return None
+
+    def set(self, key, value, ttl: float = None, stale_ttl: float = None):
+        ttl = self.ttl if ttl is None else ttl
+        stale_ttl = self.stale_ttl if stale_ttl is None else stale_ttl
+        with self._lock:
+            fresh_until = time.monotonic() + ttl
+            self._data[key] = (value, fresh_until, fresh_until + stale_ttl)
+            self._data.move_to_end(key)
+            while len(self._data) > self.max_entries:
+                self._data.popitem(last=False)
+                self.evictions += 1
+
+    def __len__(self):
+        return len(self._data)
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {
+                "entries": len(self._data),
+                "max_entries": self.max_entries,
+                "ttl": self.ttl,
+                "stale_ttl": self.stale_ttl,
+                "hits": self.hits,
+                "stale_hits": self.stale_hits,
+                "misses": self.misses,
+                "expired": self.expired,
+                "evictions": self.evictions,
+            }
+
+
+class SQLiteCache:
+    """
+    TTL cache in a SQLite file shared by every process on the host. WAL mode
+    keeps readers from blocking the writer, and a busy timeout lets writers
+    from several workers queue up instead of failing. Once the table grows
+    past `max_entries`, expired rows and then the least recently read ones
+    are pruned. Database errors are treated as misses. Keys are stored with
+    a RESULTS_VERSION prefix; rows from older versions are never read and
+    age out with the rest.
+    """
+
+    # Don't rewrite accessed_at on every hit; LRU order doesn't need to be exact.
+    TOUCH_INTERVAL = 60
+    PRUNE_EVERY = 64
+
+    def __init__(self, path: str = SHARED_CACHE_PATH, max_entries: int = SHARED_CACHE_MAX_ENTRIES,
+                 ttl: float = CACHE_TTL, stale_ttl: float = STALE_TTL):
+        self.path = path
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self.stale_ttl = stale_ttl
+        self._local = threading.local()
+        self._lock = threading.Lock()
+        self._sets = 0
+        self.hits = 0
+        self.stale_hits = 0
+        self.misses = 0
+        self.errors = 0
+
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        with self._conn() as conn:
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS youtube_cache ("
+                " key TEXT PRIMARY KEY, value TEXT NOT NULL,"
+                " expires_at REAL NOT NULL, accessed_at REAL NOT NULL,"
+                " fresh_until REAL NOT NULL DEFAULT 0)"
+            )
+            columns = {row[1] for row in conn.execute("PRAGMA table_info(youtube_cache)")}
+            if "fresh_until" not in columns:
+                # Caches from before stale-while-revalidate: existing rows
+                # count as stale and get refreshed on their next read.
+                conn.execute("ALTER TABLE youtube_cache ADD COLUMN fresh_until REAL NOT NULL DEFAULT 0")
+            conn.execute("CREATE INDEX IF NOT EXISTS youtube_cache_accessed ON youtube_cache (accessed_at)")
+
+    def _conn(self) -> sqlite3.Connection:
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(self.path, timeout=5)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            conn.execute("PRAGMA busy_timeout=5000")
+            self._local.conn = conn
+        return conn
+
+    def _count(self, name):
+        with self._lock:
+            setattr(self, name, getattr(self, name) + 1)
+
+    def get(self, key, record: bool = True):
+        """
+        Return (value, seconds until stale, seconds until expired) or None.
+        The first is <= 0 for a stale entry.
+        """
+        key = f"v{RESULTS_VERSION}:{key}"
+        now = time.time()
+        try:
+            conn = self._conn()
+            row = conn.execute(
+                "SELECT value, expires_at, accessed_at, fresh_until FROM youtube_cache"
+                " WHERE key = ? AND expires_at > ?",
+                (key, now),
+            ).fetchone()
+            if row and now - row[2] > self.TOUCH_INTERVAL:
+                with conn:
+                    conn.execute("UPDATE youtube_cache SET accessed_at = ? WHERE key = ?", (now, key))
+        except sqlite3.Error:
+            self._count("errors")
+            return None
+
+        if row is None:
+            if record:
+                self._count("misses")
+            return None
+        if record:
+            self._count("hits" if row[3] > now else "stale_hits")
+        return json.loads(row[0]), row[3] - now, row[1] - now
+
+    def set(self, key, value):
+        key = f"v{RESULTS_VERSION}:{key}"
+        now = time.time()
+        with self._lock:
+            self._sets += 1
+            prune = self._sets % self.PRUNE_EVERY == 0
+        try:
+            conn = self._conn()
+            with conn:
+                conn.execute(
+                    "INSERT OR REPLACE INTO youtube_cache (key, value, expires_at, accessed_at, fresh_until)"
+                    " VALUES (?, ?, ?, ?, ?)",
+                    (key, json.dumps(value, separators=(",", ":")),
+                     now + self.ttl + self.stale_ttl, now, now + self.ttl),
+                )
+            if prune:
+                self.prune()
+        except sqlite3.Error:
+            self._count("errors")
+
+    def prune(self):
+        conn = self._conn()
+        with conn:
+            (count,) = conn.execute("SELECT COUNT(*) FROM youtube_cache").fetchone()
+            if count <= self.max_entries:
+                return
+            conn.execute("DELETE FROM youtube_cache WHERE expires_at <= ?", (time.time(),))
+            conn.execute(
+                "DELETE FROM youtube_cache WHERE key IN ("
+                " SELECT key FROM youtube_cache ORDER BY accessed_at"
+                " LIMIT max(0, (SELECT COUNT(*) FROM youtube_cache) - ?))",
+                (self.max_entries,),
+            )
+
+    def stats(self) -> dict:
+        try:
+            (entries,) = self._conn().execute("SELECT COUNT(*) FROM youtube_cache").fetchone()
+        except sqlite3.Error:
+            entries = None
+        with self._lock:
+            return {
+                "path": self.path,
+                "entries": entries,
+                "max_entries": self.max_entries,
+                "ttl": self.ttl,
+                "stale_ttl": self.stale_ttl,
+                "hits": self.hits,
+                "stale_hits": self.stale_hits,
+                "misses": self.misses,
+                "errors": self.errors,
+            }
+
+
+class SingleFlight:
+    """
+    Run at most one call per key at a time; callers that arrive while it is
+    running wait for and share its result (or exception).
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._calls = {}
+        self.shared = 0
+
+    def do(self, key, fn):
+        with self._lock:
+            call = self._calls.get(key)
+            leader = call is None
+            if leader:
+                call = self._calls[key] = {"done": threading.Event(), "result": None, "error": None}
+            else:
+                self.shared += 1
+
+        if not leader:
+            call["done"].wait()
+        else:
+            try:
+                call["result"] = fn()
+            except Exception as e:
+                call["error"] = e
+            finally:
+                with self._lock:
+                    del self._calls[key]
+                call["done"].set()
+
+        if call["error"] is not None:
+            raise call["error"]
+        return call["result"]
+
+    def in_flight(self) -> int:
+        with self._lock:
+            return len(self._calls)
+
+
+class _CachedSearch:
+    """
+    Cache layering and counters shared by the sync and async front ends.
+    """
+
+    def __init__(self, cache: TTLCache = None, shared: SQLiteCache = None, hedging: HedgePolicy = None,
+                 fanout=FANOUT_PHRASINGS, limiter: euc_ratelimit.TokenBucket = None):
+        self.cache = cache if cache is not None else TTLCache()
+        self.shared = shared
+        self.limiter = limiter if limiter is not None else build_limiter()
+        self.hedging = hedging if hedging is not None else HedgePolicy()
+        self.fanout = tuple(fanout)
+        self._refreshing = set()
+        self._counter_lock = threading.Lock()
+        self.upstream_fetches = 0
+        self.upstream_errors = 0
+        self.rate_limited = 0
+        self.stale_served = 0
+        self.refreshes = 0
+        self.refresh_errors = 0
+        self.fanout_partial = 0
+        self.prewarm_status = None
+
+    def _count(self, name):
+        with self._counter_lock:
+            setattr(self, name, getattr(self, name) + 1)
+
+    def _needs_shared(self, found) -> bool:
+        return (found is None or not found[1]) and self.shared is not None
+
+    def _from_shared(self, key, found, record: bool = True):
+        """
+        Prefer the shared cache's entry over `found` (the in-process lookup)
+        when it is fresher, copying it into the in-process cache.
+        """
+        shared = self.shared.get(key, record=record)
+        if shared is not None:
+            items, fresh_left, expires_left = shared
+            if found is None or fresh_left > 0:
+                fresh_left = max(fresh_left, 0)
+                self.cache.set(key, items, ttl=fresh_left, stale_ttl=expires_left - fresh_left)
+                found = items, fresh_left > 0
+        return found
+
+    def _cached(self, key, record: bool = True):
+        """
+        (items, fresh) from the in-process cache, falling back to the shared
+        cache when that has something fresher; None if neither has it.
+        """
+        found = self.cache.get(key, record=record)
+        if self._needs_shared(found):
+            found = self._from_shared(key, found, record)
+        return found
+
+    def _store(self, key, items):
+        self.cache.set(key, items)
+        if self.shared is not None:
+            self.shared.set(key, items)
+
+    def _lookup_results(self, lookup: _Fanout) -> list:
+        if lookup.partial:
+            self._count("fanout_partial")
+        return lookup.items()
+
+    def _claim_refresh(self, key) -> bool:
+        with self._counter_lock:
+            if key in self._refreshing:
+                return False
+            self._refreshing.add(key)
+            self.refreshes += 1
+            return True
+
+    def _release_refresh(self, key):
+        with self._counter_lock:
+            self._refreshing.discard(key)
+
+    def stats(self) -> dict:
+        return {
+            "cache": self.cache.stats(),
+            "shared_cache": self.shared.stats() if self.shared is not None else None,
+            "in_flight": self.flights.in_flight(),
+            "coalesced": self.flights.shared,
+            "upstream_fetches": self.upstream_fetches,
+            "upstream_errors": self.upstream_errors,
+            "rate_limited": self.rate_limited,
+            "stale_served": self.stale_served,
+            "refreshes": self.refreshes,
+            "refresh_errors": self.refresh_errors,
+            "limiter": self.limiter.stats(),
+            "hedging": self.hedging.stats(),
+            "fanout": list(self.fanout),
+            "fanout_partial": self.fanout_partial,
+            "prewarm": dict(self.prewarm_status) if self.prewarm_status else None,
+        }
+
+
+class YouTubeSearch(_CachedSearch):
+    """
+    Cached, coalesced front end to fetch_videos(): the in-process cache
+    first, then the shared one (if any), then upstream. Stale entries are
+    answered immediately and refreshed in the background. Upstream attempts
+    run on a small thread pool so they can be hedged and fanned out.
+    """
+
+    def __init__(self, cache: TTLCache = None, shared: SQLiteCache = None, fetch=fetch_videos,
+                 refresh_workers: int = REFRESH_WORKERS, upstream_workers: int = UPSTREAM_WORKERS,
+                 hedging: HedgePolicy = None, fanout=FANOUT_PHRASINGS, limiter: euc_ratelimit.TokenBucket = None):
+        super().__init__(cache, shared, hedging, fanout, limiter)
+        self.fetch = fetch
+        self.flights = SingleFlight()
+        self._refresh_pool = ThreadPoolExecutor(max_workers=refresh_workers,
+                                                thread_name_prefix="youtube-refresh")
+        self._upstream_pool = ThreadPoolExecutor(max_workers=upstream_workers,
+                                                 thread_name_prefix="youtube-upstream")
+        self._batch_pool = ThreadPoolExecutor(max_workers=BATCH_MAX_QUERIES,
+                                              thread_name_prefix="youtube-batch")
+
+    def _attempt(self, query):
+        start = time.monotonic()
+        items = self.fetch(query)
+        self.hedging.record(time.monotonic() - start)
+        return items
+
+    def _upstream(self, key):
+        """
+        Fetch every phrasing of `key`, hedging slow attempts, and merge what
+        came back. A hedge that loses keeps running in the pool until its
+        request finishes (the scan stops early, so that's short). Raises
+        euc_ratelimit.Overloaded if no token comes free in time.
+        """
+        self.limiter.acquire()
+        lookup = _Fanout(query_phrasings(key, self.fanout), self.hedging, self.limiter)
+        futures = {}
+
+        def launch(q):
+            futures[self._upstream_pool.submit(self._attempt, q)] = q, lookup.launch(q)
+
+        for q in lookup.initial():
+            launch(q)
+        while not lookup.finished:
+            done, _ = wait(futures, timeout=lookup.timeout(), return_when=FIRST_COMPLETED)
+            for future in done:
+                q, attempt = futures.pop(future)
+                try:
+                    again = lookup.done(q, attempt, items=future.result())
+                except Exception as e:
+                    again = lookup.done(q, attempt, error=e)
+                if again:
+                    launch(q)
+            for q in lookup.due_hedges():
+                launch(q)
+        for future in futures:
+            future.cancel()
+        return self._lookup_results(lookup)
+
+    def _fetch(self, key):
+        # Re-check: another flight (or worker) may have refreshed the entry
+        # since our miss.
+        found = self._cached(key, record=False)
+        if found is not None and found[1]:
+            return found[0]
+        self._count("upstream_fetches")
+        try:
+            items = self._upstream(key)
+        except euc_ratelimit.Overloaded:
+            self._count("rate_limited")
+            raise
+        except Exception:
+            self._count("upstream_errors")
+            raise
+        self._store(key, items)
+        return items
+
+    def _refresh(self, key):
+        try:
+            self.flights.do(key, lambda: self._fetch(key))
+        except Exception:
+            self._count("refresh_errors")
+        finally:
+            self._release_refresh(key)
+
+    def refresh_in_background(self, key):
+        """
+        Queue a refresh of `key` unless one is already queued or running.
+        """
+        if self._claim_refresh(key):
+            self._refresh_pool.submit(self._refresh, key)
+
+    def search(self, q: str) -> dict:
+        """
+        Payload for /api/youtube. Upstream failures come back as an empty
+        item list and aren't cached; a stale result is kept over a failed
+        refresh. Raises euc_ratelimit.Overloaded when a lookup that needs
+        the upstream is turned away by the rate limiter.
+        """
+        q = (q or DEFAULT_QUERY).strip()
+        key = normalize_query(q)
+
+        found = self._cached(key)
+        if found is None:
+            try:
+                items = self.flights.do(key, lambda: self._fetch(key))
+            except euc_ratelimit.Overloaded:
+                raise
+            except Exception:
+                items = []
+        else:
+            items, fresh = found
+            if not fresh:
+                self._count("stale_served")
+                self.refresh_in_background(key)
+        return {"query": q, "items": items}
+
+    def search_many(self, queries) -> dict:
+        """
+        Payload for /api/youtube/batch: search() for each query, run
+        concurrently, keyed by query. A query the rate limiter turned away
+        gets empty items, the error and its retry_after.
+        """
+        return {"results": dict(zip(queries, self._batch_pool.map(self._search_or_busy, queries)))}
+
+    def _search_or_busy(self, q):
+        try:
+            return self.search(q)
+        except euc_ratelimit.Overloaded as e:
+            return busy_payload(q, e)
+
+    def prewarm(self, queries, rate: float = PREWARM_RATE, stop: threading.Event = None):
+        """
+        Look up every query that isn't cached fresh yet, at most `rate`
+        upstream fetches per second. Progress is kept in prewarm_status.
+        """
+        keys = list(dict.fromkeys(normalize_query(q) for q in queries))
+        status = self.prewarm_status = {
+            "running": True, "queued": len(keys), "done": 0,
+            "fetched": 0, "skipped": 0, "failed": 0, "throttled": 0,
+        }
+        interval = 1 / rate if rate > 0 else 0
+        stop = stop or threading.Event()
+
+        for key in keys:
+            if stop.is_set():
+                break
+            found = self._cached(key, record=False)
+            if found is not None and found[1]:
+                status["skipped"] += 1
+            else:
+                while True:
+                    try:
+                        self.flights.do(key, lambda key=key: self._fetch(key))
+                        status["fetched"] += 1
+                    except euc_ratelimit.Overloaded as e:
+                        # Users come first: back off and try this one again.
+                        status["throttled"] += 1
+                        if not stop.wait(e.retry_after):
+                            continue
+                    except Exception:
+                        status["failed"] += 1
+                    break
+                stop.wait(interval)
+            status["done"] += 1
+
+        status["running"] = False
+        return status
+
+    def start_prewarm(self, queries, rate: float = PREWARM_RATE) -> threading.Event:
+        """
+        Run prewarm() on a daemon thread. Set the returned event to stop it.
+        """
+        stop = threading.Event()
+        threading.Thread(target=self.prewarm, args=(list(queries), rate, stop),
+                         name="youtube-prewarm", daemon=True).start()
+        return stop
+
+
+# ---------- Async front end (ASGI app) ----------
+
+def build_async_client():
+    if httpx is None:
+        raise RuntimeError("the async YouTube client needs httpx (pip install httpx)")
+    return httpx.AsyncClient(
+        headers={"User-Agent": euc_http.USER_AGENT},
+        timeout=FETCH_TIMEOUT,
+        follow_redirects=True,
+        limits=httpx.Limits(max_connections=ASYNC_MAX_CONNECTIONS, max_keepalive_connections=64),
+    )
+
+
+async def fetch_videos_async(client, query: str, limit: int = MAX_RESULTS) -> list:
+    """
+    fetch_videos() on an httpx.AsyncClient: same streaming scan and early
+    hang-up.
+    """
+    url = SEARCH_URL + requests.utils.quote(query)
+    async with client.stream("GET", url) as r:
+        r.raise_for_status()
+        scanner = ResultsScanner(limit)
+        async for chunk in r.aiter_bytes(STREAM_CHUNK_SIZE):
+            if scanner.feed(chunk):
+                break
+        return scanner.items
+
+
+class AsyncSingleFlight:
+    """
+    SingleFlight for coroutines. The call runs as its own task, so a waiter
+    that is cancelled (client went away) doesn't cancel it for the others.
+    """
+
+    def __init__(self):
+        self._calls = {}
+        self.shared = 0
+
+    async def do(self, key, fn):
+        task = self._calls.get(key)
+        if task is None:
+            task = self._calls[key] = asyncio.ensure_future(fn())
+            task.add_done_callback(lambda t: self._done(key, t))
+        else:
+            self.shared += 1
+        return await asyncio.shield(task)
+
+    def _done(self, key, task):
+        self._calls.pop(key, None)
+        if not task.cancelled():
+            task.exception()  # mark retrieved even if every waiter left
+
+    def in_flight(self) -> int:
+        return len(self._calls)
+
+
+class AsyncYouTubeSearch(_CachedSearch):
+    """
+    YouTubeSearch for an asyncio server. Shared-cache (SQLite) access runs in
+    worker threads so it never blocks the event loop.
+    """
+
+    def __init__(self, cache: TTLCache = None, shared: SQLiteCache = None, client=None, fetch=None,
+                 hedging: HedgePolicy = None, fanout=FANOUT_PHRASINGS, limiter: euc_ratelimit.TokenBucket = None):
+        super().__init__(cache, shared, hedging, fanout, limiter)
+        self.client = client
+        self.fetch = fetch
+        self.flights = AsyncSingleFlight()
+        self._tasks = set()
+
+    async def _lookup(self, key, record: bool = True):
+        found = self.cache.get(key, record=record)
+        if self._needs_shared(found):
+            found = await asyncio.to_thread(self._from_shared, key, found, record)
+        return found
+
+    async def _attempt(self, query):
+        start = time.monotonic()
+        try:
+            if self.fetch is not None:
+                items = await self.fetch(query)
+            else:
+                if self.client is None:
+                    self.client = build_async_client()
+                items = await fetch_videos_async(self.client, query)
+        except asyncio.CancelledError:
+            # A losing hedge: it took at least this long, which keeps the
+            # percentile from drifting down to only the winners.
+            self.hedging.record(time.monotonic() - start)
+            raise
+        self.hedging.record(time.monotonic() - start)
+        return items
+
+    async def _upstream(self, key):
+        """
+        YouTubeSearch._upstream() with tasks; losing hedges are cancelled.
+        """
+        await self.limiter.acquire_async()
+        lookup = _Fanout(query_phrasings(key, self.fanout), self.hedging, self.limiter)
+        tasks = {}
+
+        def launch(q):
+            tasks[asyncio.ensure_future(self._attempt(q))] = q, lookup.launch(q)
+
+        for q in lookup.initial():
+            launch(q)
+        try:
+            while not lookup.finished:
+                done, _ = await asyncio.wait(tasks, timeout=lookup.timeout(), return_when=asyncio.FIRST_COMPLETED)
+                for task in done:
+                    q, attempt = tasks.pop(task)
+                    try:
+                        again = lookup.done(q, attempt, items=task.result())
+                    except Exception as e:
+                        again = lookup.done(q, attempt, error=e)
+                    if again:
+                        launch(q)
+                for q in lookup.due_hedges():
+                    launch(q)
+        finally:
+            for task in tasks:
+                task.cancel()
+        return self._lookup_results(lookup)
+
+    async def _fetch(self, key):
+        found = await self._lookup(key, record=False)
+        if found is not None and found[1]:
+            return found[0]
+        self._count("upstream_fetches")
+        try:
+            items = await self._upstream(key)
+        except euc_ratelimit.Overloaded:
+            self._count("rate_limited")
+            raise
+        except Exception:
+            self._count("upstream_errors")
+            raise
+        if self.shared is not None:
+            await asyncio.to_thread(self._store, key, items)
+        else:
+            self._store(key, items)
+        return items
+
+    async def _refresh(self, key):
+        try:
+            await self.flights.do(key, lambda: self._fetch(key))
+        except Exception:
+            self._count("refresh_errors")
+        finally:
+            self._release_refresh(key)
+
+    def refresh_in_background(self, key):
+        if self._claim_refresh(key):
+            task = asyncio.ensure_future(self._refresh(key))
+            self._tasks.add(task)
+            task.add_done_callback(self._tasks.discard)
+
+    async def search(self, q: str) -> dict:
+        """
+        Same payload and failure handling as YouTubeSearch.search().
+        """
+        q = (q or DEFAULT_QUERY).strip()
+        key = normalize_query(q)
+
+        found = await self._lookup(key)
+        if found is None:
+            try:
+                items = await self.flights.do(key, lambda: self._fetch(key))
+            except euc_ratelimit.Overloaded:
+                raise
+            except Exception:
+                items = []
+        else:
+            items, fresh = found
+            if not fresh:
+                self._count("stale_served")
+                self.refresh_in_background(key)
+        return {"query": q, "items": items}
+
+    async def search_many(self, queries) -> dict:
+        """
+        Same payload as YouTubeSearch.search_many().
+        """
+        results = await asyncio.gather(*(self.search(q) for q in queries), return_exceptions=True)
+        for i, result in enumerate(results):
+            if isinstance(result, euc_ratelimit.Overloaded):
+                results[i] = busy_payload(queries[i], result)
+            elif isinstance(result, BaseException):
+                raise result
+        return {"results": dict(zip(queries, results))}
+
+    async def aclose(self):
+        for task in list(self._tasks):
+            task.cancel()
+        if self.client is not None:
+            await self.client.aclose()
+
+
+def build_limiter() -> euc_ratelimit.TokenBucket:
+    return euc_ratelimit.TokenBucket(UPSTREAM_RATE, UPSTREAM_BURST, UPSTREAM_QUEUE, UPSTREAM_QUEUE_WAIT)
+
+
+def busy_payload(q: str, error: euc_ratelimit.Overloaded) -> dict:
+    """
+    The lookup payload for a query the rate limiter turned away.
+    """
+    return {"query": q, "items": [], "error": str(error), "retry_after": error.retry_after}
+
+
+def open_shared_cache():
+    """
+    The shared SQLiteCache, or None when it's disabled or can't be opened.
+    """
+    if not SHARED_CACHE_ENABLED:
+        return None
+    try:
+        return SQLiteCache()
+    except (OSError, sqlite3.Error) as e:
+        print(f"  !! YouTube shared cache unavailable ({SHARED_CACHE_PATH}): {e}")
+        return None
+
+
+_search = None
+_search_lock = threading.Lock()
+
+
+def get_search() -> YouTubeSearch:
+    """
+    Shared YouTubeSearch for the web servers.
+    """
+    global _search
+    if _search is None:
+        with _search_lock:
+            if _search is None:
+                _search = YouTubeSearch(shared=open_shared_cache())
+    return _search